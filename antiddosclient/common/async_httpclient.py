@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import asyncio
+import logging
+import ssl
+import time
+
+from keystoneauth1 import exceptions as ks_exceptions
+from requests import Response
+from requests import structures
+import six
+
+from antiddosclient.common import exceptions
+from antiddosclient.common import metrics as metrics_module
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+LOGGER = logging.getLogger(__name__)
+
+# seconds before token expiry cached auth headers are fetched again, the
+# same as keystoneauth renews a token
+AUTH_EXPIRY_WINDOW = 120
+
+
+class AsyncOpenStackHttpClient(object):
+    """Common OpenStack API HTTP Client with asyncio coroutine API.
+
+    Authentication and endpoint discovery still go through the keystoneauth
+    session, while the HTTP calls are sent through one pooled aiohttp session
+    which is shared by all managers of a client. Responses are converted to
+    ``requests.Response`` so results carry the same request id meta data and
+    errors are the same exceptions as :class:`OpenStackHttpClient` raised.
+
+    Python 3.7+ and aiohttp are required.
+    """
+
+    def __init__(self, session, endpoint=None, service_type=None,
+                 service_name=None, interface=None, region_name=None,
+                 connector=None, pool_size=100, pool_size_per_host=0,
+                 timeout=None, logger=None, metrics=None, **kwargs):
+        """Initialize a new async client to access open-stack API.
+
+        :param keystoneauth1.session.Session session:
+            The session used to authenticate and discover endpoint.
+        :param string endpoint:
+            An optional URL to be used as the base for API requests on this API
+        :param connector: an optional aiohttp connector to share one
+            connection pool between clients, it will not be closed by client
+        :param pool_size: max connections of the pool (0 for unlimited)
+        :param pool_size_per_host: max connections to one host (0 for
+            unlimited)
+        :param timeout: total timeout in seconds of a request
+        :param metrics: an optional HttpMetrics collects request metrics, a
+            new one is created if not specified
+        :param kwargs: other keystoneauth1 adapter keyword arguments,
+            ignored by the async client
+        """
+        self.session = session
+        self.endpoint_override = endpoint
+        self.endpoint_filter = dict((k, v) for k, v in (
+            ('service_type', service_type),
+            ('service_name', service_name),
+            ('interface', interface),
+            ('region_name', region_name),
+        ) if v)
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.timeout = timeout
+        self.logger = logger or LOGGER
+        self.metrics = (metrics if metrics is not None
+                        else metrics_module.HttpMetrics())
+
+        self._connector = connector
+        self._endpoint = None
+        self._http = None
+        # auth headers and the token they are built from
+        self._auth_headers = None
+        self._auth_ref = None
+
+    def _get_endpoint(self):
+        if self._endpoint is None:
+            if self.endpoint_override:
+                endpoint = self.endpoint_override
+                if '%(project_id)s' in endpoint:
+                    project_id = self.session.get_project_id()
+                    endpoint = endpoint % dict(project_id=project_id)
+            else:
+                endpoint = self.session.get_endpoint(**self.endpoint_filter)
+            self._endpoint = endpoint.rstrip('/')
+        return self._endpoint
+
+    def _get_ssl(self):
+        verify = getattr(self.session, 'verify', True)
+        cert = getattr(self.session, 'cert', None)
+        if verify is False:
+            return False
+        if isinstance(verify, six.string_types) or cert:
+            cafile = verify if isinstance(verify, six.string_types) else None
+            context = ssl.create_default_context(cafile=cafile)
+            if cert:
+                if isinstance(cert, tuple):
+                    context.load_cert_chain(*cert)
+                else:
+                    context.load_cert_chain(cert)
+            return context
+        return True
+
+    def get_http_session(self):
+        """get the pooled aiohttp session, create it if not exists"""
+        if self._http is None or self._http.closed:
+            if aiohttp is None:
+                raise ImportError('aiohttp is required by async client, '
+                                  'install it with "pip install aiohttp"')
+            connector = self._connector
+            if connector is None:
+                connector = aiohttp.TCPConnector(
+                    limit=self.pool_size,
+                    limit_per_host=self.pool_size_per_host,
+                    ssl=self._get_ssl(),
+                )
+            self._http = aiohttp.ClientSession(
+                connector=connector,
+                connector_owner=self._connector is None,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._http
+
+    def _is_auth_cached(self):
+        """whether cached auth headers still belong to a valid token
+
+        headers of auth plugins which do not expose their token are never
+        cached.
+        """
+        if self._auth_headers is None or self._auth_ref is None:
+            return False
+        auth_ref = getattr(getattr(self.session, 'auth', None),
+                           'auth_ref', None)
+        return (auth_ref is self._auth_ref
+                and not auth_ref.will_expire_soon(AUTH_EXPIRY_WINDOW))
+
+    async def _prepare(self):
+        """resolve endpoint and auth headers in executor, keystoneauth may
+        block on token or catalog requests.
+
+        auth headers are cached until the token is renewed or expires soon.
+        """
+        loop = asyncio.get_running_loop()
+        endpoint = self._endpoint
+        if endpoint is None:
+            endpoint = await loop.run_in_executor(None, self._get_endpoint)
+        if not self._is_auth_cached():
+            auth_headers = await loop.run_in_executor(
+                None, self.session.get_auth_headers
+            )
+            self._auth_headers = auth_headers or {}
+            self._auth_ref = getattr(getattr(self.session, 'auth', None),
+                                     'auth_ref', None)
+        return endpoint, self._auth_headers
+
+    @staticmethod
+    def _to_response(raw, content):
+        """convert aiohttp response to requests.Response"""
+        resp = Response()
+        resp.status_code = raw.status
+        resp.reason = raw.reason
+        resp.headers = structures.CaseInsensitiveDict(raw.headers)
+        resp.url = str(raw.url)
+        resp.encoding = raw.charset
+        resp._content = content
+        return resp
+
+    @staticmethod
+    def _to_connection_error(error, url):
+        """keystoneauth1 exception of an aiohttp error, None if unknown
+
+        errors are mapped the same way as keystoneauth1 maps the ones of
+        requests, so callers catch the same exceptions as of the blocking
+        client.
+        """
+        if isinstance(error, asyncio.TimeoutError):
+            return ks_exceptions.ConnectTimeout('Request to %s timed out'
+                                                % url)
+        if isinstance(error, aiohttp.ClientSSLError):
+            return ks_exceptions.SSLError('SSL exception connecting to %s: %s'
+                                          % (url, error))
+        if isinstance(error, aiohttp.ClientConnectorError):
+            return ks_exceptions.ConnectFailure(
+                'Unable to establish connection to %s: %s' % (url, error)
+            )
+        if isinstance(error, aiohttp.ClientError):
+            return ks_exceptions.ConnectionError(
+                'Connection to %s failed: %s' % (url, error)
+            )
+        return None
+
+    async def request(self, url, method, **kwargs):
+        """send request and return (response, decoded json body)
+
+        HuaWei Service return not standard error structure, errors are
+        converted the same way as OpenStackHttpClient does, aiohttp
+        connection errors and timeouts are raised as the keystoneauth1
+        ConnectionError and ConnectTimeout the same as keystoneauth1 does.
+        """
+        headers = dict(kwargs.pop('headers', None) or {})
+        headers.setdefault('Accept', 'application/json')
+        endpoint, auth_headers = await self._prepare()
+        headers.update(auth_headers)
+
+        self.logger.debug('REQ: %s %s', method, url)
+        http = self.get_http_session()
+        started_at = time.time()
+        try:
+            async with http.request(method, endpoint + url,
+                                    headers=headers, **kwargs) as raw:
+                server_seconds = time.time() - started_at
+                content = await raw.read()
+        except Exception as e:
+            self.metrics.record(method, url, None, time.time() - started_at)
+            error = self._to_connection_error(e, endpoint + url)
+            if error is None:
+                raise
+            raise error from e
+        resp = self._to_response(raw, content)
+        self.logger.debug('RESP: [%s] %s %s', resp.status_code, method, url)
+
+        if resp.status_code >= 400:
+            self.metrics.record(method, url, resp.status_code,
+                                time.time() - started_at,
+                                server_seconds=server_seconds,
+                                bytes_in=len(content))
+            http_error = ks_exceptions.from_response(resp, method, url)
+            raise exceptions.from_http_error(http_error)
+
+        body = None
+        if resp.content:
+            try:
+                body = resp.json()
+            except ValueError:
+                pass
+        self.metrics.record(method, url, resp.status_code,
+                            time.time() - started_at,
+                            server_seconds=server_seconds,
+                            bytes_in=len(content))
+        return resp, body
+
+    def stats(self):
+        """snapshot of per route request metrics"""
+        return self.metrics.snapshot()
+
+    def get(self, url, **kwargs):
+        return self.request(url, 'GET', **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request(url, 'POST', **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request(url, 'PUT', **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request(url, 'PATCH', **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self.request(url, 'DELETE', **kwargs)
+
+    async def close(self):
+        """close pooled http session"""
+        if self._http is not None and not self._http.closed:
+            await self._http.close()
+        self._http = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
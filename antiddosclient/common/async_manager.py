@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+from antiddosclient.common import manager
+
+
+class AsyncManager(manager.BaseManager):
+    """Base Manager for API service with asyncio coroutine API.
+
+    All the CRUD helpers are coroutines which share the response body
+    handling with :class:`Manager`, so results are the same Resource and
+    ListWithMeta types. It only extends BaseManager, the blocking helpers of
+    Manager such as hydrate, response cache and paginated iteration are not
+    available. Mix it in front of the base of a synchronous manager, then
+    every manager function which returns a helper result directly becomes a
+    coroutine function too.
+
+    http_client must be an AsyncOpenStackHttpClient.
+    """
+
+    async def _list(self, url, params={}, resource_class=None, key=None,
+                    headers={}):
+        resp, body = await self.http_client.get(url, params=params,
+                                                headers=headers)
+        return self._list_from_body(resp, body, resource_class, key)
+
+    async def _delete(self, url, headers={}):
+        resp, body = await self.http_client.delete(url, headers=headers)
+        return self.mixin_meta(body, resp)
+
+    async def _update(self, url, json, key=None, raw=False, headers={}):
+        resp, body = await self.http_client.patch(url, json=json,
+                                                  headers=headers)
+        return self._update_from_body(resp, body, key, raw)
+
+    async def _update_all(self, url, json, key=None, raw=False, headers={}):
+        resp, body = await self.http_client.put(url, json=json,
+                                                headers=headers)
+        return self._update_from_body(resp, body, key, raw)
+
+    async def _create(self, url, data=None, key=None, raw=False, headers={}):
+        if data:
+            resp, body = await self.http_client.post(url, json=data,
+                                                     headers=headers)
+        else:
+            resp, body = await self.http_client.post(url, headers=headers)
+        return self._create_from_body(resp, body, key, raw)
+
+    async def _get(self, url, params={}, key=None, raw=False,
+                   resource_class=None, headers={}):
+        resp, body = await self.http_client.get(url, params=params,
+                                                headers=headers)
+        return self._get_from_body(resp, body, key, raw, resource_class)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import errno
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+
+from requests import Response
+from six.moves.urllib import parse
+
+LOGGER = logging.getLogger(__name__)
+
+# default max bytes of all cached entries
+DEFAULT_CACHE_MAX_SIZE = 16 * 1024 * 1024
+
+# suffix of cache entry file
+_ENTRY_SUFFIX = '.json'
+# separator of quoted URL and params hash in entry file name, it is always
+# escaped in quoted URL
+_SEPARATOR = '@'
+
+
+class CachePolicy(object):
+    """Cache rule of GET endpoints whose URL matches a pattern
+
+    :param pattern: regular expression matches request URL
+    :param ttl: seconds a response lives, 0 to only cache immutable ones
+    :param immutable: optional function accepts (params, body), returns
+        True if the response will never change and could be kept until it
+        is evicted
+    """
+
+    def __init__(self, pattern, ttl=0, immutable=None):
+        self.pattern = re.compile(pattern)
+        self.ttl = ttl
+        self.immutable = immutable
+
+    def matches(self, url):
+        return self.pattern.match(url) is not None
+
+    def get_ttl(self, params, body):
+        """get seconds the response lives
+
+        :return: -1 if response is immutable, None if should not cache
+        """
+        if self.immutable and self.immutable(params, body):
+            return -1
+        return self.ttl if self.ttl > 0 else None
+
+
+class ResponseCache(object):
+    """File backed cache of decoded GET response body
+
+    Every entry is a JSON file named by the quoted request URL and a hash
+    of request scope and params, so entries of an URL could be found
+    without reading them. The scope is the service endpoint of the client,
+    which contains the project id, clients of different clouds or projects
+    sharing a directory never see entries of each other. Least recently used entries are evicted when total size of
+    entries exceeds ``max_size`` bytes.
+
+    Entry names are indexed by URL in memory, the directory is listed once
+    when the index is first used, entries written by other processes after
+    that are not invalidated by this cache.
+    """
+
+    def __init__(self, directory, max_size=DEFAULT_CACHE_MAX_SIZE):
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+        self._size = None
+        # URL -> set of entry file names, loaded on first use
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _path(self, url, params, scope=None):
+        encoded = json.dumps([scope, params or {}], sort_keys=True)
+        digest = hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+        filename = (parse.quote(url, safe='') + _SEPARATOR + digest +
+                    _ENTRY_SUFFIX)
+        return os.path.join(self.directory, filename)
+
+    def _entries(self):
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return []
+        return [name for name in names if name.endswith(_ENTRY_SUFFIX)]
+
+    def _load_index(self):
+        """get the entry index, caller should hold the lock"""
+        if self._index is None:
+            self._index = {}
+            for name in self._entries():
+                url = parse.unquote(name.split(_SEPARATOR, 1)[0])
+                self._index.setdefault(url, set()).add(name)
+        return self._index
+
+    def get(self, url, params=None, scope=None):
+        """get cached (response, body) of request, None if missed
+
+        :param scope: service endpoint the request is sent to
+        """
+        path = self._path(url, params, scope)
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except (IOError, OSError, ValueError):
+            return None
+
+        expires_at = entry.get('expires_at')
+        if expires_at is not None and expires_at < time.time():
+            self._remove(path)
+            return None
+
+        # mark entry as recently used
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+
+        resp = Response()
+        resp.status_code = 200
+        resp.url = url
+        resp.headers.update(entry.get('headers', {}))
+        return resp, entry['body']
+
+    def set(self, url, params, resp, body, ttl, scope=None):
+        """store decoded response body of request
+
+        :param ttl: seconds entry lives, -1 for never expires
+        :param scope: service endpoint the request is sent to
+        """
+        headers = {}
+        if isinstance(resp, Response):
+            for header in ('openstack-request-id',
+                           'x-openstack-request-id',
+                           'x-compute-request-id'):
+                if header in resp.headers:
+                    headers[header] = resp.headers[header]
+        entry = {
+            'scope': scope,
+            'url': url,
+            'params': params or {},
+            'headers': headers,
+            'body': body,
+            'expires_at': None if ttl < 0 else time.time() + ttl,
+        }
+        content = json.dumps(entry).encode('utf-8')
+        path = self._path(url, params, scope)
+        try:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                LOGGER.debug('Failed to create cache directory: %s', e)
+                return
+        try:
+            # write to temp file first, readers never see partial entry
+            fd, temp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(content)
+            self._remove(path)
+            os.rename(temp, path)
+        except (IOError, OSError) as e:
+            LOGGER.debug('Failed to write cache entry %s: %s', path, e)
+            return
+        with self._lock:
+            self._load_index().setdefault(url, set()).add(
+                os.path.basename(path))
+        self._grow(len(content))
+
+    def invalidate(self, url):
+        """remove cached entries affected by a write to the url
+
+        entries of the url itself, its sub resources and its parent
+        collection are removed, whatever their scope is.
+        """
+        url = url.rstrip('/')
+        parent = url.rsplit('/', 1)[0]
+        with self._lock:
+            names = [name
+                     for cached_url, entries in self._load_index().items()
+                     if (cached_url == url or cached_url == parent or
+                         cached_url.startswith(url + '/'))
+                     for name in entries]
+        for name in names:
+            self._remove(os.path.join(self.directory, name))
+
+    def clear(self):
+        """remove all cached entries"""
+        for name in self._entries():
+            self._remove(os.path.join(self.directory, name))
+        with self._lock:
+            self._index = {}
+            self._size = 0
+
+    def _remove(self, path):
+        name = os.path.basename(path)
+        url = parse.unquote(name.split(_SEPARATOR, 1)[0])
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        with self._lock:
+            entries = (self._index or {}).get(url)
+            if entries is not None:
+                entries.discard(name)
+                if not entries:
+                    del self._index[url]
+            if self._size is not None:
+                self._size = max(0, self._size - size)
+
+    def _grow(self, size):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(self._stat(name)[1]
+                                 for entries in self._load_index().values()
+                                 for name in entries)
+            else:
+                self._size += size
+            if self._size <= self.max_size:
+                return
+            self._evict()
+
+    def _stat(self, name):
+        try:
+            stat = os.stat(os.path.join(self.directory, name))
+            return stat.st_mtime, stat.st_size
+        except OSError:
+            return 0, 0
+
+    def _evict(self):
+        """remove least recently used entries until size is under 90% of
+        max size, caller should hold the lock.
+        """
+        index = self._load_index()
+        entries = sorted((self._stat(name) + (url, name))
+                         for url, names in index.items() for name in names)
+        total = sum(entry[1] for entry in entries)
+        target = self.max_size * 0.9
+        for _, size, url, name in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            index[url].discard(name)
+            if not index[url]:
+                del index[url]
+            total -= size
+        self._size = total
+
@@ -12,12 +12,70 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
-from osc_lib import utils
+import operator
+
+# compiled display plans by (class, column names, formatters)
+_PLANS = {}
+
+
+class DisplayPlan(object):
+    """Accessor plan turns a resource into display data of columns
+
+    Column names are mapped and converted to attribute names once when the
+    plan is compiled, every row is then read by a single attrgetter and
+    only the formatted columns are touched again.
+
+    :param names: attribute names of the columns
+    :param formatters: formatter of every column, None if not formatted
+    """
+
+    __slots__ = ('names', '_getter', '_formatters')
+
+    def __init__(self, names, formatters):
+        self.names = tuple(names)
+        self._getter = operator.attrgetter(*self.names) if self.names \
+            else None
+        self._formatters = tuple((index, formatter)
+                                 for index, formatter in enumerate(formatters)
+                                 if formatter is not None)
+
+    def __call__(self, item):
+        names = self.names
+        try:
+            values = self._getter(item) if names else ()
+            if len(names) == 1:
+                values = (values,)
+        except AttributeError:
+            # missing attribute is displayed as ''
+            values = tuple(getattr(item, name, '') for name in names)
+        if self._formatters:
+            values = list(values)
+            for index, formatter in self._formatters:
+                values[index] = formatter(values[index])
+            values = tuple(values)
+        return values
+
+
+def iter_display_data(items, column_names, formatter=None):
+    """get_display_data of every item, plan is compiled once per class
+
+    :param items: Display items, e.g. rows of a Lister result
+    :return: generator of display data tuples
+    """
+    item_class = plan = None
+    for item in items:
+        if type(item) is not item_class:
+            item_class = type(item)
+            plan = item_class.get_display_plan(column_names, formatter)
+        yield plan(item)
 
 
 class Display(object):
     """Provide functions for display resource"""
 
+    # keep slotted resources free of __dict__
+    __slots__ = ()
+
     # get columns used for listing resource(multiple records)
     # Resource inherit Display must override this field to specify
     # the columns which should be used when display resource list.
@@ -31,16 +89,38 @@ class Display(object):
     # column to resource property mapping
     column_2_property = {}
 
-    def get_mapped_properties(self, column_names):
+    @classmethod
+    def get_mapped_properties(cls, column_names):
         """get mapped fields mapping to an exists field"""
         mapped = []
         for column_name in column_names:
-            if column_name in self.column_2_property:
-                mapped.append(self.column_2_property[column_name])
+            if column_name in cls.column_2_property:
+                mapped.append(cls.column_2_property[column_name])
             else:
                 mapped.append(column_name)
         return mapped
 
+    @classmethod
+    def get_display_plan(cls, column_names, formatter=None):
+        """get the compiled DisplayPlan of the columns
+
+        plans are compiled once and kept for every class, column names and
+        formatters combination
+        """
+        key = (cls, tuple(column_names),
+               frozenset(formatter.items()) if formatter else None)
+        plan = _PLANS.get(key)
+        if plan is None:
+            properties = cls.get_mapped_properties(column_names)
+            formatter = formatter or {}
+            # same as osc_lib.utils.get_item_properties
+            plan = DisplayPlan(
+                [p.lower().replace(' ', '_') for p in properties],
+                [formatter.get(p) for p in properties]
+            )
+            _PLANS[key] = plan
+        return plan
+
     def get_display_data(self, column_names, formatter=None):
         """get data mapped to column names
 
@@ -54,7 +134,4 @@ class Display(object):
         :return: data mapping to column_names
         :rtype: tuple
         """
-        properties = self.get_mapped_properties(column_names)
-        return utils.get_item_properties(self,
-                                         properties,
-                                         formatters=formatter)
+        return self.get_display_plan(column_names, formatter)(self)
@@ -59,3 +59,12 @@ def from_http_error(exception):
 
 class NotUniqueMatch(base.ClientException):
     message = "Could not locate unique resource"
+
+
+class WaitTimeout(base.ClientException):
+    message = "Timed out waiting for tasks"
+
+    def __init__(self, message=None, pending=None):
+        super(WaitTimeout, self).__init__(message)
+        # ids of tasks not finished yet
+        self.pending = pending or []
@@ -12,22 +12,57 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
-from antiddosclient.common import exceptions
+import logging
+import threading
+import time
 
 from keystoneauth1 import adapter
+from keystoneauth1 import exceptions as ks_exceptions
+from keystoneauth1 import session as ks_session
 from keystoneauth1.exceptions import HttpError
+import requests
+from requests import adapters
+from six.moves.urllib import parse
+
+from antiddosclient.common import exceptions
+from antiddosclient.common import metrics as metrics_module
+from antiddosclient.common import retry as retry_module
+
+LOGGER = logging.getLogger(__name__)
 
 
 class OpenStackHttpClient(adapter.LegacyJsonAdapter):
     """Common OpenStack API HTTP Client with response data type of JSON."""
 
-    def __init__(self, session, endpoint=None, **kwargs):
+    def __init__(self, session, endpoint=None, pool_size=None,
+                 pool_size_per_host=None, pool_block=False, keep_alive=True,
+                 retry_policy=None, rate_limiter=None, metrics=None,
+                 **kwargs):
         """Initialize a new client to access open-stack API.
 
         :param keystoneauth1.session.Session session:
             The session to be used for making the HTTP API calls.
         :param string endpoint:
             An optional URL to be used as the base for API requests on this API
+        :param int pool_size:
+            Max connections kept alive for every host. When specified (or
+            pool_block is set), the client uses a private connection pool
+            instead of the one of the session.
+        :param int pool_size_per_host:
+            Max in-flight requests to one host, extra requests wait.
+        :param bool pool_block:
+            Wait for a free pooled connection when pool is exhausted instead
+            of opening a connection which is discarded after use.
+        :param bool keep_alive:
+            Reuse connections between requests, disable it to close
+            connection after every request.
+        :param antiddosclient.common.retry.RetryPolicy retry_policy:
+            Retry failed requests, no retry if not specified
+        :param antiddosclient.common.retry.RateLimiter rate_limiter:
+            Limit request rate of all managers using the client
+        :param antiddosclient.common.metrics.HttpMetrics metrics:
+            Collector of request metrics, a new one is created if not
+            specified
         :param kwargs:
             Keyword arguments passed to keystoneauth1.adapter.Adapters
         """
@@ -40,17 +75,242 @@ class OpenStackHttpClient(adapter.LegacyJsonAdapter):
         # if session.auth:
         #     kwargs['auth'] = session.auth
 
+        if pool_size or pool_block:
+            session = self._with_connection_pool(
+                session, pool_size or adapters.DEFAULT_POOLSIZE, pool_block
+            )
+
         super(OpenStackHttpClient, self).__init__(session, **kwargs)
 
+        self.pool_size = pool_size
+        self.pool_size_per_host = pool_size_per_host
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.retry_policy = retry_policy
+        self.rate_limiter = rate_limiter
+        self.metrics = (metrics if metrics is not None
+                        else metrics_module.HttpMetrics())
+
+        self._pool_lock = threading.Lock()
+        self._host_semaphores = {}
+        # host of the service endpoint, resolved at the first request
+        self._endpoint_host = None
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._waited = 0
+
+    @staticmethod
+    def _with_connection_pool(session, pool_size, pool_block):
+        """new keystoneauth session with a private connection pool
+
+        authentication plugin (and token) is still shared with the original
+        session, connections keep TCP keep-alive of keystoneauth.
+        """
+        http_adapter = ks_session.TCPKeepAliveAdapter(pool_maxsize=pool_size,
+                                                      pool_block=pool_block)
+        http = requests.Session()
+        http.mount('https://', http_adapter)
+        http.mount('http://', http_adapter)
+
+        return ks_session.Session(
+            auth=session.auth,
+            session=http,
+            original_ip=getattr(session, 'original_ip', None),
+            verify=getattr(session, 'verify', True),
+            cert=getattr(session, 'cert', None),
+            timeout=getattr(session, 'timeout', None),
+            user_agent=getattr(session, 'user_agent', None),
+            redirect=getattr(session, 'redirect', 30),
+            additional_headers=getattr(session, 'additional_headers', None),
+        )
+
+    def _get_endpoint_host(self):
+        """host of the service endpoint, where relative URLs are sent"""
+        if self._endpoint_host is None:
+            endpoint = self.get_endpoint()
+            self._endpoint_host = parse.urlparse(endpoint or '').netloc
+        return self._endpoint_host
+
+    def _get_host_semaphore(self, url):
+        if not self.pool_size_per_host:
+            return None
+        host = parse.urlparse(url or '').netloc
+        if not host:
+            # relative URL is sent to the service endpoint host
+            host = self._get_endpoint_host()
+        with self._pool_lock:
+            if host not in self._host_semaphores:
+                self._host_semaphores[host] = threading.BoundedSemaphore(
+                    self.pool_size_per_host
+                )
+            return self._host_semaphores[host]
+
+    def _track_in_flight(self, delta):
+        with self._pool_lock:
+            self._in_flight += delta
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+
     def request(self, *args, **kwargs):
         """Override request method to handle http exceptions
 
-        HuaWei Service return not standard error structure
-        :param args:
-        :param kwargs:
-        :return:
+        HuaWei Service return not standard error structure, failed request
+        is retried if retry policy allows.
+        :param args: url and method
+        :param kwargs: retry=True/False to force retry or not for this
+            request, stream=True to return the response without reading
+            its body (body is None then, read it with response.iter_content
+            and close the response), others are passed to keystoneauth1
+            adapter
+        :return: (response, decoded JSON body)
         """
+        retry = kwargs.pop('retry', None)
+        url = args[0] if args else kwargs.get('url')
+        method = args[1] if len(args) > 1 else kwargs.get('method')
+        policy = self.retry_policy
+        if policy is None or not policy.is_retryable_method(method, retry):
+            return self._send(*args, **kwargs)
+
+        attempt = 0
+        waited = 0
+        while True:
+            try:
+                return self._send(*args, **kwargs)
+            except (HttpError, ks_exceptions.ConnectionError) as e:
+                attempt += 1
+                if (attempt > policy.max_retries or
+                        not policy.is_retryable_error(e)):
+                    raise
+                delay = policy.get_delay(attempt, e)
+                # a request never waits longer than the policy allows in
+                # total, whatever timeout is
+                if not policy.allows_delay(waited, delay):
+                    raise
+                waited += delay
+                self.metrics.record_retry(method, url)
+                LOGGER.debug('Retry %s request in %.2f seconds (%d/%d): %s',
+                             method, delay, attempt, policy.max_retries, e)
+                if (self.rate_limiter is not None and
+                        getattr(e, 'http_status', None) == 429):
+                    # slow down every request shares the limiter
+                    self.rate_limiter.pause(delay)
+                time.sleep(delay)
+
+    def _send(self, *args, **kwargs):
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        if not self.keep_alive:
+            headers = dict(kwargs.get('headers') or {})
+            headers['Connection'] = 'close'
+            kwargs['headers'] = headers
+
+        url = args[0] if args else kwargs.get('url')
+        semaphore = self._get_host_semaphore(url)
+        if semaphore is not None and not semaphore.acquire(False):
+            with self._pool_lock:
+                self._waited += 1
+            semaphore.acquire()
+
+        method = args[1] if len(args) > 1 else kwargs.get('method')
+        stream = kwargs.get('stream', False)
+        response = None
+        self._track_in_flight(1)
+        started_at = time.time()
         try:
-            return super(OpenStackHttpClient, self).request(*args, **kwargs)
+            if stream:
+                result = self._send_stream(*args, **kwargs)
+            else:
+                result = super(OpenStackHttpClient, self).request(*args,
+                                                                  **kwargs)
+            if isinstance(result, tuple):
+                response = result[0]
+            return result
         except HttpError as http:
+            response = http.response
             raise exceptions.from_http_error(http)
+        finally:
+            self._record(method, url, response, time.time() - started_at,
+                         stream)
+            self._track_in_flight(-1)
+            if semaphore is not None:
+                semaphore.release()
+
+    def _send_stream(self, url, method, **kwargs):
+        """send request without reading response body
+
+        body is left in the connection for the caller to read incrementally,
+        the connection returns to pool when the response is closed.
+        """
+        headers = dict(kwargs.get('headers') or {})
+        headers.setdefault('Accept', 'application/json')
+        kwargs['headers'] = headers
+        if 'body' in kwargs:
+            kwargs['json'] = kwargs.pop('body')
+        # skip JSON decoding of LegacyJsonAdapter
+        resp = adapter.Adapter.request(self, url, method, **kwargs)
+        return resp, None
+
+    def _record(self, method, url, response, seconds, stream=False):
+        status = getattr(response, 'status_code', None)
+        if not isinstance(status, int):
+            # no response received or response is faked
+            status = response = None
+
+        server_seconds = bytes_in = bytes_out = None
+        if isinstance(response, requests.Response):
+            server_seconds = response.elapsed.total_seconds()
+            if stream:
+                # body is not read yet, reading content would load it all
+                bytes_in = int(response.headers.get('Content-Length') or 0)
+            else:
+                bytes_in = len(response.content or b'')
+            body = getattr(response.request, 'body', None)
+            if body:
+                bytes_out = len(body)
+        self.metrics.record(method, url, status, seconds,
+                            server_seconds=server_seconds,
+                            bytes_in=bytes_in, bytes_out=bytes_out)
+
+    def stats(self):
+        """snapshot of per route request metrics"""
+        return self.metrics.snapshot()
+
+    def pool_stats(self):
+        """report connection pool utilization
+
+        :return: dict contains pool settings, current and peak in-flight
+            request number, number of requests waited for per host limit,
+            and opened/idle connections of every host pool
+        """
+        with self._pool_lock:
+            stats = {
+                'pool_size': self.pool_size,
+                'pool_size_per_host': self.pool_size_per_host,
+                'in_flight': self._in_flight,
+                'peak_in_flight': self._peak_in_flight,
+                'waited': self._waited,
+                'hosts': [],
+            }
+
+        http = getattr(self.session, 'session', None)
+        http_adapters = getattr(http, 'adapters', None) or {}
+        visited = set()
+        for http_adapter in list(http_adapters.values()):
+            poolmanager = getattr(http_adapter, 'poolmanager', None)
+            if poolmanager is None or id(poolmanager) in visited:
+                continue
+            visited.add(id(poolmanager))
+            for key in poolmanager.pools.keys():
+                pool = poolmanager.pools.get(key)
+                if pool is None or pool.pool is None:
+                    continue
+                stats['hosts'].append({
+                    'host': '%s://%s:%s' % (pool.scheme, pool.host,
+                                            pool.port),
+                    'max_size': pool.pool.maxsize,
+                    'idle': sum(1 for conn in list(pool.pool.queue)
+                                if conn is not None),
+                    'opened': pool.num_connections,
+                    'requests': pool.num_requests,
+                })
+        return stats
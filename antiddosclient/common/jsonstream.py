@@ -0,0 +1,237 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import codecs
+import json
+import re
+
+# bytes read from response stream every time
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# chars change nesting or string state of a JSON value outside strings
+_STRUCTURE = re.compile(r'[{}\[\]"]')
+# chars end or escape a JSON string
+_STRING_SPECIAL = re.compile(r'["\\]')
+# first chars of JSON values which end with a known char
+_ELEMENT_STARTS = ('{', '[', '"')
+# consumed buffer is dropped once it is longer than this
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class JsonArrayStream(object):
+    """Decode items of a JSON array nested in an object incrementally
+
+    Response body like ``{"total": 2, "logs": [{...}, {...}]}`` is read
+    chunk by chunk, items of the array under ``key`` (nested key is joined
+    by ".", the same as Manager.get_data) are decoded and yielded one by
+    one, so only one chunk and one item are held in memory. Other members
+    of the objects on the path are decoded into :attr:`meta` as they are
+    met, the ones after the array are available after iteration finished.
+
+    Iterating a body without the key yields nothing, iterating a body
+    which is not a JSON object raises ValueError.
+
+    :param chunks: iterable of bytes (or text) chunks
+    :param key: dot separated path of the array, None for a top level array
+    :param encoding: charset of bytes chunks
+    """
+
+    def __init__(self, chunks, key=None, encoding='utf-8'):
+        self._chunks = iter(chunks)
+        self._path = key.split('.') if key else []
+        self._decoder = codecs.getincrementaldecoder(encoding or 'utf-8')()
+        self._json = json.JSONDecoder()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+        self.meta = {}
+
+    def _fill(self):
+        """read next chunk into buffer, return False at end of stream"""
+        if self._eof:
+            return False
+        if self._pos > _COMPACT_THRESHOLD:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            if isinstance(chunk, bytes):
+                chunk = self._decoder.decode(chunk)
+            self._buffer += chunk
+            return True
+        self._buffer += self._decoder.decode(b'', final=True)
+        self._eof = True
+        return False
+
+    def _peek(self):
+        """skip whitespace and return next char, '' at end of stream"""
+        # compact JSON has no whitespace, skip the regex then
+        if self._pos < len(self._buffer):
+            char = self._buffer[self._pos]
+            if char not in ' \t\n\r':
+                return char
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char):
+        if self._peek() != char:
+            raise ValueError('Expecting %r at char %d of JSON stream' %
+                             (char, self._pos))
+        self._pos += 1
+
+    def _buffer_element(self):
+        """read chunks until the object, array or string at the current
+        position is complete in buffer
+
+        every char is scanned once, the scan continues from where the
+        previous chunk ended.
+
+        :return: False if stream ended before the value is complete
+        """
+        depth = 0
+        in_string = False
+        # scanned chars after the value start, kept when buffer is compacted
+        offset = 0
+        while True:
+            buffer = self._buffer
+            index = self._pos + offset
+            while True:
+                if in_string:
+                    match = _STRING_SPECIAL.search(buffer, index)
+                    if match is None:
+                        index = len(buffer)
+                        break
+                    if match.group() == '\\':
+                        if match.end() == len(buffer):
+                            # escaped char is in next chunk
+                            index = match.start()
+                            break
+                        index = match.end() + 1
+                        continue
+                    index = match.end()
+                    in_string = False
+                    if not depth:
+                        return True
+                else:
+                    match = _STRUCTURE.search(buffer, index)
+                    if match is None:
+                        index = len(buffer)
+                        break
+                    index = match.end()
+                    char = match.group()
+                    if char == '"':
+                        in_string = True
+                    elif char in '{[':
+                        depth += 1
+                    else:
+                        depth -= 1
+                        if not depth:
+                            return True
+            offset = index - self._pos
+            if not self._fill():
+                return False
+
+    def _value(self):
+        """decode next complete JSON value"""
+        char = self._peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except ValueError:
+                if char in _ELEMENT_STARTS:
+                    # value is split by chunk boundary, decode it once it
+                    # is complete instead of decoding again every chunk
+                    if not self._buffer_element():
+                        raise
+                    value, self._pos = self._json.raw_decode(self._buffer,
+                                                             self._pos)
+                    return value
+                # number may be split by chunk boundary
+                if not self._fill():
+                    raise
+                continue
+            # number at the end of buffer may continue in next chunk
+            if (char in _ELEMENT_STARTS or end < len(self._buffer) or
+                    self._eof or not self._fill()):
+                self._pos = end
+                return value
+
+    def _enter(self, key):
+        """move to the value of key in current object
+
+        :return: True if key is found, members before it are put into meta
+        """
+        self._expect('{')
+        if self._peek() == '}':
+            self._pos += 1
+            return False
+        while True:
+            name = self._value()
+            self._expect(':')
+            if name == key:
+                return True
+            self.meta[name] = self._value()
+            char = self._peek()
+            self._pos += 1
+            if char == '}':
+                return False
+            if char != ',':
+                raise ValueError('Expecting , or } at char %d of JSON '
+                                 'stream' % (self._pos - 1))
+
+    def _leave(self, depth):
+        """decode rest members of the objects on the path into meta"""
+        for _ in range(depth):
+            while True:
+                char = self._peek()
+                self._pos += 1
+                if char == '}':
+                    break
+                if char != ',':
+                    raise ValueError('Expecting , or } at char %d of JSON '
+                                     'stream' % (self._pos - 1))
+                name = self._value()
+                self._expect(':')
+                self.meta[name] = self._value()
+
+    def __iter__(self):
+        for depth, key in enumerate(self._path):
+            if not self._enter(key):
+                self._leave(depth)
+                return
+
+        if self._peek() == 'n':
+            # array is null
+            self._value()
+        else:
+            self._expect('[')
+            if self._peek() == ']':
+                self._pos += 1
+            else:
+                while True:
+                    yield self._value()
+                    char = self._peek()
+                    self._pos += 1
+                    if char == ']':
+                        break
+                    if char != ',':
+                        raise ValueError('Expecting , or ] at char %d of '
+                                         'JSON stream' % (self._pos - 1))
+        self._leave(len(self._path))
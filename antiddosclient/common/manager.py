@@ -17,26 +17,36 @@
 #   under the License.
 #
 
+import collections
+from concurrent import futures
+
+from keystoneauth1 import exceptions
 import six
 
+from antiddosclient.common import jsonstream
 from antiddosclient.common import resource
 
+# default page size of paginated listing
+DEFAULT_PAGE_SIZE = 100
+# default number of pages fetched ahead in background
+DEFAULT_PAGE_WINDOW = 1
+# default worker number of hydrate
+DEFAULT_HYDRATE_CONCURRENCY = 10
+
 
-class Manager(object):
+class BaseManager(object):
     """Base Manager for API service.
 
     Managers interact with a particular type of API (servers, flavors, images,
-    etc.) and provide CRUD operations for them.
+    etc.) and provide CRUD operations for them. The base only builds results
+    from decoded response bodies, the request helpers are provided by
+    :class:`Manager` and AsyncManager.
     """
 
     resource_class = resource.Resource
 
     def __init__(self, http_client):
-        """initial with open stack http client
-
-        :param http_client: http requester with type of
-            antiddosclient.common.httpclient.OpenStackHttpClient
-        """
+        """initial with open stack http client"""
         self.http_client = http_client
 
     def get_data(self, data, path=None):
@@ -45,12 +55,13 @@ class Manager(object):
             return self.get_data(data[nested[0]], '.'.join(nested[1:]))
         return data
 
-    def _list(self, url, params={}, resource_class=None, key=None, headers={}):
-        """ common list resource function
+    def _list_from_body(self, resp, body, resource_class=None, key=None):
+        """build list result from a decoded response body
 
-        :rtype: Resource
+        resources are built when rows are accessed, see LazyListWithMeta
+
+        :rtype: ListWithMeta
         """
-        resp, body = self.http_client.get(url, params=params, headers=headers)
         resource_class = (resource_class if resource_class
                           else self.resource_class)
         # get required body part
@@ -58,33 +69,21 @@ class Manager(object):
         data = data if data else []
         if all([isinstance(_resource, six.string_types)
                 for _resource in data]):
-            items = data
-        else:
-            items = [resource_class(self, _resource, attached=True, resp=resp)
-                     for _resource in data if _resource]
-        return resource.ListWithMeta(items, resp)
+            return resource.ListWithMeta(data, resp)
 
-    def _delete(self, url, headers={}):
-        resp, body = self.http_client.delete(url, headers=headers)
-        return self.mixin_meta(body, resp)
+        result = resource.LazyListWithMeta([row for row in data if row],
+                                           resp, None)
+        # resources only keep request id, do not hold the whole response,
+        # and factory must not refer to result, which makes a cycle
+        request_id = result.request_id
 
-    def _update(self, url, json, key=None, raw=False, headers={}):
-        """update part of resource with PATCH method"""
-        resp, body = self.http_client.patch(url, json=json, headers=headers)
-        # PATCH requests may not return a body
-        if body:
-            # get required body part
-            content = self.get_data(body, key)
-            if raw:
-                return self.mixin_meta(content, resp)
-            else:
-                return self.resource_class(self, content, resp=resp)
-        else:
-            return resource.StrWithMeta(resp.text, resp)
+        def factory(row):
+            return resource_class(self, row, attached=True, resp=request_id)
+        result._factory = factory
+        return result
 
-    def _update_all(self, url, json, key=None, raw=False, headers={}):
-        """update resource with PUT method"""
-        resp, body = self.http_client.put(url, json=json, headers=headers)
+    def _update_from_body(self, resp, body, key=None, raw=False):
+        """build PATCH/PUT result from a decoded response body"""
         # PATCH requests may not return a body
         if body:
             # get required body part
@@ -96,12 +95,8 @@ class Manager(object):
         else:
             return resource.StrWithMeta(resp.text, resp)
 
-    def _create(self, url, data=None, key=None, raw=False, headers={}):
-        if data:
-            resp, body = self.http_client.post(url, json=data, headers=headers)
-        else:
-            resp, body = self.http_client.post(url, headers=headers)
-
+    def _create_from_body(self, resp, body, key=None, raw=False):
+        """build POST result from a decoded response body"""
         # get required body part
         content = self.get_data(body, key)
         if raw or not body:
@@ -109,9 +104,9 @@ class Manager(object):
         else:
             return self.resource_class(self, content, resp=resp)
 
-    def _get(self, url, params={}, key=None, raw=False, resource_class=None,
-             headers={}):
-        resp, body = self.http_client.get(url, params=params, headers=headers)
+    def _get_from_body(self, resp, body, key=None, raw=False,
+                       resource_class=None):
+        """build GET result from a decoded response body"""
         # get required body part
         if body:
             content = self.get_data(body, key)
@@ -140,3 +135,212 @@ class Manager(object):
             return resource.TupleWithMeta((), resp)
         else:
             return resource.DictWithMeta(item, resp)
+
+
+class Manager(BaseManager):
+    """Base Manager for API service with blocking request helpers."""
+
+    # cache rules of GET endpoints, list of cache.CachePolicy
+    cache_policies = ()
+
+    def __init__(self, http_client, cache=None):
+        """initial with open stack http client
+
+        :param http_client: http requester with type of
+            antiddosclient.common.httpclient.OpenStackHttpClient
+        :param cache: optional antiddosclient.common.cache.ResponseCache,
+            responses of endpoints matches cache_policies are cached
+        """
+        super(Manager, self).__init__(http_client)
+        self.cache = cache
+
+    def _get_cache_policy(self, url):
+        if self.cache is not None:
+            for policy in self.cache_policies:
+                if policy.matches(url):
+                    return policy
+        return None
+
+    def _http_get(self, url, params, headers):
+        """send GET request, response is served from cache when possible
+
+        cached responses are scoped by the service endpoint, which contains
+        the project id, so a shared cache never mixes up clouds or projects
+        """
+        policy = self._get_cache_policy(url)
+        if policy is None:
+            return self.http_client.get(url, params=params, headers=headers)
+
+        scope = self.http_client.get_endpoint()
+        cached = self.cache.get(url, params, scope=scope)
+        if cached is not None:
+            return cached
+
+        resp, body = self.http_client.get(url, params=params, headers=headers)
+        ttl = policy.get_ttl(params, body) if body else None
+        if ttl is not None:
+            self.cache.set(url, params, resp, body, ttl, scope=scope)
+        return resp, body
+
+    def _invalidate_cache(self, url):
+        if self.cache is not None:
+            self.cache.invalidate(url)
+
+    def _list(self, url, params={}, resource_class=None, key=None, headers={}):
+        """ common list resource function
+
+        :rtype: Resource
+        """
+        resp, body = self._http_get(url, params, headers)
+        return self._list_from_body(resp, body, resource_class, key)
+
+    def _stream(self, url, params={}, resource_class=None, key=None,
+                headers={}):
+        """stream list resource, rows are decoded one by one from response
+
+        neither the response body nor the decoded listing is held in memory
+        as a whole, peak memory does not grow with the listing size.
+        Response cache is not used.
+
+        :rtype: StreamWithMeta
+        """
+        resource_class = (resource_class if resource_class
+                          else self.resource_class)
+        resp, _ = self.http_client.get(url, params=params, headers=headers,
+                                       stream=True)
+        rows = jsonstream.JsonArrayStream(
+            resp.iter_content(jsonstream.DEFAULT_CHUNK_SIZE),
+            key, resp.encoding
+        )
+        result = resource.StreamWithMeta(rows, resp, None)
+        request_id = result.request_id
+
+        def factory(row):
+            return resource_class(self, row, attached=True, resp=request_id)
+        result._factory = factory
+        return result
+
+    @staticmethod
+    def _iter_page_lists(fetch_page, page_size=DEFAULT_PAGE_SIZE,
+                         window=DEFAULT_PAGE_WINDOW, offset=0):
+        """iterate pages of a limit/offset paginated API
+
+        While the current page is consumed, next ``window`` pages are
+        fetched in background, so no more than ``window + 1`` pages are held
+        in memory at the same time. Iteration stops at the first page which
+        is shorter than page size.
+
+        :param fetch_page: function accepts (limit, offset), returns a page
+        :param page_size: item number of a page
+        :param window: pages fetched ahead, 0 to disable prefetch
+        :param offset: offset of the first page
+        """
+        executor = futures.ThreadPoolExecutor(max_workers=max(window, 1))
+        pending = collections.deque()
+        next_offset = offset or 0
+        try:
+            while True:
+                while len(pending) <= window:
+                    pending.append(executor.submit(fetch_page,
+                                                   page_size,
+                                                   next_offset))
+                    next_offset += page_size
+                page = pending.popleft().result()
+                yield page
+                if len(page) < page_size:
+                    break
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    @classmethod
+    def _iter_pages(cls, fetch_page, page_size=DEFAULT_PAGE_SIZE,
+                    window=DEFAULT_PAGE_WINDOW, offset=0):
+        """iterate items of all pages of a limit/offset paginated API, see
+        _iter_page_lists
+        """
+        pages = cls._iter_page_lists(fetch_page, page_size, window, offset)
+        try:
+            for page in pages:
+                for item in page:
+                    yield item
+        finally:
+            pages.close()
+
+    def _get_detail(self, resource_):
+        """fetch detail of a resource for hydrate
+
+        :return: dict of detail fields, None if resource has no detail
+        """
+        return self.get(resource_.uuid).original
+
+    def hydrate(self, resources, concurrency=DEFAULT_HYDRATE_CONCURRENCY,
+                force=False):
+        """fetch details of resources concurrently and merge them in place
+
+        Accessing a missing attribute of a not attached resource fetches
+        its detail with a blocking request, looping over a listing turns
+        into a request per resource. Hydrate them all at once instead.
+        Resources whose detail is not found are marked attached too, so
+        missing attributes never trigger a request again.
+
+        :param resources: resources to hydrate, attached ones are skipped
+        :param concurrency: max requests run at the same time
+        :param force: fetch details of attached resources too
+        :return: number of resources hydrated
+        """
+        pending = []
+        seen = set()
+        for resource_ in resources:
+            if id(resource_) in seen:
+                continue
+            seen.add(id(resource_))
+            if force or not resource_.has_attached():
+                pending.append(resource_)
+        if not pending:
+            return 0
+
+        def _hydrate(resource_):
+            try:
+                detail = self._get_detail(resource_)
+            except exceptions.NotFound:
+                detail = None
+            resource_.merge(detail)
+
+        workers = max(1, min(concurrency, len(pending)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            # consume results to raise the first unexpected error
+            for _ in executor.map(_hydrate, pending):
+                pass
+        return len(pending)
+
+    def _delete(self, url, headers={}):
+        resp, body = self.http_client.delete(url, headers=headers)
+        self._invalidate_cache(url)
+        return self.mixin_meta(body, resp)
+
+    def _update(self, url, json, key=None, raw=False, headers={}):
+        """update part of resource with PATCH method"""
+        resp, body = self.http_client.patch(url, json=json, headers=headers)
+        self._invalidate_cache(url)
+        return self._update_from_body(resp, body, key, raw)
+
+    def _update_all(self, url, json, key=None, raw=False, headers={}):
+        """update resource with PUT method"""
+        resp, body = self.http_client.put(url, json=json, headers=headers)
+        self._invalidate_cache(url)
+        return self._update_from_body(resp, body, key, raw)
+
+    def _create(self, url, data=None, key=None, raw=False, headers={}):
+        if data:
+            resp, body = self.http_client.post(url, json=data, headers=headers)
+        else:
+            resp, body = self.http_client.post(url, headers=headers)
+        self._invalidate_cache(url)
+        return self._create_from_body(resp, body, key, raw)
+
+    def _get(self, url, params={}, key=None, raw=False, resource_class=None,
+             headers={}):
+        resp, body = self._http_get(url, params, headers)
+        return self._get_from_body(resp, body, key, raw, resource_class)
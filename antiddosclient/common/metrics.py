@@ -0,0 +1,289 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import bisect
+import re
+import threading
+
+import six
+from six.moves import BaseHTTPServer
+from six.moves.urllib import parse
+
+# upper bounds (seconds) of latency histogram buckets
+DEFAULT_LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0,
+                           2.5, 5.0, 10.0)
+
+# path segments which are resource ids: UUID, hex id or number
+_ID_SEGMENT = re.compile(
+    r'^([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+    r'[0-9a-fA-F]{12}|[0-9a-fA-F]{32}|\d+)$'
+)
+# path segments which are IPv4 addresses
+_IP_SEGMENT = re.compile(r'^\d{1,3}(\.\d{1,3}){3}$')
+
+
+def normalize_route(url):
+    """normalize request URL to route template
+
+    query string and host are dropped, id and IP path segments are
+    replaced by ``{id}``, e.g. ``/antiddos/<uuid>/daily?x=1`` to
+    ``/antiddos/{id}/daily``.
+    """
+    path = parse.urlparse(url or '').path
+    segments = [
+        '{id}' if _ID_SEGMENT.match(seg) or _IP_SEGMENT.match(seg) else seg
+        for seg in path.split('/')
+    ]
+    return '/'.join(segments) or '/'
+
+
+class LatencyHistogram(object):
+    """cumulative latency histogram with fixed buckets"""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        # the last count is for the +Inf bucket
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, percent):
+        """estimate percentile as upper bound of the bucket contains it"""
+        if not self.count:
+            return None
+        rank = self.count * percent / 100.0
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                if index < len(self.buckets):
+                    return min(self.buckets[index], self.max)
+                return self.max
+        return self.max
+
+    def cumulative(self):
+        """list of (upper bound, cumulative count), last bound is +Inf"""
+        result = []
+        seen = 0
+        bounds = self.buckets + (float('inf'),)
+        for bound, count in zip(bounds, self.counts):
+            seen += count
+            result.append((bound, seen))
+        return result
+
+    def snapshot(self):
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'min': self.min,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'buckets': self.cumulative(),
+        }
+
+
+class RouteStats(object):
+    """counters of one (method, route)"""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.latency = LatencyHistogram(buckets)
+        self.server_seconds = 0.0
+        self.status_codes = {}
+        self.errors = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def snapshot(self):
+        return {
+            'requests': self.latency.count,
+            'latency': self.latency.snapshot(),
+            'server_seconds': self.server_seconds,
+            'status_codes': dict(self.status_codes),
+            'errors': self.errors,
+            'retries': self.retries,
+            'bytes_in': self.bytes_in,
+            'bytes_out': self.bytes_out,
+        }
+
+
+class HttpMetrics(object):
+    """Thread safe per route HTTP request metrics
+
+    Latency is the whole time spent in the HTTP client including reading
+    response body and decoding JSON, ``server_seconds`` is the time until
+    response headers were received, the gap between them is spent on the
+    client side.
+    """
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def _get(self, method, url):
+        key = ((method or '').upper(), normalize_route(url))
+        stats = self._routes.get(key)
+        if stats is None:
+            stats = self._routes[key] = RouteStats(self.buckets)
+        return stats
+
+    def record(self, method, url, status, seconds, server_seconds=None,
+               bytes_in=0, bytes_out=0):
+        """record a finished request
+
+        :param status: HTTP status code, None if no response received
+        """
+        with self._lock:
+            stats = self._get(method, url)
+            stats.latency.observe(seconds)
+            if server_seconds:
+                stats.server_seconds += server_seconds
+            if status is None:
+                stats.errors += 1
+            else:
+                stats.status_codes[status] = (
+                    stats.status_codes.get(status, 0) + 1
+                )
+            stats.bytes_in += bytes_in or 0
+            stats.bytes_out += bytes_out or 0
+
+    def record_retry(self, method, url):
+        with self._lock:
+            self._get(method, url).retries += 1
+
+    def reset(self):
+        with self._lock:
+            self._routes = {}
+
+    def snapshot(self):
+        """get metrics of all routes
+
+        :return: dict of "METHOD /route/{id}" to route metrics dict
+        """
+        with self._lock:
+            return dict(('%s %s' % key, stats.snapshot())
+                        for key, stats in six.iteritems(self._routes))
+
+    def to_prometheus(self, prefix='antiddosclient'):
+        """render metrics in Prometheus text exposition format"""
+        with self._lock:
+            routes = sorted(six.iteritems(self._routes))
+            lines = []
+
+            def family(name, kind, help_text):
+                lines.append('# HELP %s_%s %s' % (prefix, name, help_text))
+                lines.append('# TYPE %s_%s %s' % (prefix, name, kind))
+
+            def sample(name, labels, value):
+                text = ','.join('%s="%s"' % (k, _escape(v))
+                                for k, v in labels)
+                lines.append('%s_%s{%s} %s' % (prefix, name, text,
+                                               _format_value(value)))
+
+            family('http_request_duration_seconds', 'histogram',
+                   'HTTP request latency including response decoding.')
+            for (method, route), stats in routes:
+                labels = [('method', method), ('route', route)]
+                for bound, count in stats.latency.cumulative():
+                    sample('http_request_duration_seconds_bucket',
+                           labels + [('le', _format_value(bound))], count)
+                sample('http_request_duration_seconds_sum', labels,
+                       stats.latency.sum)
+                sample('http_request_duration_seconds_count', labels,
+                       stats.latency.count)
+
+            family('http_server_seconds_total', 'counter',
+                   'Seconds until HTTP response headers were received.')
+            for (method, route), stats in routes:
+                sample('http_server_seconds_total',
+                       [('method', method), ('route', route)],
+                       stats.server_seconds)
+
+            family('http_responses_total', 'counter',
+                   'HTTP responses by status code.')
+            for (method, route), stats in routes:
+                for status, count in sorted(six.iteritems(
+                        stats.status_codes)):
+                    sample('http_responses_total',
+                           [('method', method), ('route', route),
+                            ('code', status)], count)
+
+            for name, attr, help_text in (
+                    ('http_errors_total', 'errors',
+                     'HTTP requests failed without response.'),
+                    ('http_retries_total', 'retries',
+                     'HTTP requests retried.'),
+                    ('http_received_bytes_total', 'bytes_in',
+                     'HTTP response body bytes.'),
+                    ('http_sent_bytes_total', 'bytes_out',
+                     'HTTP request body bytes.')):
+                family(name, 'counter', help_text)
+                for (method, route), stats in routes:
+                    sample(name, [('method', method), ('route', route)],
+                           getattr(stats, attr))
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return (six.text_type(value).replace('\\', '\\\\')
+            .replace('"', '\\"').replace('\n', '\\n'))
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def serve_prometheus(metrics, port, addr=''):
+    """serve metrics for Prometheus scraping in a daemon thread
+
+    :param metrics: HttpMetrics, or a function returns Prometheus text
+    :return: the HTTP server, call ``shutdown()`` to stop it
+    """
+    render = metrics if callable(metrics) else metrics.to_prometheus
+
+    class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+        def do_GET(self):
+            content = render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type',
+                             'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+
+        def log_message(self, *args):
+            pass
+
+    server = BaseHTTPServer.HTTPServer((addr, port), Handler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server
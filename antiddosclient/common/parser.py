@@ -16,6 +16,14 @@ import os
 
 from antiddosclient.common.i18n import _
 
+# strings treated as true, the same as oslo_utils.strutils, which is not
+# imported as global options are registered on every start up
+_TRUE_STRINGS = ('1', 't', 'true', 'on', 'y', 'yes')
+
+
+def _bool_from_string(value):
+    return str(value or '').strip().lower() in _TRUE_STRINGS
+
 
 class BaseParser(object):
     @staticmethod
@@ -42,6 +50,96 @@ class BaseParser(object):
                     ' instead of the endpoint in the catalog').format(
                 service_type=service_type)))
 
+    @staticmethod
+    def register_cache_option(parser, service_type):
+        service_env = service_type.upper().replace('-', '_')
+        parser.add_argument(
+            '--os-{service_type}-cache-dir'.format(
+                service_type=service_type),
+            metavar='<%s-cache-dir>' % service_type,
+            default=os.environ.get(
+                'OS_{service_type}_CACHE_DIR'.format(
+                    service_type=service_env), None),
+            help=(_('Directory to cache {service_type} service responses '
+                    'which rarely change, caching is disabled if not '
+                    'specified').format(service_type=service_type)))
+
+    @staticmethod
+    def register_pool_options(parser, service_type):
+        service_env = service_type.upper().replace('-', '_')
+
+        def env(name):
+            return os.environ.get('OS_{service_type}_{name}'.format(
+                service_type=service_env, name=name), None)
+
+        parser.add_argument(
+            '--os-{service_type}-pool-size'.format(service_type=service_type),
+            metavar='<%s-pool-size>' % service_type,
+            type=int,
+            default=env('POOL_SIZE'),
+            help=(_('Max HTTP connections kept alive for every host of the '
+                    '{service_type} service (default 10)').format(
+                service_type=service_type)))
+        parser.add_argument(
+            '--os-{service_type}-pool-size-per-host'.format(
+                service_type=service_type),
+            metavar='<%s-pool-size-per-host>' % service_type,
+            type=int,
+            default=env('POOL_SIZE_PER_HOST'),
+            help=(_('Max in-flight HTTP requests to one host of the '
+                    '{service_type} service, unlimited by default').format(
+                service_type=service_type)))
+        parser.add_argument(
+            '--os-{service_type}-pool-block'.format(service_type=service_type),
+            action='store_true',
+            default=_bool_from_string(env('POOL_BLOCK')),
+            help=(_('Wait for a free pooled connection when the {service_type}'
+                    ' service connection pool is exhausted').format(
+                service_type=service_type)))
+        parser.add_argument(
+            '--os-{service_type}-no-keep-alive'.format(
+                service_type=service_type),
+            action='store_true',
+            default=_bool_from_string(env('NO_KEEP_ALIVE')),
+            help=(_('Close HTTP connection to the {service_type} service '
+                    'after every request').format(
+                service_type=service_type)))
+
+    @staticmethod
+    def register_retry_options(parser, service_type):
+        service_env = service_type.upper().replace('-', '_')
+
+        def env(name):
+            return os.environ.get('OS_{service_type}_{name}'.format(
+                service_type=service_env, name=name), None)
+
+        parser.add_argument(
+            '--os-{service_type}-max-retries'.format(
+                service_type=service_type),
+            metavar='<%s-max-retries>' % service_type,
+            type=int,
+            default=env('MAX_RETRIES'),
+            help=(_('Max retries of {service_type} service requests failed '
+                    'with throttling, server or connection errors, only '
+                    'GET/PUT/DELETE requests are retried by default').format(
+                service_type=service_type)))
+        parser.add_argument(
+            '--os-{service_type}-retry-post'.format(
+                service_type=service_type),
+            action='store_true',
+            default=_bool_from_string(env('RETRY_POST')),
+            help=(_('Retry failed POST requests to the {service_type} '
+                    'service too').format(service_type=service_type)))
+        parser.add_argument(
+            '--os-{service_type}-rate-limit'.format(
+                service_type=service_type),
+            metavar='<%s-rate-limit>' % service_type,
+            type=float,
+            default=env('RATE_LIMIT'),
+            help=(_('Max requests per second sent to the {service_type} '
+                    'service, unlimited by default').format(
+                service_type=service_type)))
+
     @staticmethod
     def add_limit_option(parser):
         parser.add_argument(
@@ -67,3 +165,42 @@ class BaseParser(object):
             choices=['desc', 'asc'],
             help=_("Sort by desc or asc")
         )
+
+    @staticmethod
+    def add_all_pages_option(parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="all_pages",
+            default=False,
+            help=_("return all results by walking through pages, "
+                   "could not be used with --limit")
+        )
+        parser.add_argument(
+            "--page-size",
+            metavar="<page-size>",
+            type=int,
+            default=100,
+            help=_("result number of every page request when --all or "
+                   "--stream is used (default 100)")
+        )
+
+    @staticmethod
+    def add_stream_option(parser):
+        parser.add_argument(
+            "--stream",
+            action="store_true",
+            default=False,
+            help=_("walk through pages like --all and write rows as soon as "
+                   "every page arrives, use with -f value or -f csv, other "
+                   "formats wait for all rows")
+        )
+        parser.add_argument(
+            "--prefetch",
+            metavar="<pages>",
+            type=int,
+            default=1,
+            help=_("pages fetched ahead while rows are written when "
+                   "--stream is used, 0 fetches pages one by one "
+                   "(default 1)")
+        )
@@ -15,13 +15,15 @@
 
 import copy
 
-from requests import Response
 import six
 
 
 class RequestIdMixin(object):
     """Wrapper class to expose x-openstack-request-id to the caller."""
 
+    # keep slotted subclasses free of __dict__
+    __slots__ = ()
+
     request_id = None
 
     def mixin_request_id(self, resp):
@@ -29,6 +31,14 @@ class RequestIdMixin(object):
 
         :param request.Response resp: http response
         """
+        if resp is None or isinstance(resp, six.string_types):
+            # request id is passed already
+            self.request_id = resp
+            return
+
+        # requests is loaded by then, import it lazily keeps importing
+        # resources cheap
+        from requests import Response
         if isinstance(resp, Response):
             # Extract 'X-Openstack-Request-Id' from headers if
             # response is a Response object.
@@ -36,7 +46,6 @@ class RequestIdMixin(object):
                           resp.headers.get('x-openstack-request-id') or
                           resp.headers.get('x-compute-request-id'))
         else:
-            # If resp is of type string or None.
             request_id = resp
 
         self.request_id = request_id
@@ -78,6 +87,21 @@ class Resource(RequestIdMixin):
     def original(self):
         return self._instance
 
+    def merge(self, info):
+        """merge detail info into the resource in place
+
+        resource is marked as attached even if info is empty, attributes
+        still missing after that are never fetched again.
+
+        :param info: dict of the detail fields
+        """
+        if info:
+            self._instance = dict(self._instance, **info)
+            for (k, v) in six.iteritems(info):
+                setattr(self, k, v)
+        self.set_attached(True)
+        return self
+
     def has_attached(self):
         return self._attached
 
@@ -128,12 +152,366 @@ class Resource(RequestIdMixin):
         return not self.__eq__(other)
 
 
+# placeholder of fields not returned by server
+_MISSING = object()
+
+
+class _Field(object):
+    """data descriptor reads a field from values tuple of CompactResource"""
+
+    __slots__ = ('name', 'index')
+
+    def __init__(self, name, index):
+        self.name = name
+        self.index = index
+
+    def __get__(self, obj, cls=None):
+        if obj is None:
+            return self
+        value = obj._values[self.index]
+        if value is _MISSING:
+            raise AttributeError(self.name)
+        return value
+
+    def __set__(self, obj, value):
+        values = list(obj._values)
+        values[self.index] = value
+        object.__setattr__(obj, '_values', tuple(values))
+
+
+class CompactResource(RequestIdMixin):
+    """Memory compact resource for rows of large listings
+
+    Values of the fields listed in ``fields`` are kept in a tuple ordered by
+    the layout shared by all instances of the class, other keys fall back to
+    a small dict. Instances have no ``__dict__`` and do not keep the source
+    dict, ``original`` rebuilds it. String values of ``interned_fields``
+    (e.g. status) are interned, so all rows share one copy.
+
+    Compact resources are always attached, there is no lazy-loading.
+
+    :param manager: ResourceManager object
+    :param instance: dictionary representing resource _antiddos
+    :param attached: ignored, kept to be compatible with Resource
+    :param resp: Response or list of Response objects
+    """
+
+    __slots__ = ('manager', 'request_id', '_values', '_extra')
+
+    # field layout of the values tuple, override in sub classes
+    fields = ()
+    # fields with few distinct string values
+    interned_fields = ()
+    # fields only returned by the detail API, see merge
+    detail_fields = ()
+
+    def __init__(self, manager, instance, attached=True, resp=None):
+        layout = self._get_layout()
+        get = instance.get
+        values = [get(field, _MISSING) for field in self.fields]
+        for i in layout[1]:
+            if type(values[i]) is str:
+                values[i] = six.moves.intern(values[i])
+
+        _setattr = object.__setattr__
+        _setattr(self, 'manager', manager)
+        _setattr(self, '_values', tuple(values))
+        extra = None
+        if len(instance) > len(values) - values.count(_MISSING):
+            field_index = layout[0]
+            extra = dict((k, v) for k, v in six.iteritems(instance)
+                         if k not in field_index)
+        _setattr(self, '_extra', extra)
+        self.mixin_request_id(resp)
+
+    @classmethod
+    def _get_layout(cls):
+        """get (field index dict, interned field indexes) of the class
+
+        field descriptors are installed into the class the first time
+        """
+        layout = cls.__dict__.get('_layout')
+        if layout is None:
+            field_index = {}
+            for i, field in enumerate(cls.fields):
+                field_index[field] = i
+                # properties defined by the class take precedence
+                if not hasattr(cls, field):
+                    setattr(cls, field, _Field(field, i))
+            interned = tuple(field_index[field]
+                             for field in cls.interned_fields)
+            layout = cls._layout = (field_index, interned)
+        return layout
+
+    def __getattr__(self, k):
+        # only called when k is not a field, slot, class attribute or
+        # property
+        if k not in ('_values', '_extra'):
+            extra = self._extra
+            if extra and k in extra:
+                value = extra[k]
+                if value is not _MISSING:
+                    return value
+        raise AttributeError(k)
+
+    def __setattr__(self, k, v):
+        try:
+            object.__setattr__(self, k, v)
+        except AttributeError:
+            # not a field or slot
+            if self._extra is None:
+                object.__setattr__(self, '_extra', {})
+            self._extra[k] = v
+
+    def _items(self):
+        for field, value in zip(self.fields, self._values):
+            if value is not _MISSING:
+                yield field, value
+        if self._extra:
+            for item in six.iteritems(self._extra):
+                if item[1] is not _MISSING:
+                    yield item
+
+    @property
+    def original(self):
+        return dict(self._items())
+
+    def merge(self, info):
+        """merge detail info into the resource in place
+
+        detail fields not in info are remembered as missing, so the
+        resource is attached and they are never fetched again.
+
+        :param info: dict of the detail fields
+        """
+        for (k, v) in six.iteritems(info or {}):
+            setattr(self, k, v)
+        for field in self.detail_fields:
+            if not info or field not in info:
+                setattr(self, field, _MISSING)
+        return self
+
+    def has_attached(self):
+        """whether detail fields were merged (or found missing)"""
+        if not self.detail_fields:
+            return True
+        extra = self._extra
+        return bool(extra) and self.detail_fields[0] in extra
+
+    def set_attached(self, val):
+        pass
+
+    def __repr__(self):
+        attr_list = ", ".join("%s=%s" % (k, v)
+                              for k, v in sorted(self._items())
+                              if k[0] != '_')
+        return "<%s %s>" % (self.__class__.__name__, attr_list)
+
+    def __eq__(self, other):
+        if not isinstance(other, self.__class__):
+            return False
+        return self.original == other.original
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __getstate__(self):
+        return self.original, self.request_id
+
+    def __setstate__(self, state):
+        instance, request_id = state
+        self.__init__(None, instance, resp=request_id)
+
+
 class ListWithMeta(list, RequestIdMixin):
     def __init__(self, values, resp):
         super(ListWithMeta, self).__init__(values)
         self.mixin_request_id(resp)
 
 
+class LazyListWithMeta(ListWithMeta):
+    """ListWithMeta keeps decoded rows and builds resources on access
+
+    Rows are stored as the decoded dicts, a row is converted by ``factory``
+    the first time it is accessed and the resource replaces the row in
+    place. ``len``, slicing, :meth:`rows` and :meth:`filter_by` never build
+    resources, so counting or filtering a big listing only costs dict
+    lookups.
+
+    :param rows: decoded row dicts
+    :param resp: Response or request id
+    :param factory: function converts a row dict to a resource
+    """
+
+    def __init__(self, rows, resp, factory):
+        super(LazyListWithMeta, self).__init__(rows, resp)
+        self._factory = factory
+
+    def _materialize(self, index):
+        item = list.__getitem__(self, index)
+        if type(item) is dict:
+            item = self._factory(item)
+            list.__setitem__(self, index, item)
+        return item
+
+    def _lazy_copy(self, rows):
+        return LazyListWithMeta(rows, self.request_id, self._factory)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._lazy_copy(list.__getitem__(self, index))
+        return self._materialize(index)
+
+    def __iter__(self):
+        for index in six.moves.range(len(self)):
+            yield self._materialize(index)
+
+    def __reversed__(self):
+        for index in six.moves.range(len(self) - 1, -1, -1):
+            yield self._materialize(index)
+
+    def __contains__(self, item):
+        return any(element == item for element in self)
+
+    def __eq__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return len(self) == len(other) and all(
+            a == b for a, b in zip(self, other)
+        )
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __add__(self, other):
+        return list(self) + list(other)
+
+    # list concatenation and repetition copy the stored rows in C, convert
+    # them to resources first
+    def __radd__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        return list(other) + list(self)
+
+    def __mul__(self, n):
+        return list(self) * n
+
+    __rmul__ = __mul__
+
+    def __imul__(self, n):
+        for _ in self:
+            pass
+        return list.__imul__(self, n)
+
+    def __reduce__(self):
+        # factory may not be picklable, pickle resources instead
+        return ListWithMeta, (list(self), self.request_id)
+
+    def copy(self):
+        return self._lazy_copy(list.__getitem__(self, slice(None)))
+
+    def pop(self, index=-1):
+        item = self._materialize(index)
+        list.pop(self, index)
+        return item
+
+    def index(self, item, start=0, stop=None):
+        for i in six.moves.range(*slice(start, stop).indices(len(self))):
+            if self._materialize(i) == item:
+                return i
+        raise ValueError('%r is not in list' % (item,))
+
+    def count(self, item):
+        return sum(1 for element in self if element == item)
+
+    def remove(self, item):
+        del self[self.index(item)]
+
+    def sort(self, key=None, reverse=False):
+        items = list(self)
+        items.sort(key=key, reverse=reverse)
+        self[:] = items
+
+    def rows(self):
+        """iterate row dicts, without building resources"""
+        for item in list.__iter__(self):
+            yield item if type(item) is dict else item.original
+
+    def filter_by(self, **fields):
+        """get rows whose fields equal to the values, without building
+        resources, e.g. ``results.filter_by(status='packetcleaning')``
+
+        :rtype: LazyListWithMeta
+        """
+        criteria = tuple(six.iteritems(fields))
+        matched = []
+        for item in list.__iter__(self):
+            row = item if type(item) is dict else item.original
+            for k, v in criteria:
+                if row.get(k) != v:
+                    break
+            else:
+                matched.append(item)
+        return self._lazy_copy(matched)
+
+
+class StreamWithMeta(RequestIdMixin):
+    """Iterator of resources decoded from a streamed response
+
+    Rows are decoded from the response body while iterating, the response
+    is closed when iteration finished, failed or :meth:`close` is called.
+    Other members of the response body (e.g. ``total``) are put into
+    :attr:`meta` as soon as they are read, the ones after the listing are
+    only available after iteration finished.
+
+    :param rows: JsonArrayStream of the response body
+    :param resp: the streamed Response
+    :param factory: function converts a row dict to a resource
+    """
+
+    def __init__(self, rows, resp, factory):
+        self.mixin_request_id(resp)
+        self.meta = rows.meta
+        self._response = resp
+        self._factory = factory
+        self._iterator = self._iterate(rows)
+
+    def _iterate(self, rows):
+        try:
+            for row in rows:
+                if row:
+                    yield self._factory(row)
+        finally:
+            self.close()
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return next(self._iterator)
+
+    next = __next__
+
+    def close(self):
+        """release the connection of the response"""
+        if self._response is not None:
+            self._response.close()
+            self._response = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self._iterator.close()
+        self.close()
+
+
 class DictWithMeta(dict, RequestIdMixin):
     def __init__(self, values, resp):
         super(DictWithMeta, self).__init__(values)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import email.utils
+import random
+import threading
+import time
+
+from keystoneauth1 import exceptions
+
+# clock never goes backward, fallback to wall clock on python 2
+_clock = getattr(time, 'monotonic', time.time)
+
+# HTTP status codes indicate the request could succeed later
+RETRYABLE_STATUS_CODES = frozenset([429, 500, 502, 503, 504])
+# HTTP methods which are safe to send twice
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+# default max seconds all retries of one request wait in total
+DEFAULT_MAX_TOTAL_DELAY = 120
+
+
+def parse_retry_after(value):
+    """parse Retry-After header value
+
+    :param value: delay seconds or an HTTP date
+    :return: seconds to wait, None if value is invalid
+    """
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    parsed = email.utils.parsedate_tz(str(value))
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+class RetryPolicy(object):
+    """Retry rule of failed HTTP requests
+
+    Requests failed with a retryable status code or a connection error are
+    retried with exponential backoff and jitter. Delay asked by Retry-After
+    header takes precedence over the backoff delay. Only idempotent methods
+    are retried unless ``retry_post`` is set, a single request could opt in
+    with ``retry=True`` request argument.
+
+    :param max_retries: max retries of one request, 0 to disable retry
+    :param initial_delay: seconds to wait before first retry
+    :param max_delay: max seconds to wait before a retry, Retry-After is
+        capped by it too
+    :param backoff: multiplier of delay for every retry
+    :param jitter: randomize delay by +/- ratio of it
+    :param retry_post: retry non-idempotent methods too
+    :param max_total_delay: max seconds all retries of one request wait in
+        total, the last error is raised instead of waiting longer, e.g.
+        when Retry-After of a throttling server keeps asking for more.
+        None for no limit
+    """
+
+    def __init__(self, max_retries=3, initial_delay=0.5, max_delay=60,
+                 backoff=2, jitter=0.2, retry_post=False,
+                 status_codes=RETRYABLE_STATUS_CODES,
+                 max_total_delay=DEFAULT_MAX_TOTAL_DELAY):
+        self.max_retries = max_retries
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.backoff = backoff
+        self.jitter = jitter
+        self.retry_post = retry_post
+        self.status_codes = status_codes
+        self.max_total_delay = max_total_delay
+
+    def is_retryable_method(self, method, retry=None):
+        if retry is not None:
+            return retry
+        return self.retry_post or (method or '').upper() in IDEMPOTENT_METHODS
+
+    def is_retryable_error(self, error):
+        if isinstance(error, exceptions.HttpError):
+            return error.http_status in self.status_codes
+        return isinstance(error, exceptions.ConnectionError)
+
+    def allows_delay(self, waited, delay):
+        """whether a retry could wait delay seconds more
+
+        :param waited: seconds previous retries of the request waited
+        """
+        return (self.max_total_delay is None or
+                waited + delay <= self.max_total_delay)
+
+    def get_delay(self, attempt, error=None):
+        """get seconds to wait before the retry
+
+        :param attempt: number of the retry, starts from 1
+        :param error: the error caused the retry
+        """
+        response = getattr(error, 'response', None)
+        if response is not None:
+            retry_after = parse_retry_after(
+                response.headers.get('retry-after')
+            )
+            if retry_after is not None:
+                return min(retry_after, self.max_delay)
+
+        delay = min(self.initial_delay * self.backoff ** (attempt - 1),
+                    self.max_delay)
+        if self.jitter:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        return max(0.0, delay)
+
+
+class RateLimiter(object):
+    """Thread safe token bucket limits request rate
+
+    Bucket is refilled at ``rate`` tokens per second and holds at most
+    ``burst`` tokens, every request takes one token and waits when bucket
+    is empty.
+
+    :param rate: requests allowed per second
+    :param burst: max requests could be sent at once, default to rate
+    """
+
+    def __init__(self, rate, burst=None):
+        if rate <= 0:
+            raise ValueError('rate must be positive')
+        self.rate = float(rate)
+        self.burst = float(burst or max(1, rate))
+        self._tokens = self.burst
+        self._updated_at = _clock()
+        # no token is granted before this time
+        self._paused_until = 0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        elapsed = max(0, now - self._updated_at)
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated_at = now
+
+    def _reserve(self):
+        """take a token, return seconds to wait before using it"""
+        with self._lock:
+            now = _clock()
+            self._refill(now)
+            self._tokens -= 1
+            wait = 0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        """wait until a request is allowed
+
+        :return: seconds waited
+        """
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def pause(self, seconds):
+        """stop granting tokens for seconds, e.g. when server asks client
+        to slow down with Retry-After
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, _clock() + seconds)
@@ -14,6 +14,8 @@
 #
 from datetime import datetime
 
+import six
+
 
 def get_id(obj):
     """Get obj's uuid or object itself if no uuid
@@ -33,7 +35,7 @@ def remove_empty_from_dict(original):
     :param dict original: original dict, should not be None
     :return: a new dict which removes keys with empty values
     """
-    return dict((k, v) for k, v in original.iteritems()
+    return dict((k, v) for k, v in six.iteritems(original)
                 if v is not None and v != '' and v != [] and v != {})
 
 
@@ -51,3 +53,18 @@ def format_time(time_in_long, _format='%Y-%m-%d %H:%M:%S'):
         return timestamp.strftime(_format)
     else:
         return ''
+
+
+# osc_lib.utils pulls in openstacksdk, it is imported on first use so that
+# importing resources and commands stays cheap
+
+def format_dict(data):
+    """same as osc_lib.utils.format_dict"""
+    from osc_lib import utils
+    return utils.format_dict(data)
+
+
+def format_list_of_dicts(data):
+    """same as osc_lib.utils.format_list_of_dicts"""
+    from osc_lib import utils
+    return utils.format_list_of_dicts(data)
@@ -13,8 +13,6 @@
 
 import logging
 
-from osc_lib import utils
-
 from antiddosclient.common.parser import BaseParser
 
 LOGGER = logging.getLogger(__name__)
@@ -33,6 +31,12 @@ API_VERSIONS = {
 
 def make_client(instance):
     """Returns an orchestration service client"""
+    # imported only when a command needs the client, plugin is loaded on
+    # every start up, even for --help
+    from osc_lib import utils
+
+    from antiddosclient.common import cache
+    from antiddosclient.common import retry
 
     api_version = instance._api_version[API_NAME]
     antiddos_client = utils.get_client_class(
@@ -43,9 +47,28 @@ def make_client(instance):
         # 'region_name': instance.region_name,
         # 'interface': instance.interface
     }
-    endpoint = instance._cli_options.config.get(
-        'antiddos_endpoint_override', None
-    )
+    config = instance._cli_options.config
+    endpoint = config.get('antiddos_endpoint_override', None)
+    cache_dir = config.get('antiddos_cache_dir', None)
+    if cache_dir:
+        kwargs['cache'] = cache.ResponseCache(cache_dir)
+    for option in ('pool_size', 'pool_size_per_host'):
+        value = config.get('antiddos_' + option, None)
+        if value:
+            kwargs[option] = int(value)
+    if config.get('antiddos_pool_block', False):
+        kwargs['pool_block'] = True
+    if config.get('antiddos_no_keep_alive', False):
+        kwargs['keep_alive'] = False
+    max_retries = config.get('antiddos_max_retries', None)
+    if max_retries:
+        kwargs['retry_policy'] = retry.RetryPolicy(
+            max_retries=int(max_retries),
+            retry_post=bool(config.get('antiddos_retry_post', False))
+        )
+    rate_limit = config.get('antiddos_rate_limit', None)
+    if rate_limit:
+        kwargs['rate_limiter'] = retry.RateLimiter(float(rate_limit))
 
     LOGGER.debug('Instantiating antiddos client: %s', antiddos_client)
     LOGGER.debug('Instantiating antiddos client with kwargs: %s', kwargs)
@@ -57,4 +80,7 @@ def make_client(instance):
 def build_option_parser(parser):
     """Hook to add global options"""
     BaseParser.register_service_option(parser, API_NAME)
+    BaseParser.register_cache_option(parser, API_NAME)
+    BaseParser.register_pool_options(parser, API_NAME)
+    BaseParser.register_retry_options(parser, API_NAME)
     return parser
@@ -12,21 +12,36 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
+import abc
 import argparse
+import io
 import logging
 
-from keystoneauth1 import exceptions
 from osc_lib.command import command
+import six
 
+from antiddosclient.common import display
 from antiddosclient.common import parser as p
 from antiddosclient.common import resource as br
 from antiddosclient.common import parsetypes
+from antiddosclient.common import utils
 from antiddosclient.common.i18n import _
 from antiddosclient.osc.v1 import parser_builder as pb
+from antiddosclient.v1 import export
+from antiddosclient.v1 import fleet_report
+from antiddosclient.v1 import log_sync
 from antiddosclient.v1 import resource
 
 LOG = logging.getLogger(__name__)
 
+# default of --concurrency options, the same as
+# antiddos_mgr.DEFAULT_BULK_CONCURRENCY, the manager is not imported until
+# a command runs
+DEFAULT_CONCURRENCY = 10
+
+# output formats which write rows as they come
+STREAMED_FORMATTERS = ('value', 'csv')
+
 
 class QueryAntiDDosConfig(command.ShowOne):
     _description = _("Query AntiDDos configurations")
@@ -43,59 +58,227 @@ class QueryAntiDDosConfig(command.ShowOne):
         return columns, data.get_display_data(columns, formatter=formatter)
 
 
-class OpenAntiDDos(command.Command):
+@six.add_metaclass(abc.ABCMeta)
+class BulkCommand(command.Lister):
+    """Command of one floating IP or every floating IP of --from-file
+
+    One floating IP keeps the plain message output. Floating IPs of a file
+    are requested concurrently with a progress counter on a terminal, then
+    listed in a summary table formatted by the output formatter options,
+    exit code is 1 if any of them failed.
+    """
+
+    summary_column_names = (
+        'Floating IP',
+        'Floating IP id',
+        'Task id',
+        'Result',
+    )
+
+    # columns accepted in --from-file, None for all bulk_targets.COLUMNS
+    file_columns = None
+
+    def get_parser(self, prog_name):
+        parser = super(BulkCommand, self).get_parser(prog_name)
+        pb.AntiDDosParser.add_floating_ip_or_file_arg(parser)
+        parser.add_argument(
+            "--concurrency",
+            metavar="<concurrency>",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=_("max requests run at the same time with --from-file "
+                   "(default 10)")
+        )
+        return parser
+
+    def check_settings(self, args, settings):
+        """raise ArgumentTypeError if settings of a floating IP are invalid
+
+        :param settings: BulkTarget, or the command options without
+            --from-file
+        """
+
+    @abc.abstractmethod
+    def get_action(self, manager):
+        """manager method requested for every floating IP"""
+
+    def get_arguments(self, settings):
+        """arguments of the action after floating ip id"""
+        return ()
+
+    @abc.abstractmethod
+    def take_single_action(self, args):
+        """request the floating IP of the command, return the message"""
+
+    def run(self, parsed_args):
+        if parsed_args.from_file:
+            super(BulkCommand, self).run(parsed_args)
+            return 1 if self.failed else 0
+        # one floating IP is not listed, the message is the output
+        self.log.debug('run(%s)', parsed_args)
+        return self.take_action(parsed_args) or 0
+
+    def take_action(self, args):
+        if args.from_file:
+            if args.floating_ip:
+                raise argparse.ArgumentTypeError(
+                    'argument <floating ip> could not be used with '
+                    '--from-file'
+                )
+            return self._take_bulk_action(args)
+        if not args.floating_ip:
+            raise argparse.ArgumentTypeError(
+                'argument <floating ip> is required without --from-file'
+            )
+        if args.formatter != self.formatter_default or args.columns:
+            raise argparse.ArgumentTypeError(
+                'output formatter options only apply to --from-file'
+            )
+        return self.take_single_action(args)
+
+    def _read_targets(self, args):
+        from antiddosclient.v1 import bulk_targets
+        defaults = (
+            getattr(args, 'maximum_service_traffic', None),
+            getattr(args, 'http_request_rate', None),
+            getattr(args, 'enable_l7', True),
+            self.file_columns or bulk_targets.COLUMNS,
+        )
+        try:
+            if args.from_file == '-':
+                return bulk_targets.read_targets(self.app.stdin, *defaults)
+            with open(args.from_file) as f:
+                return bulk_targets.read_targets(f, *defaults)
+        except (IOError, OSError) as e:
+            raise argparse.ArgumentTypeError(
+                'could not read --from-file %s: %s' % (args.from_file, e)
+            )
+        except ValueError as e:
+            raise argparse.ArgumentTypeError(
+                '--from-file %s %s' % (args.from_file, e)
+            )
+
+    def _take_bulk_action(self, args):
+        targets = self._read_targets(args)
+        if not targets:
+            raise argparse.ArgumentTypeError(
+                'no floating ip in --from-file %s' % args.from_file
+            )
+        # check every row before any request is sent
+        for target in targets:
+            try:
+                self.check_settings(args, target)
+            except argparse.ArgumentTypeError as e:
+                raise argparse.ArgumentTypeError(
+                    '--from-file %s line %d: %s'
+                    % (args.from_file, target.line, e)
+                )
+
+        manager = self.app.client_manager.antiddos.antiddos
+        results = manager.bulk_apply(
+            [(t.floating_ip, self.get_arguments(t)) for t in targets],
+            self.get_action(manager),
+            concurrency=max(1, args.concurrency),
+            callback=self._progress(len(targets))
+        )
+
+        self.failed = len([r for r in results.values() if not r.succeeded])
+        if self.failed:
+            LOG.warning('%d of %d floating ips failed', self.failed,
+                        len(results))
+        rows = []
+        for floating_ip, result in results.items():
+            if result.error is not None:
+                outcome = 'Failed: %s' % result.error
+            elif result.already_configured:
+                outcome = 'Already configured'
+            else:
+                outcome = 'Request Received'
+            rows.append((floating_ip, result.floating_ip_id or '',
+                         result.task_id or '', outcome))
+        return self.summary_column_names, rows
+
+    def _progress(self, total):
+        """callback of bulk_apply writes a done counter to a terminal"""
+        stderr = self.app.stderr
+        if not getattr(stderr, 'isatty', lambda: False)():
+            return None
+        counts = {'done': 0, 'failed': 0}
+
+        def _update(floating_ip, result):
+            counts['done'] += 1
+            if not result.succeeded:
+                counts['failed'] += 1
+            stderr.write('\r%d/%d done, %d failed'
+                         % (counts['done'], total, counts['failed']))
+            if counts['done'] == total:
+                stderr.write('\n')
+            stderr.flush()
+        return _update
+
+
+class OpenAntiDDos(BulkCommand):
     _description = _("Open AntiDDos for floating IP")
 
     def get_parser(self, prog_name):
         parser = super(OpenAntiDDos, self).get_parser(prog_name)
-        pb.AntiDDosParser.add_floating_ip_arg(parser)
         pb.AntiDDosParser.add_enable_l7_arg(parser)
-        pb.AntiDDosParser.add_maximum_service_traffic_arg(parser)
+        pb.AntiDDosParser.add_maximum_service_traffic_arg(parser,
+                                                          required=False)
         pb.AntiDDosParser.add_http_request_rate_arg(parser)
         # pb.AntiDDosParser.add_cleaning_access_pos_arg(parser)
         # pb.AntiDDosParser.add_app_type_arg(parser)
         return parser
 
-    def take_action(self, args):
-        client = self.app.client_manager.antiddos
+    def check_settings(self, args, settings):
+        if not settings.maximum_service_traffic:
+            raise argparse.ArgumentTypeError(
+                'argument --maximum-service-traffic is required'
+            )
 
-        if args.enable_l7 and not args.http_request_rate:
+        if settings.enable_l7 and not settings.http_request_rate:
             raise argparse.ArgumentTypeError(
                 'argument --http-request-rate is required '
                 'when CC defence protection is enabled'
             )
 
-        if not args.enable_l7 and args.http_request_rate:
+        if not settings.enable_l7 and settings.http_request_rate:
             raise argparse.ArgumentTypeError(
                 'argument --http-request-rate only effect '
                 'when CC defence protection is enabled'
             )
 
-        floating_ip = client.antiddos.find(args.floating_ip)
+    def get_action(self, manager):
+        return manager.open_antiddos
+
+    def get_arguments(self, settings):
         # issue 8, cleaning-pos fixed to 8, app-type fixed to 1
         traffic_pos = pb.AntiDDosParser.get_traffic_pos_id(
-            args.maximum_service_traffic)
+            settings.maximum_service_traffic)
         http_request_pos = pb.AntiDDosParser.get_http_request_pos_id(
-            args.http_request_rate)
+            settings.http_request_rate)
+        return settings.enable_l7, traffic_pos, http_request_pos, 8, 1
+
+    def take_single_action(self, args):
+        client = self.app.client_manager.antiddos
+        self.check_settings(args, args)
+        floating_ip = client.antiddos.find(args.floating_ip)
         task = client.antiddos.open_antiddos(floating_ip.floating_ip_id,
-                                             args.enable_l7,
-                                             traffic_pos,
-                                             http_request_pos,
-                                             8,
-                                             1)
+                                             *self.get_arguments(args))
 
         return 'Request Received, task id: ' + task['task_id']
 
 
-class CloseAntiDDos(command.Command):
+class CloseAntiDDos(BulkCommand):
     _description = _("Close AntiDDos of floating IP")
 
-    def get_parser(self, prog_name):
-        parser = super(CloseAntiDDos, self).get_parser(prog_name)
-        pb.AntiDDosParser.add_floating_ip_arg(parser)
-        return parser
+    # protection settings of a file have no effect on close
+    file_columns = ('floating_ip',)
 
-    def take_action(self, args):
+    def get_action(self, manager):
+        return manager.close_antiddos
+
+    def take_single_action(self, args):
         client = self.app.client_manager.antiddos
         floating_ip = client.antiddos.find(args.floating_ip)
         task = client.antiddos.close_antiddos(floating_ip.floating_ip_id)
@@ -118,6 +301,7 @@ class ShowAntiDDos(command.ShowOne):
             _antiddos = client.antiddos.get_antiddos(_antiddos.floating_ip_id)
 
         if 'status' in _antiddos.original and _antiddos.status == 'notConfig':
+            from keystoneauth1 import exceptions
             raise exceptions.ClientException(
                 'You have not config antiddos for this floating ip yet.'
             )
@@ -129,42 +313,33 @@ class ShowAntiDDos(command.ShowOne):
             return columns, _antiddos.get_display_data(columns)
 
 
-class SetAntiDDos(command.Command):
+class SetAntiDDos(OpenAntiDDos):
     _description = _("Update AntiDDos settings of floating IP")
 
-    def get_parser(self, prog_name):
-        parser = super(SetAntiDDos, self).get_parser(prog_name)
-        pb.AntiDDosParser.add_floating_ip_arg(parser)
-        pb.AntiDDosParser.add_enable_l7_arg(parser)
-        pb.AntiDDosParser.add_maximum_service_traffic_arg(parser)
-        pb.AntiDDosParser.add_http_request_rate_arg(parser)
-        # pb.AntiDDosParser.add_cleaning_access_pos_arg(parser)
-        # pb.AntiDDosParser.add_app_type_arg(parser)
-        return parser
+    def check_settings(self, args, settings):
+        if not settings.maximum_service_traffic:
+            raise argparse.ArgumentTypeError(
+                'argument --maximum-service-traffic is required'
+            )
 
-    def take_action(self, args):
-        client = self.app.client_manager.antiddos
-        if not args.enable_l7 and args.http_request_rate:
+        if not settings.enable_l7 and settings.http_request_rate:
             raise argparse.ArgumentTypeError(
                 'argument --http-request-rate only effect '
                 'when CC defence protection is enabled'
             )
 
-        floating_ip = client.antiddos.find(args.floating_ip)
+    def get_action(self, manager):
+        return manager.update_antiddos
 
-        # issue 8, cleaning-pos fixed to 8, app-type fixed to 1
-        traffic_pos = pb.AntiDDosParser.get_traffic_pos_id(
-            args.maximum_service_traffic)
-        http_request_pos = pb.AntiDDosParser.get_http_request_pos_id(
-            args.http_request_rate)
+    def take_single_action(self, args):
+        client = self.app.client_manager.antiddos
+        self.check_settings(args, args)
+        floating_ip = client.antiddos.find(args.floating_ip)
         task = client.antiddos.update_antiddos(floating_ip.floating_ip_id,
-                                               args.enable_l7,
-                                               traffic_pos,
-                                               http_request_pos,
-                                               8,
-                                               1)
+                                               *self.get_arguments(args))
 
         if isinstance(task, br.StrWithMeta):
+            from keystoneauth1 import exceptions
             raise exceptions.ClientException(
                 'this floating ip already has the same configuration'
             )
@@ -206,16 +381,54 @@ class ListAntiDDosStatus(command.Lister):
         )
         p.BaseParser.add_limit_option(parser)
         p.BaseParser.add_offset_option(parser)
+        p.BaseParser.add_all_pages_option(parser)
+        p.BaseParser.add_stream_option(parser)
         return parser
 
     def take_action(self, args):
         client = self.app.client_manager.antiddos
-        data = client.antiddos.list(status=args.status,
-                                    ip=args.ip,
-                                    limit=args.limit,
-                                    offset=args.offset)
+        if args.stream:
+            if args.limit:
+                raise argparse.ArgumentTypeError(
+                    'argument --limit could not be used with --stream'
+                )
+            if args.formatter not in STREAMED_FORMATTERS:
+                LOG.warning('Rows are written after all pages arrived with '
+                            'format %s, use -f value or -f csv to write '
+                            'them page by page', args.formatter)
+            pages = client.antiddos.iter_list_pages(
+                status=args.status,
+                ip=args.ip,
+                page_size=args.page_size,
+                window=max(0, args.prefetch),
+                offset=args.offset
+            )
+            columns = resource.AntiDDos.list_column_names
+            return columns, self._stream_rows(pages, columns)
+        if args.all_pages:
+            if args.limit:
+                raise argparse.ArgumentTypeError(
+                    'argument --limit could not be used with --all'
+                )
+            data = client.antiddos.iter_list(status=args.status,
+                                             ip=args.ip,
+                                             page_size=args.page_size,
+                                             offset=args.offset)
+        else:
+            data = client.antiddos.list(status=args.status,
+                                        ip=args.ip,
+                                        limit=args.limit,
+                                        offset=args.offset)
         columns = resource.AntiDDos.list_column_names
-        return columns, (r.get_display_data(columns) for r in data)
+        return columns, display.iter_display_data(data, columns)
+
+    def _stream_rows(self, pages, columns):
+        for page in pages:
+            for row in display.iter_display_data(page, columns):
+                yield row
+            # rows of the page are written by now, show them before
+            # waiting for the next page, stdout is buffered in pipes
+            self.app.stdout.flush()
 
 
 class ShowAntiDDosStatus(command.ShowOne):
@@ -234,20 +447,217 @@ class ShowAntiDDosStatus(command.ShowOne):
         return columns, status.get_display_data(columns)
 
 
+class WatchAntiDDosStatus(command.Command):
+    _description = _("Watch AntiDDos status and print status changes")
+
+    def get_parser(self, prog_name):
+        parser = super(WatchAntiDDosStatus, self).get_parser(prog_name)
+        parser.add_argument(
+            'floating_ips',
+            metavar='<floating ip>',
+            nargs='*',
+            help=_("For floating ip (UUID or IP), could be repeated, "
+                   "all floating ips are watched if not specified")
+        )
+        parser.add_argument(
+            "--status",
+            choices=resource.AntiDDos.status_list,
+            help=_("watch AntiDDos with status, floating ips leaving the "
+                   "status are reported as gone")
+        )
+        parser.add_argument(
+            "--ip",
+            help=_("watch AntiDDos with the ip (eg: 110.110.)")
+        )
+        parser.add_argument(
+            "--interval",
+            metavar="<seconds>",
+            type=float,
+            default=10,
+            help=_("seconds between polls (default 10)")
+        )
+        parser.add_argument(
+            "--count",
+            metavar="<polls>",
+            type=int,
+            help=_("stop after the number of polls, the first poll is the "
+                   "baseline (default poll until interrupted)")
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<concurrency>",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=_("max status queries run at the same time when floating "
+                   "ips are specified (default 10)")
+        )
+        return parser
+
+    def take_action(self, args):
+        if args.interval <= 0:
+            raise argparse.ArgumentTypeError(
+                'argument --interval should be positive'
+            )
+        if args.count is not None and args.count < 1:
+            raise argparse.ArgumentTypeError(
+                'argument --count should be positive'
+            )
+        if args.floating_ips and (args.status or args.ip):
+            raise argparse.ArgumentTypeError(
+                'argument <floating ip> could not be used with --status '
+                'or --ip'
+            )
+
+        from antiddosclient.v1 import status_watch
+        manager = self.app.client_manager.antiddos.antiddos
+        floating_ips = None
+        if args.floating_ips:
+            # resolve once, every poll only queries status
+            floating_ips = [manager.find(floating_ip)
+                            for floating_ip in args.floating_ips]
+
+        def _snapshot():
+            return manager.get_status_snapshot(
+                floating_ips=floating_ips, status=args.status, ip=args.ip,
+                concurrency=max(1, args.concurrency)
+            )
+
+        def _on_error(e):
+            LOG.warning('Failed to poll AntiDDos status, retry in %s '
+                        'seconds: %s', args.interval, e)
+
+        watcher = status_watch.StatusWatcher(_snapshot)
+        polls = watcher.watch(args.interval, polls=args.count,
+                              on_error=_on_error)
+        baseline = True
+        try:
+            for polled_at, transitions in polls:
+                if baseline:
+                    baseline = False
+                    # stdout only carries transitions
+                    self.app.stderr.write(
+                        _('Watching %(eips)d floating ips every %(interval)s '
+                          'seconds\n') % {'eips': len(watcher.snapshot),
+                                          'interval': args.interval}
+                    )
+                self._write_transitions(polled_at, transitions)
+        except KeyboardInterrupt:
+            pass
+
+    def _write_transitions(self, polled_at, transitions):
+        polled_at = utils.format_time(polled_at)
+        for transition in transitions:
+            self.app.stdout.write(
+                '%s %s %s %s -> %s\n' % (
+                    polled_at,
+                    transition.floating_ip_id,
+                    transition.floating_ip_address,
+                    transition.old_status or '(new)',
+                    transition.new_status or '(gone)',
+                )
+            )
+        # transitions are shown as soon as they are seen in pipes too
+        self.app.stdout.flush()
+
+
 class ListAntiDDosDailyReport(command.Lister):
     _description = _("List AntiDDos report(every 5min) of past 24h")
 
     def get_parser(self, prog_name):
         parser = super(ListAntiDDosDailyReport, self).get_parser(prog_name)
-        pb.AntiDDosParser.add_floating_ip_arg(parser)
+        parser.add_argument(
+            'floating_ip',
+            metavar='<floating ip>',
+            nargs='?',
+            help=_("For floating ip (UUID or IP), omit it with --all")
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="all_eips",
+            default=False,
+            help=_("summarize reports of all floating ips, list the most "
+                   "attacked ones")
+        )
+        parser.add_argument(
+            "--status",
+            choices=resource.AntiDDos.status_list,
+            help=_("only summarize floating ips with status when --all "
+                   "is used")
+        )
+        parser.add_argument(
+            "--top",
+            metavar="<top>",
+            type=int,
+            default=fleet_report.DEFAULT_TOP,
+            help=_("number of the most attacked floating ips listed when "
+                   "--all is used (default 10)")
+        )
+        parser.add_argument(
+            "--sort-by",
+            choices=['bps', 'pps'],
+            default='bps',
+            help=_("rank floating ips by peak attack bps or pps when --all "
+                   "is used (default bps)")
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<concurrency>",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=_("max report requests run at the same time when --all "
+                   "is used (default 10)")
+        )
         return parser
 
     def take_action(self, args):
         manager = self.app.client_manager.antiddos.antiddos
+        if args.all_eips:
+            if args.floating_ip:
+                raise argparse.ArgumentTypeError(
+                    'argument <floating ip> could not be used with --all'
+                )
+            return self._summarize_all(manager, args)
+        if not args.floating_ip:
+            raise argparse.ArgumentTypeError(
+                'argument <floating ip> is required without --all'
+            )
+
         floating_ip = manager.find(args.floating_ip)
         reports = manager.get_antiddos_daily_report(floating_ip.floating_ip_id)
         columns = resource.AntiDDosDailyReport.list_column_names
-        return columns, (r.get_display_data(columns) for r in reports)
+        return columns, display.iter_display_data(reports, columns)
+
+    def _summarize_all(self, manager, args):
+        report = manager.get_fleet_daily_report(status=args.status,
+                                                top=args.top,
+                                                concurrency=args.concurrency)
+        # fleet totals go to stderr, keep stdout parsable with -f
+        self.app.stderr.write(
+            _('%(attacked)d of %(eips)d floating ips were attacked for '
+              '%(minutes)d minutes in total\n') % {
+                'attacked': report.attacked_eips,
+                'eips': report.eips,
+                'minutes': report.attack_minutes,
+            }
+        )
+        for status, stats in sorted(report.by_status.items()):
+            self.app.stderr.write(
+                _('  %(status)s: %(attacked)d of %(eips)d attacked, '
+                  '%(minutes)d minutes\n') % {
+                    'status': status,
+                    'attacked': stats['attacked_eips'],
+                    'eips': stats['eips'],
+                    'minutes': stats['attack_minutes'],
+                }
+            )
+        if report.failed:
+            LOG.warning('Could not get daily report of %d floating ips: %s',
+                        len(report.failed), ', '.join(report.failed))
+
+        top = report.top_pps if args.sort_by == 'pps' else report.top_bps
+        columns = resource.EIPDailySummary.list_column_names
+        return columns, display.iter_display_data(top, columns)
 
 
 class ListAntiDDosLogs(command.Lister):
@@ -259,19 +669,196 @@ class ListAntiDDosLogs(command.Lister):
         p.BaseParser.add_limit_option(parser)
         p.BaseParser.add_offset_option(parser)
         p.BaseParser.add_sortdir_option(parser)
+        p.BaseParser.add_all_pages_option(parser)
+        parser.add_argument(
+            "--sync-state",
+            metavar="<state-file>",
+            help=_("only list logs which are new since last run with the "
+                   "same state file, high-water mark of the floating ip "
+                   "is kept in the file")
+        )
         return parser
 
     def take_action(self, args):
         # TODO(Woo) no data in test env, need to test later
         manager = self.app.client_manager.antiddos.antiddos
         floating_ip = manager.find(args.floating_ip)
-        logs = manager.get_antiddos_daily_logs(
-            floating_ip.floating_ip_id, args.sort_dir, args.limit, args.offset
-        )
+        if args.sync_state:
+            if args.limit or args.offset or args.all_pages or args.sort_dir:
+                raise argparse.ArgumentTypeError(
+                    'argument --sync-state could not be used with --limit, '
+                    '--offset, --sort-dir or --all'
+                )
+            logs = manager.sync_antiddos_daily_logs(
+                floating_ip.floating_ip_id,
+                log_sync.LogSyncState(args.sync_state),
+                page_size=args.page_size
+            )
+        elif args.all_pages:
+            if args.limit:
+                raise argparse.ArgumentTypeError(
+                    'argument --limit could not be used with --all'
+                )
+            logs = manager.iter_antiddos_daily_logs(
+                floating_ip.floating_ip_id, args.sort_dir,
+                page_size=args.page_size, offset=args.offset
+            )
+        else:
+            logs = manager.get_antiddos_daily_logs(
+                floating_ip.floating_ip_id, args.sort_dir, args.limit,
+                args.offset
+            )
         columns = resource.AntiDDosLog.list_column_names
-        data = (r.get_display_data(columns, formatter=r.formatter)
-                for r in logs)
-        return columns, data
+        formatter = resource.AntiDDosLog.formatter
+        return columns, display.iter_display_data(logs, columns, formatter)
+
+
+@six.add_metaclass(abc.ABCMeta)
+class ExportCommand(command.Command):
+    """Export records of floating IPs to NDJSON or CSV
+
+    Records are written chunk by chunk (e.g. a log page) as they are
+    fetched, without building resources or going through output
+    formatters. Exit code is 1 if records of any
+    floating IP could not be fetched.
+    """
+
+    # fields of CSV export
+    fields = ()
+
+    def get_parser(self, prog_name):
+        parser = super(ExportCommand, self).get_parser(prog_name)
+        parser.add_argument(
+            'floating_ips',
+            metavar='<floating ip>',
+            nargs='*',
+            help=_("For floating ip (UUID or IP), could be repeated")
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            dest="all_eips",
+            default=False,
+            help=_("export every floating ip, could not be used with "
+                   "<floating ip>")
+        )
+        parser.add_argument(
+            "--status",
+            choices=resource.AntiDDos.status_list,
+            help=_("export floating ips with status when --all is used")
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(export.WRITERS),
+            default='ndjson',
+            dest='export_format',
+            help=_("export format, ndjson writes one JSON object per line "
+                   "(default ndjson)")
+        )
+        parser.add_argument(
+            "--output",
+            metavar="<file>",
+            default='-',
+            help=_("file to write, '-' for stdout (default)")
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<concurrency>",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=_("max floating ips fetched at the same time (default 10)")
+        )
+        return parser
+
+    @abc.abstractmethod
+    def iter_rows(self, manager, floating_ips, args):
+        """(floating ip id, rows, error) of every row chunk of floating IPs
+        """
+
+    def take_action(self, args):
+        if args.all_eips:
+            if args.floating_ips:
+                raise argparse.ArgumentTypeError(
+                    'argument <floating ip> could not be used with --all'
+                )
+        elif not args.floating_ips:
+            raise argparse.ArgumentTypeError(
+                'argument <floating ip> is required without --all'
+            )
+        elif args.status:
+            raise argparse.ArgumentTypeError(
+                'argument --status could only be used with --all'
+            )
+
+        manager = self.app.client_manager.antiddos.antiddos
+        floating_ips = args.floating_ips
+        if args.all_eips:
+            floating_ips = (antiddos.floating_ip_id for antiddos
+                            in manager.iter_list(status=args.status))
+
+        if args.output == '-':
+            return self._export(manager, floating_ips, args, self.app.stdout)
+        # csv writes its own line ends, newline='' keeps them untranslated
+        with io.open(args.output, 'w', newline='',
+                     encoding='utf-8') as stream:
+            return self._export(manager, floating_ips, args, stream)
+
+    def _export(self, manager, floating_ips, args, stream):
+        writer = export.WRITERS[args.export_format](stream, self.fields)
+        failed = []
+        exported = 0
+        for floating_ip_id, rows, error in self.iter_rows(
+                manager, floating_ips, args):
+            if error is not None:
+                LOG.warning('Failed to export floating ip %s: %s',
+                            floating_ip_id, error)
+                failed.append(floating_ip_id)
+                continue
+            exported += writer.write_rows(floating_ip_id, rows)
+            # a chunk reaches the reader before waiting for the next one
+            stream.flush()
+        self.app.stderr.write(
+            _('Exported %(rows)d records, %(failed)d floating ips '
+              'failed\n') % {'rows': exported, 'failed': len(failed)}
+        )
+        return 1 if failed else 0
+
+
+class ExportAntiDDosLogs(ExportCommand):
+    _description = _("Export AntiDDos logs of past 24h of floating ips")
+
+    fields = export.LOG_FIELDS
+
+    def get_parser(self, prog_name):
+        parser = super(ExportAntiDDosLogs, self).get_parser(prog_name)
+        p.BaseParser.add_sortdir_option(parser)
+        parser.add_argument(
+            "--page-size",
+            metavar="<page-size>",
+            type=int,
+            default=100,
+            help=_("result number of every log page request (default 100)")
+        )
+        return parser
+
+    def iter_rows(self, manager, floating_ips, args):
+        return manager.iter_daily_log_rows(
+            floating_ips, sort_dir=args.sort_dir,
+            page_size=max(1, args.page_size),
+            concurrency=max(1, args.concurrency)
+        )
+
+
+class ExportAntiDDosDailyReport(ExportCommand):
+    _description = _("Export AntiDDos report(every 5min) of past 24h of "
+                     "floating ips")
+
+    fields = export.DAILY_REPORT_FIELDS
+
+    def iter_rows(self, manager, floating_ips, args):
+        return manager.iter_daily_report_rows(
+            floating_ips, concurrency=max(1, args.concurrency)
+        )
 
 
 class ListAntiDDosWeeklyReport(command.ShowOne):
@@ -295,3 +882,61 @@ class ListAntiDDosWeeklyReport(command.ShowOne):
         formatter = resource.AntiDDosWeeklyReport.formatter
         output = report.get_display_data(columns, formatter=formatter)
         return columns, output
+
+
+class ListAntiDDosWeeklyReports(command.Lister):
+    _description = _("List AntiDDos weekly protection statistics of "
+                     "consecutive weeks")
+
+    def get_parser(self, prog_name):
+        parser = super(ListAntiDDosWeeklyReports, self).get_parser(prog_name)
+        parser.add_argument(
+            '--start-date',
+            metavar='<start-date>',
+            required=False,
+            type=parsetypes.date_type,
+            help=_("start date of the first week (yyyy-MM-dd), weeks end "
+                   "today if omitted")
+        )
+        parser.add_argument(
+            '--weeks',
+            metavar='<weeks>',
+            type=int,
+            default=1,
+            help=_("number of weeks (default 1)")
+        )
+        parser.add_argument(
+            "--concurrency",
+            metavar="<concurrency>",
+            type=int,
+            default=DEFAULT_CONCURRENCY,
+            help=_("max report requests run at the same time (default 10)")
+        )
+        return parser
+
+    def take_action(self, args):
+        if args.weeks < 1:
+            raise argparse.ArgumentTypeError(
+                'argument --weeks should be a positive number'
+            )
+        manager = self.app.client_manager.antiddos.antiddos
+        reports = manager.get_antiddos_weekly_reports(
+            args.weeks, start_date=args.start_date,
+            concurrency=args.concurrency
+        )
+        # merged totals go to stderr, keep stdout parsable with -f
+        self.app.stderr.write(
+            _('%(times)d ddos intercept times in %(weeks)d weeks\n') % {
+                'times': reports.ddos_intercept_times,
+                'weeks': len(reports),
+            }
+        )
+        for top in reports.top10:
+            self.app.stderr.write(
+                _('  %(address)s: attacked %(times)d times\n') % {
+                    'address': top.floating_ip_address,
+                    'times': top.times,
+                }
+            )
+        columns = resource.WeeklyReportWeek.list_column_names
+        return columns, display.iter_display_data(reports, columns)
@@ -13,14 +13,8 @@
 #   under the License.
 #
 from antiddosclient.common.i18n import _
-
-
-# traffic maximum
-maximum_service_traffic = [10, 30, 50, 70, 100, 150, 200, 250, 300]
-
-# http request rate
-http_request_rate = [100, 150, 240, 350, 480, 550, 700, 850, 1000, 1500, 2000,
-                     3000, 5000, 10000, 20000]
+from antiddosclient.v1.resource import http_request_rate
+from antiddosclient.v1.resource import maximum_service_traffic
 
 
 class AntiDDosParser(object):
@@ -33,6 +27,24 @@ class AntiDDosParser(object):
             help=_("For floating ip (UUID or IP)")
         )
 
+    @staticmethod
+    def add_floating_ip_or_file_arg(parser):
+        parser.add_argument(
+            'floating_ip',
+            metavar='<floating ip>',
+            nargs='?',
+            help=_("For floating ip (UUID or IP), required without "
+                   "--from-file")
+        )
+        parser.add_argument(
+            '--from-file',
+            metavar='<file>',
+            help=_("For every floating ip of the CSV file ('-' for stdin), "
+                   "rows are floating_ip[,maximum_service_traffic"
+                   "[,http_request_rate[,enable_cc]]], empty cells use the "
+                   "command options")
+        )
+
     @staticmethod
     def add_enable_l7_arg(parser):
         enable_group = parser.add_mutually_exclusive_group()
@@ -51,10 +63,10 @@ class AntiDDosParser(object):
         )
 
     @staticmethod
-    def add_maximum_service_traffic_arg(parser):
+    def add_maximum_service_traffic_arg(parser, required=True):
         parser.add_argument(
             '--maximum-service-traffic',
-            required=True,
+            required=required,
             choices=maximum_service_traffic,
             type=int,
             help=_("Maximum service traffic (Mbit/s)")
@@ -12,3 +12,26 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
+import fnmatch
+import os
+import sys
+
+# test modules of the asyncio clients, their syntax needs python 3.7+
+ASYNC_TEST_PREFIX = 'test_async_'
+
+
+def load_tests(loader, standard_tests, pattern):
+    """load test modules of the package, the ones of the asyncio clients
+    are skipped before python 3.7 where importing them is a SyntaxError
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for filename in sorted(os.listdir(directory)):
+        if not fnmatch.fnmatch(filename, pattern or 'test*.py'):
+            continue
+        if (filename.startswith(ASYNC_TEST_PREFIX) and
+                sys.version_info < (3, 7)):
+            continue
+        standard_tests.addTests(loader.loadTestsFromName(
+            '%s.%s' % (__name__, filename[:-len('.py')])
+        ))
+    return standard_tests
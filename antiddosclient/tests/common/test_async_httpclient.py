@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import asyncio
+
+import aiohttp
+import mock
+from keystoneauth1 import exceptions as exc
+
+from antiddosclient.common import async_httpclient
+from antiddosclient.tests import base
+from antiddosclient.tests import fakes
+
+
+class FakeAsyncResponse(object):
+    def __init__(self, status, headers, content):
+        self.status = status
+        self.reason = 'reason'
+        self.headers = headers
+        self.url = 'http://antiddos.endpoint/v1/fake'
+        self.charset = 'utf-8'
+        self.content = content
+
+    async def read(self):
+        return self.content
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class FailedAsyncResponse(object):
+    def __init__(self, error):
+        self.error = error
+
+    async def __aenter__(self):
+        raise self.error
+
+    async def __aexit__(self, *args):
+        pass
+
+
+class TestAsyncHttpClient(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestAsyncHttpClient, self).setUp()
+        session = mock.Mock()
+        session.get_project_id.return_value = 'project'
+        session.get_auth_headers.return_value = {'X-Auth-Token': 'token'}
+        self.client = async_httpclient.AsyncOpenStackHttpClient(
+            session, 'http://antiddos.endpoint/v1/%(project_id)s'
+        )
+        self.http = mock.Mock()
+        self.client.get_http_session = mock.Mock(return_value=self.http)
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def test_request(self):
+        headers = {
+            'Content-Type': 'application/json',
+            'x-openstack-request-id': fakes.FAKE_REQUEST_ID,
+        }
+        self.http.request.return_value = FakeAsyncResponse(
+            200, headers, b'{"task_id": "fake"}'
+        )
+        resp, body = self.loop.run_until_complete(
+            self.client.get('/antiddos', params={'ip': '1.1.1.1'})
+        )
+        self.assertEqual({'task_id': 'fake'}, body)
+        self.assertEqual(fakes.FAKE_REQUEST_ID,
+                         resp.headers['X-Openstack-Request-Id'])
+        self.http.request.assert_called_once_with(
+            'GET',
+            'http://antiddos.endpoint/v1/project/antiddos',
+            headers={'Accept': 'application/json',
+                     'X-Auth-Token': 'token'},
+            params={'ip': '1.1.1.1'}
+        )
+
+    def test_request_without_body(self):
+        self.http.request.return_value = FakeAsyncResponse(200, {}, b'')
+        resp, body = self.loop.run_until_complete(
+            self.client.delete('/antiddos/fake')
+        )
+        self.assertIsNone(body)
+        self.assertEqual(200, resp.status_code)
+
+    def test_convert_http_error(self):
+        headers = {'Content-Type': 'application/json'}
+        content = (b'{"error_code": "413", '
+                   b'"error_description": "Request Entity Too Large"}')
+        self.http.request.return_value = FakeAsyncResponse(
+            413, headers, content
+        )
+        self.assertRaises(exc.RequestEntityTooLarge,
+                          self.loop.run_until_complete,
+                          self.client.post('/antiddos/fake'))
+
+    def test_convert_connection_error(self):
+        self.http.request.return_value = FailedAsyncResponse(
+            aiohttp.ServerDisconnectedError()
+        )
+        self.assertRaises(exc.ConnectionError,
+                          self.loop.run_until_complete,
+                          self.client.get('/antiddos/fake'))
+        stats = self.client.stats()
+        self.assertEqual(1, stats['GET /antiddos/fake']['errors'])
+
+    def test_convert_timeout(self):
+        self.http.request.return_value = FailedAsyncResponse(
+            asyncio.TimeoutError()
+        )
+        self.assertRaises(exc.ConnectTimeout,
+                          self.loop.run_until_complete,
+                          self.client.get('/antiddos/fake'))
+
+    def test_request_metrics(self):
+        self.http.request.return_value = FakeAsyncResponse(
+            200, {}, b'{"task_id": "fake"}'
+        )
+        self.loop.run_until_complete(
+            self.client.get('/antiddos/11427e0f-dc37-4319-a0e2-390e560fe116')
+        )
+        self.http.request.return_value = FakeAsyncResponse(
+            413, {'Content-Type': 'text/plain'}, b'too large'
+        )
+        self.assertRaises(exc.RequestEntityTooLarge,
+                          self.loop.run_until_complete,
+                          self.client.post('/antiddos/fake'))
+
+        stats = self.client.stats()
+        self.assertEqual({200: 1},
+                         stats['GET /antiddos/{id}']['status_codes'])
+        self.assertEqual(19, stats['GET /antiddos/{id}']['bytes_in'])
+        self.assertEqual({413: 1},
+                         stats['POST /antiddos/fake']['status_codes'])
+
+    def test_auth_headers_cached_until_token_renewed(self):
+        session = self.client.session
+        session.auth.auth_ref.will_expire_soon.return_value = False
+        self.http.request.side_effect = lambda *args, **kwargs: (
+            FakeAsyncResponse(200, {}, b'')
+        )
+        self.loop.run_until_complete(self.client.get('/antiddos'))
+        self.loop.run_until_complete(self.client.get('/antiddos'))
+        self.assertEqual(1, session.get_auth_headers.call_count)
+
+        session.auth.auth_ref.will_expire_soon.return_value = True
+        self.loop.run_until_complete(self.client.get('/antiddos'))
+        self.assertEqual(2, session.get_auth_headers.call_count)
+
+        session.auth.auth_ref = mock.Mock()
+        session.auth.auth_ref.will_expire_soon.return_value = False
+        self.loop.run_until_complete(self.client.get('/antiddos'))
+        self.loop.run_until_complete(self.client.get('/antiddos'))
+        self.assertEqual(3, session.get_auth_headers.call_count)
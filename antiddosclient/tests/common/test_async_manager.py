@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import asyncio
+import inspect
+
+import mock
+from keystoneauth1 import exceptions
+
+from antiddosclient.common import manager
+from antiddosclient.common import resource
+from antiddosclient.tests import base
+from antiddosclient.tests import fakes
+from antiddosclient.v1 import antiddos_mgr
+from antiddosclient.v1 import async_antiddos_mgr
+from antiddosclient.v1 import resource as v1_resource
+from antiddosclient.v2 import async_alert_mgr
+from antiddosclient.v2 import resource as v2_resource
+
+
+class TestAsyncManager(base.BaseTestCase):
+
+    instance = {
+        "floating_ip_id": fakes.FAKE_RESOURCE_ID,
+        "floating_ip_address": "192.168.42.221",
+        "network_type": "EIP",
+        "status": "normal"
+    }
+
+    def setUp(self):
+        super(TestAsyncManager, self).setUp()
+        self.http_client = mock.Mock()
+        self.manager = async_antiddos_mgr.AsyncAntiDDosManager(
+            self.http_client
+        )
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+
+    def run_async(self, coroutine):
+        return self.loop.run_until_complete(coroutine)
+
+    def mock_get(self, body):
+        self.http_client.get = mock.AsyncMock(
+            return_value=(fakes.create_response(), body)
+        )
+
+    def test_list(self):
+        self.mock_get({"ddosStatus": [self.instance]})
+        result = self.run_async(self.manager.list(status='normal'))
+        self.assertIsInstance(result, resource.ListWithMeta)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, result.request_id)
+        self.assertIsInstance(result[0], v1_resource.AntiDDos)
+        self.assertEqual(self.instance, result[0].original)
+        self.http_client.get.assert_called_once_with(
+            "/antiddos", params={"status": "normal"}, headers={}
+        )
+
+    def test_find_by_ip(self):
+        self.mock_get({"ddosStatus": [self.instance]})
+        result = self.run_async(self.manager.find("192.168.42.221"))
+        self.assertEqual(self.instance, result.original)
+
+    def test_find_by_uuid(self):
+        self.mock_get({"enable_L7": True, "traffic_pos_id": 1})
+        result = self.run_async(self.manager.find(fakes.FAKE_RESOURCE_ID))
+        self.assertIsInstance(result, v1_resource.AntiDDos)
+        self.assertEqual(fakes.FAKE_RESOURCE_ID, result.floating_ip_id)
+        self.http_client.get.assert_called_once_with(
+            "/antiddos/%s" % fakes.FAKE_RESOURCE_ID, params={}, headers={}
+        )
+
+    def test_find_not_found(self):
+        self.mock_get({"ddosStatus": []})
+        self.assertRaises(exceptions.NotFound, self.run_async,
+                          self.manager.find("192.168.42.221"))
+
+    def test_get_task_status(self):
+        self.mock_get({"task_status": "success", "task_msg": ""})
+        task = self.run_async(self.manager.get_task_status("task-id"))
+        self.assertIsInstance(task, v1_resource.AntiDDosTask)
+        self.assertEqual("success", task.task_status)
+
+    def test_open_antiddos(self):
+        self.http_client.post = mock.AsyncMock(
+            return_value=(fakes.create_response(), {"task_id": "task-id"})
+        )
+        result = self.run_async(self.manager.open_antiddos(
+            fakes.FAKE_RESOURCE_ID, True, 1, 1, 8, 1
+        ))
+        self.assertIsInstance(result, resource.DictWithMeta)
+        self.assertEqual("task-id", result["task_id"])
+
+    def test_alert_config(self):
+        alert_manager = async_alert_mgr.AsyncAlertManager(self.http_client)
+        self.mock_get({"topic_urn": "urn", "display_name": "name"})
+        alert = self.run_async(alert_manager.get())
+        self.assertIsInstance(alert, v2_resource.AlertConfig)
+        self.assertEqual("urn", alert.topic_urn)
+
+    def test_public_api_returns_awaitable(self):
+        for verb in ('get', 'post', 'put', 'delete'):
+            setattr(self.http_client, verb, mock.AsyncMock(
+                return_value=(fakes.create_response(), {})
+            ))
+        # body helpers of BaseManager such as get_data are not requests
+        public = [name for name in dir(self.manager)
+                  if not name.startswith('_')
+                  and name not in dir(manager.BaseManager)
+                  and inspect.ismethod(getattr(self.manager, name))]
+        self.assertIn('query_config_list', public)
+        self.assertIn('get_antiddos_weekly_report', public)
+        for name in public:
+            function = getattr(self.manager, name)
+            required = [p for p in inspect.signature(function).parameters
+                        .values() if p.default is p.empty]
+            result = function(*['fake'] * len(required))
+            self.assertTrue(inspect.isawaitable(result),
+                            '%s does not return an awaitable' % name)
+            try:
+                self.run_async(result)
+            except exceptions.NotFound:
+                pass
+
+    def test_blocking_helpers_not_inherited(self):
+        blocking = set(dir(antiddos_mgr.AntiDDosManager)) - set(
+            dir(antiddos_mgr.BaseAntiDDosManager))
+        for name in ('enable_index', 'iter_list', 'bulk_apply',
+                     'wait_for_tasks', 'get_fleet_daily_report',
+                     'get_antiddos_daily_frame', 'sync_antiddos_daily_logs',
+                     'get_status_snapshot', 'get_antiddos_weekly_reports',
+                     'hydrate', '_http_get'):
+            self.assertIn(name, blocking)
+        for name in blocking - set(('find', 'get_antiddos')):
+            if not name.startswith('_') or name == '_http_get':
+                self.assertFalse(hasattr(self.manager, name), name)
+
+    def test_inherited_get(self):
+        self.mock_get({"status": "normal"})
+        status = self.run_async(
+            self.manager.get_antiddos_status(fakes.FAKE_RESOURCE_ID))
+        self.assertIsInstance(status, v1_resource.AntiDDosStatus)
+        self.assertEqual("normal", status.status)
+
+        self.mock_get({"weekdata": []})
+        report = self.run_async(self.manager.get_antiddos_weekly_report())
+        self.assertIsInstance(report, v1_resource.AntiDDosWeeklyReport)
+        self.http_client.get.assert_called_once_with(
+            "/antiddos/weekly", params={}, headers={}
+        )
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import os
+
+import fixtures
+import mock
+
+from antiddosclient.common import cache
+from antiddosclient.tests import base
+from antiddosclient.tests import fakes
+
+
+class TestCachePolicy(base.BaseTestCase):
+
+    def test_get_ttl(self):
+        policy = cache.CachePolicy(r'^/tasks$', ttl=10)
+        self.assertTrue(policy.matches('/tasks'))
+        self.assertFalse(policy.matches('/tasks/1'))
+        self.assertEqual(10, policy.get_ttl({}, {}))
+
+    def test_get_ttl_of_immutable(self):
+        policy = cache.CachePolicy(
+            r'^/tasks$', immutable=lambda params, body: body['finished']
+        )
+        self.assertEqual(-1, policy.get_ttl({}, {'finished': True}))
+        self.assertIsNone(policy.get_ttl({}, {'finished': False}))
+
+
+class TestResponseCache(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestResponseCache, self).setUp()
+        self.directory = self.useFixture(fixtures.TempDir()).path
+        self.cache = cache.ResponseCache(self.directory)
+        self.resp = fakes.create_response()
+
+    def test_set_and_get(self):
+        self.assertIsNone(self.cache.get('/resources', {'a': 1}))
+        self.cache.set('/resources', {'a': 1}, self.resp, {'k': 'v'}, 60)
+        resp, body = self.cache.get('/resources', {'a': 1})
+        self.assertEqual({'k': 'v'}, body)
+        self.assertEqual(fakes.FAKE_REQUEST_ID,
+                         resp.headers['x-openstack-request-id'])
+        # params are part of key
+        self.assertIsNone(self.cache.get('/resources', {'a': 2}))
+
+    def test_scope(self):
+        self.cache.set('/resources', {}, self.resp, {'k': 'project-1'}, 60,
+                       scope='https://example.com/v1/project-1')
+        self.cache.set('/resources', {}, self.resp, {'k': 'project-2'}, 60,
+                       scope='https://example.com/v1/project-2')
+        _, body = self.cache.get('/resources', {},
+                                 scope='https://example.com/v1/project-1')
+        self.assertEqual({'k': 'project-1'}, body)
+        _, body = self.cache.get('/resources', {},
+                                 scope='https://example.com/v1/project-2')
+        self.assertEqual({'k': 'project-2'}, body)
+        self.assertIsNone(self.cache.get('/resources', {}))
+        # writes invalidate entries of all scopes
+        self.cache.invalidate('/resources')
+        self.assertIsNone(
+            self.cache.get('/resources', {},
+                           scope='https://example.com/v1/project-1'))
+
+    @mock.patch('time.time')
+    def test_expired(self, mocked_time):
+        mocked_time.return_value = 1000
+        self.cache.set('/resources', {}, self.resp, {'k': 'v'}, 60)
+        self.cache.set('/immutable', {}, self.resp, {'k': 'v'}, -1)
+        mocked_time.return_value = 1061
+        self.assertIsNone(self.cache.get('/resources', {}))
+        self.assertIsNotNone(self.cache.get('/immutable', {}))
+
+    def test_invalidate(self):
+        for url in ('/resources', '/resources/1', '/resources/1/status',
+                    '/resources/2', '/resources/config'):
+            self.cache.set(url, {}, self.resp, {'k': 'v'}, 60)
+        self.cache.invalidate('/resources/1')
+        self.assertIsNone(self.cache.get('/resources', {}))
+        self.assertIsNone(self.cache.get('/resources/1', {}))
+        self.assertIsNone(self.cache.get('/resources/1/status', {}))
+        self.assertIsNotNone(self.cache.get('/resources/2', {}))
+        self.assertIsNotNone(self.cache.get('/resources/config', {}))
+
+    def test_evict_least_recently_used(self):
+        self.cache.set('/resources/1', {}, self.resp, {'k': 'v'}, -1)
+        path = self.cache._path('/resources/1', {})
+        self.cache.max_size = os.path.getsize(path) * 2
+        self.cache.set('/resources/2', {}, self.resp, {'k': 'v'}, -1)
+        os.utime(path, (0, 0))
+        self.cache.set('/resources/3', {}, self.resp, {'k': 'v'}, -1)
+        self.assertIsNone(self.cache.get('/resources/1', {}))
+        self.assertIsNotNone(self.cache.get('/resources/3', {}))
+
+    def test_clear(self):
+        self.cache.set('/resources', {}, self.resp, {'k': 'v'}, 60)
+        self.cache.clear()
+        self.assertEqual([], os.listdir(self.directory))
+
+    def test_size_in_bytes(self):
+        self.cache.set('/resources/1', {}, self.resp, {'k': u'中'}, 60)
+        self.cache.set('/resources/2', {}, self.resp, {'k': 'v' * 10}, 60)
+        self.cache.set('/resources/2', {}, self.resp, {'k': 'v'}, 60)
+        self.assertEqual(
+            sum(os.path.getsize(os.path.join(self.directory, name))
+                for name in os.listdir(self.directory)),
+            self.cache._size
+        )
+
+    def test_invalidate_with_index(self):
+        self.cache.set('/resources/1', {}, self.resp, {'k': 'v'}, 60)
+        # entries written before are indexed by a new cache
+        self.cache = cache.ResponseCache(self.directory)
+        self.cache.set('/resources/2', {}, self.resp, {'k': 'v'}, 60)
+        with mock.patch('os.listdir') as mocked_listdir:
+            self.cache.set('/resources/3', {}, self.resp, {'k': 'v'}, 60)
+            self.cache.invalidate('/resources/1')
+            self.cache.invalidate('/resources/3')
+        self.assertFalse(mocked_listdir.called)
+        self.assertIsNone(self.cache.get('/resources/1', {}))
+        self.assertIsNotNone(self.cache.get('/resources/2', {}))
+        self.assertIsNone(self.cache.get('/resources/3', {}))
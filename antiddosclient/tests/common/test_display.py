@@ -87,3 +87,28 @@ class TestDisplay(base.BaseTestCase):
         self.assertEqual(r.show_column_names, ('column_a', 'columnb'))
         self.assertEqual(r.list_column_names,
                          ('column_a', 'columnb', 'column_array'))
+
+    def test_display_plan_is_compiled_once(self):
+        column_names = ('Column A', 'Columnb')
+        plan = DisplayResource.get_display_plan(column_names)
+        self.assertIs(plan, DisplayResource.get_display_plan(column_names))
+        self.assertEqual(plan.names, ('column_a', 'column_b'))
+        self.assertIsNot(plan, OverrideResource.get_display_plan(column_names))
+
+    def test_display_plan_formatter_and_missing_column(self):
+        r = DisplayResource(None, self.instance, attached=True)
+        formatter = {'column_array': lambda value: ','.join(map(str, value))}
+
+        data = r.get_display_data(('column_array', 'missing'), formatter)
+        self.assertEqual(data, ('1,2,3', ''))
+        data = r.get_display_data(('Column A',))
+        self.assertEqual(data, ('A1',))
+
+    def test_iter_display_data(self):
+        rows = [DisplayResource(None, dict(self.instance, column_a=str(i)),
+                                attached=True) for i in range(3)]
+        column_names = ('Column A', 'Columnb', 'computed')
+        data = list(display.iter_display_data(rows, column_names))
+        self.assertEqual(data, [r.get_display_data(column_names)
+                                for r in rows])
+        self.assertEqual(data[2], ('2', 'B1', '2B1'))
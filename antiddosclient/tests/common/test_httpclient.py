@@ -12,11 +12,18 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
+import threading
+import time
+
 from antiddosclient.tests import base
 from antiddosclient.common import httpclient
+from antiddosclient.common import retry
+from antiddosclient.tests.common.test_retry import fake_http_error
 
 from keystoneauth1 import exceptions as exc
+from keystoneauth1 import session
 import mock
+import requests_mock
 
 
 class TestHttpClient(base.BaseTestCase):
@@ -45,3 +52,210 @@ class TestHttpClient(base.BaseTestCase):
         http_error = exc.from_response(mock_resp, 'POST', 'fake_url')
         mocked.side_effect = http_error
         self.assertRaises(exc.RequestEntityTooLarge, client.request)
+
+    def test_private_connection_pool(self):
+        shared = session.Session(auth=mock.Mock(), verify=False, timeout=10)
+        client = httpclient.OpenStackHttpClient(shared, pool_size=50,
+                                                pool_block=True)
+        self.assertIsNot(shared, client.session)
+        self.assertIsInstance(client.session, session.Session)
+        self.assertIs(shared.auth, client.session.auth)
+        self.assertFalse(client.session.verify)
+        self.assertEqual(10, client.session.timeout)
+        http_adapter = client.session.session.get_adapter('https://host')
+        self.assertIsInstance(http_adapter, session.TCPKeepAliveAdapter)
+        self.assertEqual(50, http_adapter._pool_maxsize)
+        self.assertTrue(http_adapter._pool_block)
+        # private pool does not change the shared session
+        self.assertIsNot(shared.session, client.session.session)
+
+        stats = client.pool_stats()
+        self.assertEqual(50, stats['pool_size'])
+        self.assertEqual(0, stats['in_flight'])
+        self.assertEqual([], stats['hosts'])
+
+    def test_shared_connection_pool(self):
+        session = mock.MagicMock()
+        client = httpclient.OpenStackHttpClient(session)
+        self.assertIs(session, client.session)
+
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_no_keep_alive(self, mocked):
+        client = httpclient.OpenStackHttpClient(mock.MagicMock(),
+                                                keep_alive=False)
+        headers = {}
+        client.request('/url', 'GET', headers=headers)
+        mocked.assert_called_once_with('/url', 'GET',
+                                       headers={'Connection': 'close'})
+        # caller headers are not changed
+        self.assertEqual({}, headers)
+
+    def test_pool_size_per_host_key(self):
+        shared = mock.MagicMock()
+        shared.get_endpoint.return_value = 'https://antiddos.example.com/v1'
+        client = httpclient.OpenStackHttpClient(shared, pool_size_per_host=1)
+        semaphore = client._get_host_semaphore('/antiddos')
+        # relative URLs are limited with the endpoint host
+        self.assertIs(semaphore, client._get_host_semaphore(
+            'https://antiddos.example.com/v1/antiddos'))
+        self.assertIsNot(semaphore, client._get_host_semaphore(
+            'https://other.example.com/v1/antiddos'))
+        self.assertEqual(1, shared.get_endpoint.call_count)
+
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_pool_size_per_host(self, mocked):
+        client = httpclient.OpenStackHttpClient(mock.MagicMock(),
+                                                pool_size_per_host=1)
+        client.session.get_endpoint.return_value = 'https://host/v1'
+        started = threading.Event()
+        release = threading.Event()
+
+        def request(*args, **kwargs):
+            started.set()
+            release.wait(5)
+
+        mocked.side_effect = request
+        first = threading.Thread(target=client.request, args=('/a', 'GET'))
+        first.start()
+        started.wait(5)
+        second = threading.Thread(target=client.request, args=('/b', 'GET'))
+        second.start()
+        # second request waits for the first one
+        for _ in range(100):
+            if client.pool_stats()['waited']:
+                break
+            time.sleep(0.01)
+        stats = client.pool_stats()
+        self.assertEqual(1, stats['in_flight'])
+        self.assertEqual(1, stats['waited'])
+
+        release.set()
+        first.join(5)
+        second.join(5)
+        stats = client.pool_stats()
+        self.assertEqual(0, stats['in_flight'])
+        self.assertEqual(1, stats['peak_in_flight'])
+        self.assertEqual(2, mocked.call_count)
+
+    @mock.patch('time.sleep')
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_retry_idempotent_request(self, mocked, sleep):
+        policy = retry.RetryPolicy(max_retries=3, initial_delay=1, jitter=0)
+        client = httpclient.OpenStackHttpClient(mock.MagicMock(),
+                                                retry_policy=policy)
+        mocked.side_effect = [fake_http_error(503),
+                              exc.ConnectFailure(),
+                              mock.sentinel.response]
+        self.assertEqual(mock.sentinel.response,
+                         client.request('/url', 'GET'))
+        self.assertEqual(3, mocked.call_count)
+        sleep.assert_has_calls([mock.call(1), mock.call(2)])
+
+    @mock.patch('time.sleep')
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_retry_exhausted(self, mocked, sleep):
+        policy = retry.RetryPolicy(max_retries=2)
+        client = httpclient.OpenStackHttpClient(mock.MagicMock(),
+                                                retry_policy=policy)
+        mocked.side_effect = fake_http_error(502)
+        self.assertRaises(exc.BadGateway, client.request, '/url', 'PUT')
+        self.assertEqual(3, mocked.call_count)
+
+    @mock.patch('time.sleep')
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_retry_total_delay_capped(self, mocked, sleep):
+        policy = retry.RetryPolicy(max_retries=10, max_total_delay=120)
+        client = httpclient.OpenStackHttpClient(mock.MagicMock(),
+                                                retry_policy=policy)
+        mocked.side_effect = fake_http_error(429, '50')
+        self.assertRaises(exc.TooManyRequests, client.request, '/url', 'GET')
+        # the third retry would wait 150 seconds in total
+        self.assertEqual(3, mocked.call_count)
+        sleep.assert_has_calls([mock.call(50.0), mock.call(50.0)])
+
+    @mock.patch('time.sleep')
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_no_retry_client_error(self, mocked, sleep):
+        policy = retry.RetryPolicy()
+        client = httpclient.OpenStackHttpClient(mock.MagicMock(),
+                                                retry_policy=policy)
+        mocked.side_effect = fake_http_error(400)
+        self.assertRaises(exc.BadRequest, client.request, '/url', 'GET')
+        self.assertEqual(1, mocked.call_count)
+        sleep.assert_not_called()
+
+    @mock.patch('time.sleep')
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_retry_post_opt_in(self, mocked, sleep):
+        policy = retry.RetryPolicy()
+        client = httpclient.OpenStackHttpClient(mock.MagicMock(),
+                                                retry_policy=policy)
+        mocked.side_effect = fake_http_error(503)
+        self.assertRaises(exc.ServiceUnavailable, client.request,
+                          '/url', 'POST')
+        self.assertEqual(1, mocked.call_count)
+
+        mocked.reset_mock()
+        mocked.side_effect = [fake_http_error(503), mock.sentinel.response]
+        self.assertEqual(mock.sentinel.response,
+                         client.request('/url', 'POST', retry=True))
+        self.assertEqual(2, mocked.call_count)
+        # retry argument is not passed to keystoneauth
+        mocked.assert_called_with('/url', 'POST')
+
+    @mock.patch('time.sleep')
+    @mock.patch("keystoneauth1.adapter.LegacyJsonAdapter.request")
+    def test_retry_after_pauses_rate_limiter(self, mocked, sleep):
+        limiter = mock.Mock()
+        client = httpclient.OpenStackHttpClient(
+            mock.MagicMock(), retry_policy=retry.RetryPolicy(),
+            rate_limiter=limiter
+        )
+        mocked.side_effect = [fake_http_error(429, '5'),
+                              mock.sentinel.response]
+        self.assertEqual(mock.sentinel.response,
+                         client.request('/url', 'DELETE'))
+        limiter.pause.assert_called_once_with(5.0)
+        self.assertEqual(2, limiter.acquire.call_count)
+        sleep.assert_called_once_with(5.0)
+
+    @mock.patch('time.sleep')
+    def test_request_metrics(self, sleep):
+        client = httpclient.OpenStackHttpClient(
+            session.Session(),
+            retry_policy=retry.RetryPolicy(),
+        )
+        url = ('http://antiddos.endpoint/antiddos/'
+               '11427e0f-dc37-4319-a0e2-390e560fe116')
+        with requests_mock.Mocker() as m:
+            m.get(url, [{'status_code': 503, 'text': 'busy'},
+                        {'json': {'status': 'normal'}}])
+            client.get(url)
+            m.put(url, json={'task_id': 'fake'})
+            client.put(url, json={'enable_L7': True})
+
+        stats = client.stats()
+        get_stats = stats['GET /antiddos/{id}']
+        self.assertEqual(2, get_stats['requests'])
+        self.assertEqual({200: 1, 503: 1}, get_stats['status_codes'])
+        self.assertEqual(1, get_stats['retries'])
+        self.assertEqual(len('busy') + len('{"status": "normal"}'),
+                         get_stats['bytes_in'])
+        put_stats = stats['PUT /antiddos/{id}']
+        self.assertEqual(len('{"enable_L7": true}'), put_stats['bytes_out'])
+
+    def test_stream_request(self):
+        client = httpclient.OpenStackHttpClient(session.Session())
+        url = 'http://antiddos.endpoint/antiddos'
+        with requests_mock.Mocker() as m:
+            m.get(url, text='{"ddosStatus": []}',
+                  headers={'Content-Length': '18'})
+            resp, body = client.get(url, stream=True)
+
+        self.assertIsNone(body)
+        self.assertEqual('application/json',
+                         m.last_request.headers['Accept'])
+        # body is left for the caller, metrics does not read it
+        self.assertFalse(resp._content_consumed)
+        self.assertEqual(18, client.stats()['GET /antiddos']['bytes_in'])
+        self.assertEqual(b'{"ddosStatus": []}', b''.join(resp.iter_content()))
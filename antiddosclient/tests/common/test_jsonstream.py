@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import json
+
+import mock
+
+from antiddosclient.common import jsonstream
+from antiddosclient.tests import base
+
+
+def chunked(content, size):
+    return [content[i:i + size] for i in range(0, len(content), size)]
+
+
+class TestJsonArrayStream(base.BaseTestCase):
+
+    body = {
+        'total': 3,
+        'logs': [
+            {'start_time': 1473217200000, 'status': 1, 'name': u'中'},
+            {'start_time': 1473217500000, 'status': 2, 'nested': [1, {}]},
+            {'start_time': 12345678901234567890, 'ratio': 1.5e3},
+            {'message': u'quote \\" slash \\\\ {[ ]}', 'list': [['a']]},
+            u'"string" {item}',
+        ],
+        'next': 'marker',
+    }
+
+    def test_every_chunk_boundary(self):
+        content = json.dumps(self.body, indent=1).encode('utf-8')
+        for size in (1, 2, 3, 7, 64, len(content)):
+            stream = jsonstream.JsonArrayStream(chunked(content, size),
+                                                'logs')
+            self.assertEqual(self.body['logs'], list(stream))
+            self.assertEqual({'total': 3, 'next': 'marker'}, stream.meta)
+
+    def test_meta_before_array_is_read_first(self):
+        content = json.dumps({'total': 2, 'ddosStatus': [{}, {}]})
+        stream = jsonstream.JsonArrayStream(chunked(content, 4),
+                                            'ddosStatus')
+        rows = iter(stream)
+        self.assertEqual({}, next(rows))
+        self.assertEqual({'total': 2}, stream.meta)
+
+    def test_nested_key(self):
+        content = json.dumps({'a': 1, 'data': {'b': 2, 'items': [1, 2, 3],
+                                               'c': 3}, 'd': 4})
+        stream = jsonstream.JsonArrayStream(chunked(content, 5),
+                                            'data.items')
+        self.assertEqual([1, 2, 3], list(stream))
+        self.assertEqual({'a': 1, 'b': 2, 'c': 3, 'd': 4}, stream.meta)
+
+    def test_top_level_array(self):
+        stream = jsonstream.JsonArrayStream([b'[1, ', b'22', b'3]'])
+        self.assertEqual([1, 223], list(stream))
+
+    def test_key_not_found_or_empty(self):
+        for content in ('{}', '{"total": 0}', '{"logs": []}',
+                        '{"logs": null, "total": 0}'):
+            stream = jsonstream.JsonArrayStream([content], 'logs')
+            self.assertEqual([], list(stream))
+
+    def test_invalid_body(self):
+        for content in ('', '[]', '{"logs": [1 2]}', '{"logs": [1,'):
+            stream = jsonstream.JsonArrayStream([content], 'logs')
+            self.assertRaises(ValueError, list, stream)
+
+    def test_consumed_buffer_is_dropped(self):
+        rows = [{'floating_ip_id': 'x' * 100} for _ in range(5000)]
+        content = json.dumps({'ddosStatus': rows}).encode('utf-8')
+        stream = jsonstream.JsonArrayStream(chunked(content, 4096),
+                                            'ddosStatus')
+        count = 0
+        for _ in stream:
+            count += 1
+            self.assertLess(len(stream._buffer),
+                            jsonstream._COMPACT_THRESHOLD + 8192)
+        self.assertEqual(5000, count)
+
+    def test_big_value_is_decoded_once(self):
+        rows = [{'logs': [{'floating_ip_id': 'x' * 100}] * 2000}]
+        content = json.dumps({'data': rows}).encode('utf-8')
+        stream = jsonstream.JsonArrayStream(chunked(content, 1024), 'data')
+        decoder = stream._json
+        with mock.patch.object(stream, '_json') as mocked_json:
+            mocked_json.raw_decode.side_effect = decoder.raw_decode
+            self.assertEqual(rows, list(stream))
+        # key, a failed decode of the split value and the final decode
+        self.assertEqual(3, mocked_json.raw_decode.call_count)
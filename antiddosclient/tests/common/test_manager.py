@@ -13,7 +13,10 @@
 #   under the License.
 #
 
+from keystoneauth1 import exceptions
+from keystoneauth1 import session
 import mock
+import requests_mock
 import six
 
 from antiddosclient.common import httpclient
@@ -201,3 +204,108 @@ class TestManager(base.BaseTestCase):
             self.assertIsInstance(byte_mixin, resource.StrWithMeta)
         elif six.PY3:
             self.assertIsInstance(byte_mixin, resource.BytesWithMeta)
+
+    def test_iter_pages(self):
+        fetched = []
+
+        def fetch_page(limit, offset):
+            fetched.append((limit, offset))
+            return list(range(offset, min(offset + limit, 25)))
+
+        items = list(self.manager._iter_pages(fetch_page, page_size=10,
+                                              window=2))
+        self.assertEqual(list(range(25)), items)
+        self.assertEqual([(10, 0), (10, 10), (10, 20)], fetched[:3])
+
+    def test_iter_pages_with_offset_and_no_prefetch(self):
+        fetched = []
+
+        def fetch_page(limit, offset):
+            fetched.append((limit, offset))
+            return list(range(offset, offset + limit))
+
+        iterator = self.manager._iter_pages(fetch_page, page_size=5,
+                                            window=0, offset=5)
+        self.assertEqual(list(range(5, 12)),
+                         [next(iterator) for _ in range(7)])
+        iterator.close()
+        # page is only fetched when previous page is consumed
+        self.assertEqual([(5, 5), (5, 10)], fetched)
+
+    def test_list_from_body_is_lazy(self):
+        body = {"resources": [self.instance, None, dict(uuid='2', name='b')]}
+        with mock.patch.object(fakes.FakeResource, '__init__',
+                               return_value=None) as mocked_init:
+            result = self.manager._list_from_body(fakes.create_response(),
+                                                  body, key='resources')
+            self.assertIsInstance(result, resource.LazyListWithMeta)
+            # empty row is dropped
+            self.assertEqual(2, len(result))
+            self.assertEqual(1, len(result.filter_by(name='b')))
+            mocked_init.assert_not_called()
+
+            result[1]
+            mocked_init.assert_called_once_with(
+                self.manager, dict(uuid='2', name='b'), attached=True,
+                resp=fakes.FAKE_REQUEST_ID
+            )
+
+    def test_stream(self):
+        manager = fakes.FakeManager(
+            httpclient.OpenStackHttpClient(session.Session())
+        )
+        url = 'http://antiddos.endpoint/resources'
+        content = '{"total": 2, "resources": [{"uuid": "1"}, {"uuid": "2"}]}'
+        with requests_mock.Mocker() as m:
+            m.get(url, text=content,
+                  headers={'x-openstack-request-id': fakes.FAKE_REQUEST_ID})
+            result = manager._stream(url, params={'limit': 2},
+                                     key='resources')
+            self.assertIsInstance(result, resource.StreamWithMeta)
+            self.assertEqual(fakes.FAKE_REQUEST_ID, result.request_id)
+            rows = list(result)
+
+        self.assertEqual(['1', '2'], [row.uuid for row in rows])
+        self.assertIsInstance(rows[0], fakes.FakeResource)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, rows[0].request_id)
+        self.assertEqual({'total': 2}, result.meta)
+        self.assertEqual('limit=2', m.last_request.query)
+        # response is released once iteration finished
+        self.assertIsNone(result._response)
+
+    def test_hydrate(self):
+        resources = [
+            fakes.FakeResource(self.manager, dict(uuid=str(i)))
+            for i in range(5)
+        ]
+        resources[0].set_attached(True)
+
+        def get(uuid):
+            if uuid == '4':
+                raise exceptions.NotFound()
+            return fakes.FakeResource(None, dict(uuid=uuid, name=uuid * 2))
+
+        with mock.patch.object(fakes.FakeManager, 'get',
+                               side_effect=get) as mocked_get:
+            # attached and duplicated resources are not fetched again
+            self.assertEqual(4, self.manager.hydrate(resources + resources,
+                                                     concurrency=2))
+            self.assertEqual(4, mocked_get.call_count)
+            self.assertEqual('22', resources[2].name)
+            self.assertTrue(all(r.has_attached() for r in resources))
+            # not found detail is cached as missing
+            self.assertRaises(AttributeError, getattr, resources[4], 'name')
+            self.assertEqual(0, self.manager.hydrate(resources))
+            self.assertEqual(4, mocked_get.call_count)
+
+            self.assertEqual(1, self.manager.hydrate(resources[1:2],
+                                                     force=True))
+            self.assertEqual(5, mocked_get.call_count)
+
+    def test_hydrate_raises_error(self):
+        resources = [fakes.FakeResource(self.manager, dict(uuid='1'))]
+        with mock.patch.object(fakes.FakeManager, 'get',
+                               side_effect=exceptions.ServiceUnavailable()):
+            self.assertRaises(exceptions.ServiceUnavailable,
+                              self.manager.hydrate, resources)
+        self.assertFalse(resources[0].has_attached())
@@ -0,0 +1,100 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+from six.moves.urllib import request
+
+from antiddosclient.common import metrics
+from antiddosclient.tests import base
+
+
+class TestHttpMetrics(base.BaseTestCase):
+
+    def test_normalize_route(self):
+        self.assertEqual(
+            '/antiddos/{id}/daily',
+            metrics.normalize_route(
+                '/antiddos/11427e0f-dc37-4319-a0e2-390e560fe116/daily'
+                '?period_start_date=1'
+            )
+        )
+        self.assertEqual('/antiddos/{id}',
+                         metrics.normalize_route('/antiddos/160.44.197.150'))
+        self.assertEqual('/v1/{id}/antiddos/query_task_status',
+                         metrics.normalize_route(
+                             'https://host/v1/0123456789abcdef0123456789abcd'
+                             'ef/antiddos/query_task_status?task_id=x'))
+        self.assertEqual('/', metrics.normalize_route(None))
+
+    def test_histogram(self):
+        histogram = metrics.LatencyHistogram(buckets=(0.1, 1))
+        for seconds in (0.05, 0.05, 0.5, 3):
+            histogram.observe(seconds)
+        self.assertEqual([(0.1, 2), (1, 3), (float('inf'), 4)],
+                         histogram.cumulative())
+        self.assertEqual(0.1, histogram.percentile(50))
+        self.assertEqual(3, histogram.percentile(99))
+        self.assertEqual(0.05, histogram.min)
+        self.assertEqual(3, histogram.max)
+        self.assertIsNone(metrics.LatencyHistogram().percentile(50))
+
+    def test_snapshot(self):
+        collector = metrics.HttpMetrics()
+        collector.record('get', '/antiddos/1/daily', 200, 0.2,
+                         server_seconds=0.1, bytes_in=100)
+        collector.record('GET', '/antiddos/2/daily', 503, 0.4)
+        collector.record('GET', '/antiddos/2/daily', None, 1.0)
+        collector.record_retry('GET', '/antiddos/2/daily')
+        collector.record('POST', '/antiddos/1', 200, 0.3, bytes_out=20)
+
+        snapshot = collector.snapshot()
+        self.assertEqual(['GET /antiddos/{id}/daily', 'POST /antiddos/{id}'],
+                         sorted(snapshot))
+        daily = snapshot['GET /antiddos/{id}/daily']
+        self.assertEqual(3, daily['requests'])
+        self.assertEqual({200: 1, 503: 1}, daily['status_codes'])
+        self.assertEqual(1, daily['errors'])
+        self.assertEqual(1, daily['retries'])
+        self.assertEqual(100, daily['bytes_in'])
+        self.assertAlmostEqual(0.1, daily['server_seconds'])
+        self.assertAlmostEqual(1.6, daily['latency']['sum'])
+        self.assertEqual(20, snapshot['POST /antiddos/{id}']['bytes_out'])
+
+        collector.reset()
+        self.assertEqual({}, collector.snapshot())
+
+    def test_to_prometheus(self):
+        collector = metrics.HttpMetrics(buckets=(0.5,))
+        collector.record('GET', '/antiddos', 200, 0.2, bytes_in=10)
+        text = collector.to_prometheus()
+        labels = 'method="GET",route="/antiddos"'
+        self.assertIn('# TYPE antiddosclient_http_request_duration_seconds '
+                      'histogram', text)
+        self.assertIn('antiddosclient_http_request_duration_seconds_bucket'
+                      '{%s,le="0.5"} 1' % labels, text)
+        self.assertIn('antiddosclient_http_request_duration_seconds_bucket'
+                      '{%s,le="+Inf"} 1' % labels, text)
+        self.assertIn('antiddosclient_http_responses_total'
+                      '{%s,code="200"} 1' % labels, text)
+        self.assertIn('antiddosclient_http_received_bytes_total'
+                      '{%s} 10' % labels, text)
+
+    def test_serve_prometheus(self):
+        collector = metrics.HttpMetrics()
+        collector.record('GET', '/antiddos', 200, 0.2)
+        server = metrics.serve_prometheus(collector, 0, '127.0.0.1')
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = 'http://127.0.0.1:%d/metrics' % server.server_address[1]
+        content = request.urlopen(url).read().decode('utf-8')
+        self.assertEqual(collector.to_prometheus(), content)
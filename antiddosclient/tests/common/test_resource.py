@@ -12,6 +12,9 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
+import copy
+import pickle
+
 import six
 from mock import mock
 
@@ -24,6 +27,23 @@ class SampleResource(resource.Resource):
     pass
 
 
+class SampleCompactResource(resource.CompactResource):
+    __slots__ = ()
+
+    fields = ('id', 'status', 'name')
+    interned_fields = ('status',)
+
+    @property
+    def display_name(self):
+        return self.name.upper()
+
+
+class DetailedCompactResource(SampleCompactResource):
+    __slots__ = ()
+
+    detail_fields = ('size', 'owner')
+
+
 class TestResource(base.BaseTestCase):
     def test_resource_repr(self):
         r = SampleResource(None, dict(foo='bar', baz='spam'))
@@ -57,6 +77,20 @@ class TestResource(base.BaseTestCase):
         # Missing stuff still fails after a second get
         self.assertRaises(AttributeError, getattr, r, 'abc')
 
+    def test_merge(self):
+        fake_manager = mock.Mock()
+        r = SampleResource(fake_manager, dict(uuid='1', foo='bar'))
+        self.assertIs(r, r.merge(dict(foo='baz', name='fake_name')))
+        self.assertTrue(r.has_attached())
+        self.assertEqual('baz', r.foo)
+        self.assertEqual(dict(uuid='1', foo='baz', name='fake_name'),
+                         r.original)
+
+        # attribute missing after merge never triggers a get
+        r = SampleResource(fake_manager, dict(uuid='1')).merge(None)
+        self.assertRaises(AttributeError, getattr, r, 'name')
+        fake_manager.get.assert_not_called()
+
     def test_eq(self):
         # Two resources of the same type with the same id: not equal
         r1 = SampleResource(None, {'id': 1, 'name': 'hi'})
@@ -84,6 +118,83 @@ class TestResource(base.BaseTestCase):
         self.assertEqual(fakes.FAKE_REQUEST_ID, r.request_id)
 
 
+class TestCompactResource(base.BaseTestCase):
+    def test_attribute_access(self):
+        r = SampleCompactResource(None, dict(id=1, name='foo', extra='bar'))
+        self.assertEqual(1, r.id)
+        self.assertEqual('foo', r.name)
+        self.assertEqual('FOO', r.display_name)
+        self.assertEqual('bar', r.extra)
+        # field not returned by server
+        self.assertFalse(hasattr(r, 'status'))
+        self.assertRaises(AttributeError, getattr, r, 'abc')
+        self.assertFalse(hasattr(r, '__dict__'))
+        self.assertTrue(r.has_attached())
+
+    def test_set_attribute(self):
+        r = SampleCompactResource(None, dict(id=1))
+        r.status = 'normal'
+        r.other = 'value'
+        self.assertEqual('normal', r.status)
+        self.assertEqual('value', r.other)
+        self.assertEqual(dict(id=1, status='normal', other='value'),
+                         r.original)
+
+    def test_original_and_repr(self):
+        instance = dict(id=1, name='foo', status='normal', extra='bar')
+        r = SampleCompactResource(None, instance)
+        self.assertEqual(instance, r.original)
+        self.assertIsNot(instance, r.original)
+        self.assertEqual(
+            '<SampleCompactResource extra=bar, id=1, name=foo, '
+            'status=normal>', repr(r)
+        )
+
+    def test_interned_fields(self):
+        r1 = SampleCompactResource(None, dict(status=''.join(['nor', 'mal'])))
+        r2 = SampleCompactResource(None, dict(status=''.join(['norm', 'al'])))
+        self.assertIs(r1.status, r2.status)
+
+    def test_eq_and_pickle(self):
+        r1 = SampleCompactResource(None, dict(id=1, name='foo'),
+                                   resp=fakes.create_response())
+        r2 = SampleCompactResource(None, dict(id=1, name='foo'))
+        self.assertEqual(r1, r2)
+        self.assertNotEqual(r1, SampleResource(None, dict(id=1, name='foo')))
+        self.assertNotEqual(r1, SampleCompactResource(None, dict(id=2)))
+
+        copied = pickle.loads(pickle.dumps(r1))
+        self.assertEqual(r1, copied)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, copied.request_id)
+        self.assertEqual(r1, copy.copy(r1))
+
+    def test_merge(self):
+        r = DetailedCompactResource(None, dict(id=1, status='normal'))
+        self.assertFalse(r.has_attached())
+        self.assertIs(r, r.merge(dict(size=3, status='error')))
+        self.assertTrue(r.has_attached())
+        self.assertEqual(3, r.size)
+        self.assertEqual('error', r.status)
+        # detail field not in detail is remembered as missing
+        self.assertFalse(hasattr(r, 'owner'))
+        self.assertEqual(dict(id=1, status='error', size=3), r.original)
+        self.assertNotIn('owner', repr(r))
+
+        r = DetailedCompactResource(None, dict(id=1)).merge(None)
+        self.assertTrue(r.has_attached())
+        self.assertFalse(hasattr(r, 'size'))
+        self.assertEqual(dict(id=1), r.original)
+
+        # detail returned by server
+        r = DetailedCompactResource(None, dict(id=1, size=3, owner='me'))
+        self.assertTrue(r.has_attached())
+
+    def test_request_id(self):
+        r = SampleCompactResource(None, {'name': '1'},
+                                  resp=fakes.create_response())
+        self.assertEqual(fakes.FAKE_REQUEST_ID, r.request_id)
+
+
 class ListWithMetaTest(base.BaseTestCase):
     def test_list_with_meta(self):
         resp = fakes.create_response()
@@ -94,6 +205,74 @@ class ListWithMetaTest(base.BaseTestCase):
         self.assertEqual(fakes.FAKE_REQUEST_ID, obj.request_id)
 
 
+class LazyListWithMetaTest(base.BaseTestCase):
+    def setUp(self):
+        super(LazyListWithMetaTest, self).setUp()
+        self.rows = [dict(id=i, status='normal' if i % 2 else 'notConfig')
+                     for i in range(6)]
+        self.factory = mock.Mock(
+            side_effect=lambda row: SampleCompactResource(None, row)
+        )
+        self.obj = resource.LazyListWithMeta(list(self.rows),
+                                             fakes.create_response(),
+                                             self.factory)
+
+    def test_materialize_on_access(self):
+        self.assertEqual(fakes.FAKE_REQUEST_ID, self.obj.request_id)
+        self.assertIsInstance(self.obj, resource.ListWithMeta)
+        self.assertEqual(6, len(self.obj))
+        self.factory.assert_not_called()
+
+        self.assertEqual(2, self.obj[2].id)
+        self.assertEqual(5, self.obj[-1].id)
+        # resource is built once
+        self.assertIs(self.obj[2], self.obj[2])
+        self.assertEqual(2, self.factory.call_count)
+
+    def test_slice_does_not_materialize(self):
+        sliced = self.obj[1:5:2]
+        self.assertIsInstance(sliced, resource.LazyListWithMeta)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, sliced.request_id)
+        self.factory.assert_not_called()
+        self.assertEqual([1, 3], [item.id for item in sliced])
+        self.assertEqual(2, self.factory.call_count)
+
+    def test_iteration(self):
+        self.assertEqual(list(range(6)), [item.id for item in self.obj])
+        self.assertEqual(list(range(5, -1, -1)),
+                         [item.id for item in reversed(self.obj)])
+        self.assertEqual(6, self.factory.call_count)
+        expected = [SampleCompactResource(None, row) for row in self.rows]
+        self.assertEqual(expected, self.obj)
+        self.assertIn(expected[3], self.obj)
+        self.assertEqual(3, self.obj.index(expected[3]))
+
+    def test_concatenation_builds_resources(self):
+        expected = [SampleCompactResource(None, row) for row in self.rows]
+        for result in ([] + self.obj, self.obj + [], self.obj * 1,
+                       1 * self.obj):
+            self.assertEqual(expected, result)
+            self.assertEqual([SampleCompactResource] * 6,
+                             [type(item) for item in result])
+        self.assertEqual(6, self.factory.call_count)
+
+    def test_filter_by(self):
+        self.obj[1]
+        matched = self.obj.filter_by(status='normal')
+        self.assertEqual(3, len(matched))
+        self.assertIsInstance(matched, resource.LazyListWithMeta)
+        # only the row accessed before is built
+        self.assertEqual(1, self.factory.call_count)
+        self.assertEqual([1, 3, 5], [item.id for item in matched])
+        self.assertEqual(self.rows, list(self.obj.rows()))
+
+    def test_pickle(self):
+        copied = pickle.loads(pickle.dumps(self.obj))
+        self.assertIsInstance(copied, resource.ListWithMeta)
+        self.assertEqual(self.obj, copied)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, copied.request_id)
+
+
 class DictWithMetaTest(base.BaseTestCase):
     def test_dict_with_meta(self):
         resp = fakes.create_response()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import email.utils
+import time
+
+import mock
+from keystoneauth1 import exceptions
+
+from antiddosclient.common import retry
+from antiddosclient.tests import base
+
+
+def fake_http_error(status_code, retry_after=None):
+    resp = mock.Mock()
+    resp.status_code = status_code
+    resp.headers = {'Content-Type': 'text/plain'}
+    if retry_after is not None:
+        resp.headers['retry-after'] = retry_after
+    resp.text = 'error'
+    return exceptions.from_response(resp, 'GET', '/url')
+
+
+class TestRetryPolicy(base.BaseTestCase):
+
+    def test_parse_retry_after(self):
+        self.assertEqual(3.0, retry.parse_retry_after('3'))
+        self.assertEqual(0.0, retry.parse_retry_after('-1'))
+        self.assertIsNone(retry.parse_retry_after(None))
+        self.assertIsNone(retry.parse_retry_after('soon'))
+        date = email.utils.formatdate(time.time() + 30, usegmt=True)
+        self.assertAlmostEqual(30, retry.parse_retry_after(date), delta=2)
+
+    def test_retryable_method(self):
+        policy = retry.RetryPolicy()
+        self.assertTrue(policy.is_retryable_method('GET'))
+        self.assertTrue(policy.is_retryable_method('put'))
+        self.assertTrue(policy.is_retryable_method('DELETE'))
+        self.assertFalse(policy.is_retryable_method('POST'))
+        self.assertFalse(policy.is_retryable_method(None))
+        self.assertTrue(policy.is_retryable_method('POST', retry=True))
+        self.assertFalse(policy.is_retryable_method('GET', retry=False))
+        policy = retry.RetryPolicy(retry_post=True)
+        self.assertTrue(policy.is_retryable_method('POST'))
+
+    def test_retryable_error(self):
+        policy = retry.RetryPolicy()
+        self.assertTrue(policy.is_retryable_error(fake_http_error(429)))
+        self.assertTrue(policy.is_retryable_error(fake_http_error(503)))
+        self.assertFalse(policy.is_retryable_error(fake_http_error(400)))
+        self.assertFalse(policy.is_retryable_error(fake_http_error(404)))
+        self.assertTrue(policy.is_retryable_error(
+            exceptions.ConnectFailure()
+        ))
+        self.assertFalse(policy.is_retryable_error(ValueError()))
+
+    def test_backoff_delay(self):
+        policy = retry.RetryPolicy(initial_delay=1, max_delay=5, backoff=2,
+                                   jitter=0)
+        self.assertEqual([1, 2, 4, 5],
+                         [policy.get_delay(i) for i in range(1, 5)])
+
+        policy = retry.RetryPolicy(initial_delay=1, jitter=0.5)
+        for _ in range(20):
+            self.assertTrue(0.5 <= policy.get_delay(1) <= 1.5)
+
+    def test_retry_after_delay(self):
+        policy = retry.RetryPolicy(initial_delay=1, max_delay=10)
+        self.assertEqual(7, policy.get_delay(1, fake_http_error(429, '7')))
+        self.assertEqual(10, policy.get_delay(1, fake_http_error(429, '60')))
+
+    def test_allows_delay(self):
+        policy = retry.RetryPolicy(max_total_delay=10)
+        self.assertTrue(policy.allows_delay(4, 6))
+        self.assertFalse(policy.allows_delay(5, 6))
+        policy = retry.RetryPolicy(max_total_delay=None)
+        self.assertTrue(policy.allows_delay(3600, 60))
+
+
+class TestRateLimiter(base.BaseTestCase):
+
+    def test_invalid_rate(self):
+        self.assertRaises(ValueError, retry.RateLimiter, 0)
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(retry, '_clock')
+    def test_acquire(self, clock, sleep):
+        clock.return_value = 100.0
+        limiter = retry.RateLimiter(2, burst=2)
+        # burst is granted at once
+        self.assertEqual(0, limiter.acquire())
+        self.assertEqual(0, limiter.acquire())
+        # then requests wait for refill
+        self.assertEqual(0.5, limiter.acquire())
+        self.assertEqual(1.0, limiter.acquire())
+        sleep.assert_has_calls([mock.call(0.5), mock.call(1.0)])
+
+        clock.return_value = 110.0
+        self.assertEqual(0, limiter.acquire())
+
+    @mock.patch('time.sleep')
+    @mock.patch.object(retry, '_clock')
+    def test_pause(self, clock, sleep):
+        clock.return_value = 100.0
+        limiter = retry.RateLimiter(10)
+        limiter.pause(3)
+        self.assertEqual(3, limiter.acquire())
+        clock.return_value = 103.0
+        self.assertEqual(0, limiter.acquire())
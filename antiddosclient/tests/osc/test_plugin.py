@@ -29,10 +29,9 @@ class TestAntiDDosPlugin(base.BaseTestCase):
         instance._api_version = {plugin.API_NAME: plugin.DEFAULT_API_VERSION}
         instance.session = mock.Mock()
         instance._cli_options = mock.Mock()
-        instance._cli_options.config = mock.Mock()
-        instance._cli_options.config.get.return_value = (
-            "http://antiddos.endpoint"
-        )
+        instance._cli_options.config = {
+            'antiddos_endpoint_override': "http://antiddos.endpoint"
+        }
         instance.region_name = fakes.REGION_NAME
         instance.interface = fakes.INTERFACE
         plugin.make_client(instance)
@@ -42,6 +41,51 @@ class TestAntiDDosPlugin(base.BaseTestCase):
             "http://antiddos.endpoint"
         )
 
+    @mock.patch('antiddosclient.v1.client.Client')
+    def test_make_client_with_cache(self, client):
+        instance = mock.Mock()
+        instance._api_version = {plugin.API_NAME: plugin.DEFAULT_API_VERSION}
+        instance._cli_options.config = {
+            'antiddos_cache_dir': "/tmp/antiddos-cache"
+        }
+        plugin.make_client(instance)
+
+        args, kwargs = client.call_args
+        self.assertEqual((instance.session, None), args)
+        self.assertEqual("/tmp/antiddos-cache", kwargs['cache'].directory)
+
+    @mock.patch('antiddosclient.v1.client.Client')
+    def test_make_client_with_pool_options(self, client):
+        instance = mock.Mock()
+        instance._api_version = {plugin.API_NAME: plugin.DEFAULT_API_VERSION}
+        instance._cli_options.config = {
+            'antiddos_pool_size': 50,
+            'antiddos_pool_size_per_host': 20,
+            'antiddos_pool_block': True,
+            'antiddos_no_keep_alive': True,
+        }
+        plugin.make_client(instance)
+        client.assert_called_once_with(instance.session, None,
+                                       pool_size=50,
+                                       pool_size_per_host=20,
+                                       pool_block=True,
+                                       keep_alive=False)
+
+    @mock.patch('antiddosclient.v1.client.Client')
+    def test_make_client_with_retry_options(self, client):
+        instance = mock.Mock()
+        instance._api_version = {plugin.API_NAME: plugin.DEFAULT_API_VERSION}
+        instance._cli_options.config = {
+            'antiddos_max_retries': 5,
+            'antiddos_retry_post': True,
+            'antiddos_rate_limit': 10.0,
+        }
+        plugin.make_client(instance)
+        kwargs = client.call_args[1]
+        self.assertEqual(5, kwargs['retry_policy'].max_retries)
+        self.assertTrue(kwargs['retry_policy'].retry_post)
+        self.assertEqual(10.0, kwargs['rate_limiter'].rate)
+
     def test_plugin_parser(self):
         parser = argparse.ArgumentParser(description='TestUnit')
         plugin.build_option_parser(parser)
@@ -49,7 +93,22 @@ class TestAntiDDosPlugin(base.BaseTestCase):
         parsed = parser.parse_args(['--os-antiddos-api-version',
                                     '1',
                                     '--os-antiddos-endpoint-override',
-                                    'http://antiddos.endpoint'])
+                                    'http://antiddos.endpoint',
+                                    '--os-antiddos-cache-dir',
+                                    '/tmp/antiddos-cache',
+                                    '--os-antiddos-pool-size',
+                                    '50',
+                                    '--os-antiddos-pool-block',
+                                    '--os-antiddos-max-retries',
+                                    '3'])
         self.assertEqual(parsed.os_antiddos_api_version, "1")
         self.assertEqual(parsed.os_antiddos_endpoint_override,
                          'http://antiddos.endpoint')
+        self.assertEqual(parsed.os_antiddos_cache_dir, '/tmp/antiddos-cache')
+        self.assertEqual(parsed.os_antiddos_pool_size, 50)
+        self.assertIsNone(parsed.os_antiddos_pool_size_per_host)
+        self.assertTrue(parsed.os_antiddos_pool_block)
+        self.assertFalse(parsed.os_antiddos_no_keep_alive)
+        self.assertEqual(parsed.os_antiddos_max_retries, 3)
+        self.assertFalse(parsed.os_antiddos_retry_post)
+        self.assertIsNone(parsed.os_antiddos_rate_limit)
@@ -12,18 +12,26 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
+import argparse
+import io
+import json
+import os
 import random
 import uuid
 
 import datetime
+import fixtures
 import mock
+import six
 from antiddosclient.common import exceptions
 from antiddosclient.common import resource as base_resource
 from antiddosclient.osc.v1 import antiddos
 from antiddosclient.tests import base
 from antiddosclient.v1 import antiddos_mgr
+from antiddosclient.v1 import fleet_report
 from antiddosclient.v1 import resource
 from keystoneauth1 import exceptions as execs
+from osc_lib.tests import utils
 
 
 class TestAntiDDos(base.AntiDDosV1BaseTestCase):
@@ -423,6 +431,161 @@ class TestAntiDDosSet(TestAntiDDos):
             self.assertEqual(result, "Request Received, task id: %s" % task_id)
 
 
+@mock.patch.object(antiddos_mgr.AntiDDosManager, "_create")
+class TestAntiDDosFromFile(TestAntiDDos):
+    def setUp(self):
+        super(TestAntiDDosFromFile, self).setUp()
+        self.cmd = antiddos.OpenAntiDDos(self.app, None)
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'targets.csv')
+
+    def write_targets(self, content):
+        with open(self.path, 'w') as f:
+            f.write(content)
+
+    def test_open_from_file(self, mocked_create):
+        uuids = [instance["floating_ip_id"] for instance in self.instances]
+        self.write_targets('# bulk change\n'
+                           '%s\n'
+                           '%s,100,,false\n'
+                           '%s,30,1000\n' % tuple(uuids[:3]))
+
+        def _create(url, data=None, raw=False):
+            if url.endswith(uuids[2]):
+                raise execs.BadRequest('already opened')
+            return self.get_fake_task_response('task-' + url[-4:])
+
+        mocked_create.side_effect = _create
+        parsed_args = self.check_parser(
+            self.cmd, ["--from-file", self.path, "--concurrency", "2",
+                       "--maximum-service-traffic", "70",
+                       "--http-request-rate", "240"],
+            [("from_file", self.path), ("concurrency", 2),
+             ("floating_ip", None)]
+        )
+        columns, data = self.cmd._take_bulk_action(parsed_args)
+
+        self.assertEqual(antiddos.BulkCommand.summary_column_names, columns)
+        self.assertEqual([
+            (uuids[0], uuids[0], 'task-' + uuids[0][-4:], 'Request Received'),
+            (uuids[1], uuids[1], 'task-' + uuids[1][-4:], 'Request Received'),
+            (uuids[2], uuids[2], '', 'Failed: already opened (HTTP 400)'),
+        ], data)
+        self.assertEqual(1, self.cmd.failed)
+        mocked_create.assert_any_call("/antiddos/" + uuids[0], data={
+            "enable_L7": True,
+            "traffic_pos_id": 4,
+            "http_request_pos_id": 3,
+            "cleaning_access_pos_id": 8,
+            "app_type_id": 1
+        }, raw=True)
+        mocked_create.assert_any_call("/antiddos/" + uuids[1], data={
+            "enable_L7": False,
+            "traffic_pos_id": 5,
+            "http_request_pos_id": 15,
+            "cleaning_access_pos_id": 8,
+            "app_type_id": 1
+        }, raw=True)
+
+    def test_invalid_row_is_rejected_before_requests(self, mocked_create):
+        self.write_targets('floating_ip,http_request_rate,enable_cc\n'
+                           'fake-id-1,,true\n'
+                           'fake-id-2,240,false\n')
+        parsed_args = self.check_parser(
+            self.cmd, ["--from-file", self.path,
+                       "--maximum-service-traffic", "70",
+                       "--http-request-rate", "240"], []
+        )
+        e = self.assertRaises(argparse.ArgumentTypeError,
+                              self.cmd.take_action, parsed_args)
+        self.assertIn('line 3', str(e))
+        self.assertFalse(mocked_create.called)
+
+    def test_floating_ip_and_from_file_are_exclusive(self, mocked_create):
+        self.write_targets('fake-id-1\n')
+        parsed_args = self.check_parser(
+            self.cmd, ["--from-file", self.path, "fake-id-2",
+                       "--maximum-service-traffic", "70",
+                       "--http-request-rate", "240"], []
+        )
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action, parsed_args)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_delete")
+    def test_close_from_file(self, mocked_delete, mocked_create):
+        self.cmd = antiddos.CloseAntiDDos(self.app, None)
+        self.write_targets('fake-id-1\n')
+        mocked_delete.return_value = self.get_fake_task_response('task-1')
+        parsed_args = self.check_parser(self.cmd,
+                                        ["--from-file", self.path], [])
+        columns, data = self.cmd._take_bulk_action(parsed_args)
+        self.assertEqual([('fake-id-1', 'fake-id-1', 'task-1',
+                           'Request Received')], data)
+        self.assertEqual(0, self.cmd.failed)
+        mocked_delete.assert_called_once_with("/antiddos/fake-id-1")
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_delete")
+    def test_close_from_file_rejects_settings(self, mocked_delete,
+                                              mocked_create):
+        self.cmd = antiddos.CloseAntiDDos(self.app, None)
+        self.write_targets('fake-id-1,10\n')
+        parsed_args = self.check_parser(self.cmd,
+                                        ["--from-file", self.path], [])
+        e = self.assertRaises(argparse.ArgumentTypeError,
+                              self.cmd.take_action, parsed_args)
+        self.assertIn('line 1: expect at most 1 columns', str(e))
+        self.assertFalse(mocked_delete.called)
+
+    def test_from_file_prints_summary(self, mocked_create):
+        self.write_targets('fake-id-1\n')
+        mocked_create.side_effect = execs.BadRequest('already opened')
+        self.app.stdout = mock.Mock()
+        parsed_args = self.check_parser(
+            self.cmd, ["--from-file", self.path,
+                       "--maximum-service-traffic", "70",
+                       "--http-request-rate", "240"], []
+        )
+        self.assertEqual(1, self.cmd.run(parsed_args))
+        output = ''.join(c[0][0]
+                         for c in self.app.stdout.write.call_args_list)
+        self.assertIn('Failed: already opened', output)
+
+    def test_from_file_summary_with_format(self, mocked_create):
+        self.write_targets('fake-id-1\n')
+        mocked_create.return_value = self.get_fake_task_response('task-1')
+        self.app.stdout = six.StringIO()
+        parsed_args = self.check_parser(
+            self.cmd, ["--from-file", self.path,
+                       "--maximum-service-traffic", "70",
+                       "--http-request-rate", "240",
+                       "-f", "json", "-c", "Result"],
+            [("formatter", "json"), ("columns", ["Result"])]
+        )
+        self.assertEqual(0, self.cmd.run(parsed_args))
+        self.assertEqual([{'Result': 'Request Received'}],
+                         json.loads(self.app.stdout.getvalue()))
+
+    def test_single_floating_ip_has_no_format_options(self, mocked_create):
+        parsed_args = self.check_parser(
+            self.cmd, ["fake-id-1", "--maximum-service-traffic", "70",
+                       "--http-request-rate", "240", "-f", "json"], []
+        )
+        e = self.assertRaises(argparse.ArgumentTypeError,
+                              self.cmd.take_action, parsed_args)
+        self.assertIn('--from-file', str(e))
+        self.assertFalse(mocked_create.called)
+
+    def test_single_floating_ip_returns_message(self, mocked_create):
+        parsed_args = self.check_parser(
+            self.cmd, ["fake-id-1", "--maximum-service-traffic", "70",
+                       "--http-request-rate", "240"], []
+        )
+        mocked_create.return_value = self.get_fake_task_response('task-1')
+        with self.mocked_find:
+            self.assertEqual('Request Received, task id: task-1',
+                             self.cmd.run(parsed_args))
+
+
 @mock.patch.object(antiddos_mgr.AntiDDosManager, "_get")
 class TestAntiDDosTaskShow(TestAntiDDos):
     def setUp(self):
@@ -488,6 +651,63 @@ class TestAntiDDosStatusList(TestAntiDDos):
         self.assertEqual(list(data), expect_data)
 
 
+    def test_list_antiddos_status_with_all_pages(self, mocked_list):
+        args = ["--status", "normal", "--all", "--page-size", "2"]
+        verify_args = (
+            ("status", "normal"),
+            ("all_pages", True),
+            ("page_size", 2),
+        )
+        parsed_args = self.check_parser(self.cmd, args, verify_args)
+        mocked_list.side_effect = [self.get_fake_antiddos_list(2),
+                                   self.get_fake_antiddos_list(1),
+                                   self.get_fake_antiddos_list(0)]
+        columns, data = self.cmd.take_action(parsed_args)
+        self.assertEqual(columns, resource.AntiDDos.list_column_names)
+        self.assertEqual(3, len(list(data)))
+        mocked_list.assert_any_call(
+            "/antiddos", params=dict(status="normal", limit=2, offset=2),
+            key='ddosStatus'
+        )
+
+    def test_list_antiddos_status_all_pages_with_limit(self, mocked_list):
+        args = ["--all", "--limit", "2"]
+        verify_args = (("all_pages", True), ("limit", 2))
+        parsed_args = self.check_parser(self.cmd, args, verify_args)
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action,
+                          parsed_args)
+
+    def test_list_antiddos_status_stream(self, mocked_list):
+        args = ["-f", "value", "--stream", "--page-size", "2",
+                "--prefetch", "0"]
+        verify_args = (("stream", True), ("page_size", 2), ("prefetch", 0))
+        parsed_args = self.check_parser(self.cmd, args, verify_args)
+        mocked_list.side_effect = [self.get_fake_antiddos_list(2),
+                                   self.get_fake_antiddos_list(1)]
+        self.app.stdout = mock.Mock()
+        columns, data = self.cmd.take_action(parsed_args)
+        self.assertEqual(columns, resource.AntiDDos.list_column_names)
+        # nothing is fetched before rows are read
+        self.assertEqual(0, mocked_list.call_count)
+        next(data)
+        self.assertEqual(1, mocked_list.call_count)
+        self.assertEqual(2, len(list(data)))
+        self.assertEqual(2, mocked_list.call_count)
+        self.assertEqual(2, self.app.stdout.flush.call_count)
+        mocked_list.assert_called_with(
+            "/antiddos", params=dict(limit=2, offset=2), key='ddosStatus'
+        )
+
+    def test_list_antiddos_status_stream_with_limit(self, mocked_list):
+        args = ["--stream", "--limit", "2"]
+        verify_args = (("stream", True), ("limit", 2))
+        parsed_args = self.check_parser(self.cmd, args, verify_args)
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action,
+                          parsed_args)
+
+
 @mock.patch.object(antiddos_mgr.AntiDDosManager, "_get")
 class TestAntiDDosStatusShow(TestAntiDDos):
     def setUp(self):
@@ -516,6 +736,63 @@ class TestAntiDDosStatusShow(TestAntiDDos):
             self.assertEqual(tuple(data), ('status',))
 
 
+@mock.patch.object(antiddos_mgr.AntiDDosManager, "get_status_snapshot")
+class TestWatchAntiDDosStatus(TestAntiDDos):
+    def setUp(self):
+        super(TestWatchAntiDDosStatus, self).setUp()
+        self.cmd = antiddos.WatchAntiDDosStatus(self.app, None)
+        self.app.stdout = mock.Mock()
+
+    def written(self):
+        return ''.join(c[0][0] for c in self.app.stdout.write.call_args_list)
+
+    def test_watch_prints_transitions_only(self, mocked_snapshot):
+        mocked_snapshot.side_effect = [
+            {'id-1': ('1.1.1.1', 'normal'), 'id-2': ('1.1.1.2', 'normal')},
+            {'id-1': ('1.1.1.1', 'normal'),
+             'id-2': ('1.1.1.2', 'packetcleaning')},
+        ]
+        parsed_args = self.check_parser(
+            self.cmd, ["--status", "normal", "--interval", "0.01",
+                       "--count", "2"],
+            [("status", "normal"), ("interval", 0.01), ("count", 2),
+             ("floating_ips", [])]
+        )
+        self.cmd.take_action(parsed_args)
+
+        mocked_snapshot.assert_called_with(floating_ips=None,
+                                           status="normal", ip=None,
+                                           concurrency=10)
+        lines = self.written().splitlines()
+        self.assertEqual(1, len(lines))
+        self.assertTrue(lines[0].endswith(
+            ' id-2 1.1.1.2 normal -> packetcleaning'))
+
+    def test_watch_given_floating_ips(self, mocked_snapshot):
+        mocked_snapshot.return_value = {}
+        parsed_args = self.check_parser(
+            self.cmd, ["--count", "1", "floating_ip_id_1"],
+            [("floating_ips", ["floating_ip_id_1"])]
+        )
+        with self.mocked_find:
+            self.cmd.take_action(parsed_args)
+        mocked_snapshot.assert_called_once_with(
+            floating_ips=[self._antiddos], status=None, ip=None,
+            concurrency=10
+        )
+        self.assertEqual('', self.written())
+
+    def test_floating_ips_and_status_are_exclusive(self, mocked_snapshot):
+        parsed_args = self.check_parser(
+            self.cmd, ["--status", "normal", "floating_ip_id_1"], []
+        )
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action, parsed_args)
+        parsed_args = self.check_parser(self.cmd, ["--interval", "0"], [])
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action, parsed_args)
+
+
 @mock.patch.object(antiddos_mgr.AntiDDosManager, "_list")
 class TestListAntiDDosDailyReport(TestAntiDDos):
     def setUp(self):
@@ -548,6 +825,45 @@ class TestListAntiDDosDailyReport(TestAntiDDos):
             self.assertEqual(tuple(data), tuple(expect_data))
 
 
+class TestListFleetDailyReport(TestAntiDDos):
+    def setUp(self):
+        super(TestListFleetDailyReport, self).setUp()
+        self.cmd = antiddos.ListAntiDDosDailyReport(self.app, None)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager,
+                       "get_fleet_daily_report")
+    def test_list_fleet_daily_report(self, mocked_report):
+        verify_args = [("all_eips", True), ("status", "normal"),
+                       ("top", 5), ("sort_by", "pps"), ("concurrency", 20)]
+        parsed_args = self.check_parser(
+            self.cmd, ["--all", "--status", "normal", "--top", "5",
+                       "--sort-by", "pps", "--concurrency", "20"],
+            verify_args
+        )
+        report = fleet_report.FleetDailyReport()
+        report.fold(resource.EIPDailySummary(
+            "fake-id", "192.168.1.1", "normal", 100, 10, 15
+        ))
+        mocked_report.return_value = report
+
+        columns, data = self.cmd.take_action(parsed_args)
+        mocked_report.assert_called_once_with(status="normal", top=5,
+                                              concurrency=20)
+        self.assertEqual(resource.EIPDailySummary.list_column_names,
+                         columns)
+        self.assertEqual((("fake-id", "192.168.1.1", "normal", 100, 10,
+                           15),), tuple(data))
+
+    def test_floating_ip_and_all_are_exclusive(self):
+        parsed_args = self.check_parser(self.cmd, ["--all", "fake-id"],
+                                        [("floating_ip", "fake-id")])
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action, parsed_args)
+        parsed_args = self.check_parser(self.cmd, [], [])
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action, parsed_args)
+
+
 @mock.patch.object(antiddos_mgr.AntiDDosManager, "_list")
 class TestListAntiDDosLogs(TestAntiDDos):
     def __init__(self, *args, **kwargs):
@@ -612,6 +928,113 @@ class TestListAntiDDosLogs(TestAntiDDos):
             self.assertEqual(tuple(data), expect_data)
 
 
+class TestSyncAntiDDosLogs(TestAntiDDos):
+    def setUp(self):
+        super(TestSyncAntiDDosLogs, self).setUp()
+        self.cmd = antiddos.ListAntiDDosLogs(self.app, None)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager,
+                       "sync_antiddos_daily_logs")
+    def test_list_antiddos_logs_with_sync_state(self, mocked_sync):
+        floating_ip_id = self._antiddos.floating_ip_id
+        parsed_args = self.check_parser(
+            self.cmd, ["--sync-state", "/tmp/state.json", floating_ip_id],
+            [("sync_state", "/tmp/state.json")]
+        )
+        mocked_sync.return_value = []
+        with self.mocked_find:
+            columns, data = self.cmd.take_action(parsed_args)
+        self.assertEqual(1, mocked_sync.call_count)
+        args, kwargs = mocked_sync.call_args
+        self.assertEqual(floating_ip_id, args[0])
+        self.assertEqual("/tmp/state.json", args[1].path)
+        self.assertEqual(dict(page_size=100), kwargs)
+        self.assertEqual((), tuple(data))
+
+    def test_sync_state_with_limit(self):
+        parsed_args = self.check_parser(
+            self.cmd, ["--sync-state", "/tmp/state.json", "--limit", "1",
+                       "fake-id"], []
+        )
+        with self.mocked_find:
+            self.assertRaises(argparse.ArgumentTypeError,
+                              self.cmd.take_action, parsed_args)
+
+
+class TestExportAntiDDos(TestAntiDDos):
+    def setUp(self):
+        super(TestExportAntiDDos, self).setUp()
+        self.cmd = antiddos.ExportAntiDDosLogs(self.app, None)
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'logs.csv')
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "iter_daily_log_rows")
+    def test_export_logs_to_csv(self, mocked_rows):
+        mocked_rows.return_value = iter([
+            ('fake-id-1', [{"start_time": 1, "status": 1}], None),
+            # rows of the next log page
+            ('fake-id-1', [{"start_time": 2, "status": 1}], None),
+            ('fake-id-2', None, execs.NotFound()),
+        ])
+        parsed_args = self.check_parser(
+            self.cmd, ["fake-id-1", "fake-id-2", "--format", "csv",
+                       "--output", self.path, "--sort-dir", "asc"],
+            [("floating_ips", ["fake-id-1", "fake-id-2"]),
+             ("export_format", "csv"), ("output", self.path)]
+        )
+        with mock.patch('io.open', wraps=io.open) as mocked_open:
+            self.assertEqual(1, self.cmd.take_action(parsed_args))
+        mocked_open.assert_called_once_with(self.path, 'w', newline='',
+                                            encoding='utf-8')
+
+        mocked_rows.assert_called_once_with(["fake-id-1", "fake-id-2"],
+                                            sort_dir="asc", page_size=100,
+                                            concurrency=10)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(
+                b'floating_ip_id,start_time,end_time,status,trigger_bps,'
+                b'trigger_pps,trigger_http_pps\n'
+                b'fake-id-1,1,,1,,,\n'
+                b'fake-id-1,2,,1,,,\n', f.read()
+            )
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager,
+                       "iter_daily_report_rows")
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "iter_list")
+    def test_export_daily_reports_of_all(self, mocked_list, mocked_rows):
+        self.cmd = antiddos.ExportAntiDDosDailyReport(self.app, None)
+        self.app.stdout = mock.Mock()
+        mocked_list.return_value = iter(self.get_fake_antiddos_list(2))
+
+        def _rows(floating_ips, concurrency):
+            for floating_ip_id in floating_ips:
+                yield floating_ip_id, [{"period_start": 1}], None
+        mocked_rows.side_effect = _rows
+        parsed_args = self.check_parser(
+            self.cmd, ["--all", "--status", "normal"],
+            [("all_eips", True), ("export_format", "ndjson")]
+        )
+        self.assertEqual(0, self.cmd.take_action(parsed_args))
+
+        mocked_list.assert_called_once_with(status="normal")
+        written = ''.join(c[0][0]
+                          for c in self.app.stdout.write.call_args_list)
+        self.assertEqual(
+            '{"period_start":1,"floating_ip_id":"%s"}\n'
+            '{"period_start":1,"floating_ip_id":"%s"}\n' % (
+                self.instances[0]["floating_ip_id"],
+                self.instances[1]["floating_ip_id"]),
+            written
+        )
+
+    def test_floating_ips_or_all_are_required(self):
+        for args in ([], ["--all", "fake-id"], ["--status", "normal",
+                                                 "fake-id"]):
+            parsed_args = self.check_parser(self.cmd, args, [])
+            self.assertRaises(argparse.ArgumentTypeError,
+                              self.cmd.take_action, parsed_args)
+
+
 @mock.patch.object(antiddos_mgr.AntiDDosManager, "_get")
 class TestListAntiDDosWeeklyReport(TestAntiDDos):
     def setUp(self):
@@ -675,3 +1098,47 @@ class TestListAntiDDosWeeklyReport(TestAntiDDos):
             "floating_ip_address='192.168.44.69', times='23'",
         )
         self.assertEqual(expected, data)
+
+
+class TestListAntiDDosWeeklyReports(TestAntiDDos):
+    def setUp(self):
+        super(TestListAntiDDosWeeklyReports, self).setUp()
+        self.cmd = antiddos.ListAntiDDosWeeklyReports(self.app, None)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager,
+                       "get_antiddos_weekly_reports")
+    def test_list_antiddos_weekly_reports(self, mocked_reports):
+        start_date = datetime.datetime(2017, 2, 6)
+        parsed_args = self.check_parser(
+            self.cmd,
+            ["--start-date", "2017-02-06", "--weeks", "13",
+             "--concurrency", "5"],
+            [("start_date", start_date), ("weeks", 13), ("concurrency", 5)],
+        )
+        week = resource.WeeklyReportWeek.from_body(1486310400000, {
+            "ddos_intercept_times": 23,
+            "weekdata": [{"ddos_intercept_times": 23,
+                          "ddos_blackhole_times": 1,
+                          "max_attack_bps": 121,
+                          "max_attack_conns": 2,
+                          "period_start_date": 1486310400000}],
+            "top10": [{"floating_ip_address": "192.168.44.69",
+                       "times": 23}],
+        })
+        mocked_reports.return_value = resource.WeeklyReportRange(
+            [week], None
+        )
+
+        columns, data = self.cmd.take_action(parsed_args)
+        mocked_reports.assert_called_once_with(13, start_date=start_date,
+                                               concurrency=5)
+        self.assertEqual(resource.WeeklyReportWeek.list_column_names,
+                         columns)
+        self.assertEqual(((week.week_start, 23, 1, 121, 2,
+                           "192.168.44.69"),), tuple(data))
+
+    def test_weeks_should_be_positive(self):
+        parsed_args = self.check_parser(self.cmd, ["--weeks", "0"],
+                                        [("weeks", 0)])
+        self.assertRaises(argparse.ArgumentTypeError,
+                          self.cmd.take_action, parsed_args)
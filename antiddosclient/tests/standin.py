@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+"""Local stand-in of the Anti-DDos API server
+
+Serves v1 and v2 routes over a generated fleet of EIP, used by functional
+tests and the benchmark harness (tools/benchmark.py). Run it standalone:
+
+    python -m antiddosclient.tests.standin --fleet-size 10000 --port 8080
+"""
+import argparse
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+
+from keystoneauth1 import plugin
+from six.moves import BaseHTTPServer
+from six.moves import socketserver
+from six.moves.urllib import parse
+
+from antiddosclient.v1 import resource
+
+PROJECT_ID = 'standin-project'
+
+# every fake EIP gets a full day of 5 minutes reports
+DAILY_REPORT_POINTS = 288
+DEFAULT_LOGS_PER_IP = 50
+
+# /v1/{project_id} or /v2/{project_id} prefix of every route
+_VERSION_PREFIX = re.compile(r'^/v[12]/[^/]+')
+_ANTIDDOS_ROUTE = re.compile(r'^/antiddos/([^/]+)(?:/(status|daily|logs))?$')
+
+
+def floating_ip_id(index):
+    """floating ip id of the index-th EIP of the fleet"""
+    return '%08x-0000-4000-8000-%012x' % (index, index)
+
+
+def floating_ip_address(index):
+    """floating ip address of the index-th EIP of the fleet"""
+    return '10.%d.%d.%d' % (index >> 16 & 255, index >> 8 & 255,
+                            index & 255)
+
+
+class StandInAuth(plugin.BaseAuthPlugin):
+    """auth plugin always returns the stand-in endpoint and a fake token"""
+
+    def __init__(self, endpoint):
+        super(StandInAuth, self).__init__()
+        self.endpoint = endpoint
+
+    def get_token(self, session, **kwargs):
+        return 'standin-token'
+
+    def get_endpoint(self, session, **kwargs):
+        return self.endpoint + '/v1/' + PROJECT_ID
+
+    def get_project_id(self, session, **kwargs):
+        return PROJECT_ID
+
+
+class Fleet(object):
+    """generated EIP fleet and anti-ddos state of the stand-in"""
+
+    def __init__(self, size, logs_per_ip=DEFAULT_LOGS_PER_IP):
+        self.size = size
+        self.logs_per_ip = logs_per_ip
+        status_list = resource.AntiDDos.status_list
+        self.eips = [{
+            'floating_ip_id': floating_ip_id(index),
+            'floating_ip_address': floating_ip_address(index),
+            'network_type': 'EIP',
+            'status': status_list[index % len(status_list)],
+        } for index in range(size)]
+        self.by_id = dict((eip['floating_ip_id'], eip) for eip in self.eips)
+        self.configs = {}
+        self.tasks = {}
+        self._lock = threading.Lock()
+
+    def list(self, status=None, ip=None, limit=None, offset=None):
+        eips = self.eips
+        if status:
+            eips = [eip for eip in eips if eip['status'] == status]
+        if ip:
+            eips = [eip for eip in eips if ip in eip['floating_ip_address']]
+        offset = int(offset or 0)
+        end = offset + int(limit) if limit else None
+        return {'total': len(eips), 'ddosStatus': eips[offset:end]}
+
+    def create_task(self, floating_ip_id, config):
+        task_id = uuid.uuid4().hex
+        with self._lock:
+            eip = self.by_id[floating_ip_id]
+            if config is None:
+                self.configs.pop(floating_ip_id, None)
+                eip['status'] = 'notConfig'
+            else:
+                self.configs[floating_ip_id] = config
+                eip['status'] = 'normal'
+            self.tasks[task_id] = 'success'
+        return {'error_code': '10000000', 'error_description': 'success',
+                'task_id': task_id}
+
+    def get_config(self, floating_ip_id):
+        if floating_ip_id not in self.configs:
+            return None
+        config = dict(self.configs[floating_ip_id])
+        config['http_request_pos_id'] = config.get('http_request_pos_id', 1)
+        return config
+
+    @staticmethod
+    def daily_report(now):
+        start = int(now * 1000) - DAILY_REPORT_POINTS * 300000
+        return {'data': [{
+            'period_start': start + point * 300000,
+            'bps_in': point * 1000,
+            'bps_attack': point * 10,
+            'total_bps': point * 1010,
+            'pps_in': point * 10,
+            'pps_attack': point,
+            'total_pps': point * 11,
+        } for point in range(DAILY_REPORT_POINTS)]}
+
+    def logs(self, now, sort_dir=None, limit=None, offset=None):
+        # logs stay the same within a 5 minutes window
+        start = (int(now * 1000) // 300000 - self.logs_per_ip) * 300000
+        logs = [{
+            'start_time': start + index * 300000,
+            'end_time': start + (index + 1) * 300000,
+            'status': index % 2 + 1,
+            'trigger_bps': 50000 + index,
+            'trigger_pps': 2600 + index,
+            'trigger_http_pps': 3500 + index,
+        } for index in range(self.logs_per_ip)]
+        if sort_dir == 'desc':
+            logs.reverse()
+        offset = int(offset or 0)
+        end = offset + int(limit) if limit else None
+        return {'total': len(logs), 'logs': logs[offset:end]}
+
+    def weekly(self, period_start_date=None):
+        start = int(period_start_date or time.time() * 1000)
+        top10 = [{'floating_ip_address': eip['floating_ip_address'],
+                  'times': 10 - index}
+                 for index, eip in enumerate(self.eips[:10])]
+        return {
+            'ddos_intercept_times': 23,
+            'weekdata': [{
+                'ddos_intercept_times': day,
+                'ddos_blackhole_times': 0,
+                'max_attack_bps': day * 1000,
+                'max_attack_conns': day,
+                'period_start_date': start + day * 86400000,
+            } for day in range(7)],
+            'top10': top10,
+        }
+
+    @staticmethod
+    def config_list():
+        return {
+            'traffic_limited_list': [
+                {'traffic_pos_id': pos, 'traffic_per_second': pos * 10,
+                 'packet_per_second': pos * 2000} for pos in range(1, 10)],
+            'http_limited_list': [
+                {'http_request_pos_id': pos,
+                 'http_packet_per_second': pos * 100}
+                for pos in range(1, 16)],
+            'connection_limited_list': [
+                {'cleaning_access_pos_id': pos,
+                 'new_connection_limited': pos * 10,
+                 'total_connection_limited': pos * 100}
+                for pos in range(1, 9)],
+        }
+
+    @staticmethod
+    def alert_config():
+        return {
+            'warn_config': {'antiDDoS': True, 'bruce_force': False,
+                            'remote_login': False, 'weak_password': False,
+                            'high_privilege': False, 'back_doors': False,
+                            'waf': False},
+            'topic_urn': 'urn:smn:standin:%s:antiddos' % PROJECT_ID,
+            'display_name': 'standin',
+        }
+
+
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # headers and body are written separately, do not let them wait for
+    # delayed ACK of the client
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=None):
+        content = json.dumps(body).encode('utf-8') if body is not None else b''
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(content)))
+        self.send_header('X-Openstack-Request-Id',
+                         'req-' + uuid.uuid4().hex)
+        self.end_headers()
+        self.wfile.write(content)
+
+    def _not_found(self):
+        self._reply(404, {'error_code': '10001244',
+                          'error_description': 'Resource not found'})
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return None
+        return json.loads(self.rfile.read(length).decode('utf-8'))
+
+    def _dispatch(self, method):
+        server = self.server
+        server.count_request()
+        if server.latency:
+            time.sleep(server.latency)
+
+        url = parse.urlparse(self.path)
+        path = _VERSION_PREFIX.sub('', url.path).rstrip('/')
+        query = dict(parse.parse_qsl(url.query))
+        fleet = server.fleet
+        now = time.time()
+
+        if method == 'GET':
+            if path == '/antiddos':
+                return self._reply(200, fleet.list(**query))
+            if path == '/antiddos/query_config_list':
+                return self._reply(200, fleet.config_list())
+            if path == '/antiddos/weekly':
+                return self._reply(200, fleet.weekly(
+                    query.get('period_start_date')))
+            if path == '/query_task_status':
+                status = fleet.tasks.get(query.get('task_id'))
+                if status is None:
+                    return self._not_found()
+                return self._reply(200, {'task_status': status,
+                                         'task_msg': ''})
+            if path == '/warnalert/alertconfig/query':
+                return self._reply(200, fleet.alert_config())
+
+        matched = _ANTIDDOS_ROUTE.match(path)
+        if not matched or matched.group(1) not in fleet.by_id:
+            return self._not_found()
+        floating_ip_id, sub = matched.groups()
+
+        if method == 'GET' and sub is None:
+            config = fleet.get_config(floating_ip_id)
+            return self._reply(200, config)
+        if method == 'GET' and sub == 'status':
+            return self._reply(200, {
+                'status': fleet.by_id[floating_ip_id]['status']
+            })
+        if method == 'GET' and sub == 'daily':
+            return self._reply(200, fleet.daily_report(now))
+        if method == 'GET' and sub == 'logs':
+            return self._reply(200, fleet.logs(now, **query))
+        if method in ('POST', 'PUT') and sub is None:
+            config = self._read_json() or {}
+            return self._reply(200, fleet.create_task(floating_ip_id, config))
+        if method == 'DELETE' and sub is None:
+            return self._reply(200, fleet.create_task(floating_ip_id, None))
+        return self._not_found()
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+
+class StandInServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """threaded HTTP server serves the Anti-DDos API of a fake fleet
+
+    :param fleet_size: number of EIP in the fleet
+    :param latency: seconds every request is delayed
+    :param logs_per_ip: number of logs returned for every EIP
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, fleet_size=1000, latency=0, host='127.0.0.1', port=0,
+                 logs_per_ip=DEFAULT_LOGS_PER_IP):
+        BaseHTTPServer.HTTPServer.__init__(self, (host, port), _Handler)
+        self.fleet = Fleet(fleet_size, logs_per_ip=logs_per_ip)
+        self.latency = latency
+        self.requests = 0
+        self._count_lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        return 'http://%s:%d' % self.server_address[:2]
+
+    def count_request(self):
+        with self._count_lock:
+            self.requests += 1
+
+    def start(self):
+        """serve in a daemon thread"""
+        self._thread = threading.Thread(target=self.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fleet-size', type=int, default=1000)
+    parser.add_argument('--latency', type=float, default=0,
+                        help='seconds every request is delayed')
+    parser.add_argument('--logs-per-ip', type=int,
+                        default=DEFAULT_LOGS_PER_IP)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = StandInServer(args.fleet_size, args.latency, args.host,
+                           args.port, args.logs_per_ip)
+    # parent process reads the endpoint from the first output line
+    sys.stdout.write(server.endpoint + '\n')
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import json
+import subprocess
+import sys
+
+from antiddosclient.osc.v1 import antiddos
+from antiddosclient.tests import base
+from antiddosclient.v1 import antiddos_mgr
+
+# modules which cost most of the start up time
+HEAVY_MODULES = ('openstack', 'osc_lib.utils', 'keystoneauth1', 'requests',
+                 'oslo_utils.strutils', 'numpy', 'aiohttp')
+
+
+def imported_modules(*modules):
+    """names of HEAVY_MODULES loaded by importing modules in a fresh
+    interpreter
+    """
+    code = ('import json, sys\n' +
+            ''.join('import %s\n' % module for module in modules) +
+            'print(json.dumps([m for m in %r if m in sys.modules]))'
+            % (HEAVY_MODULES,))
+    output = subprocess.check_output([sys.executable, '-c', code],
+                                     universal_newlines=True)
+    return json.loads(output)
+
+
+class TestLazyImports(base.BaseTestCase):
+
+    def test_plugin_and_commands(self):
+        # loaded on every openstack CLI start up and to list commands
+        self.assertEqual([], imported_modules(
+            'antiddosclient.osc.plugin',
+            'antiddosclient.osc.v1.antiddos',
+            'antiddosclient.osc.v2.alert',
+        ))
+
+    def test_client(self):
+        self.assertEqual(['keystoneauth1', 'requests'], imported_modules(
+            'antiddosclient.v1.client', 'antiddosclient.v2.client'
+        ))
+
+    def test_default_concurrency(self):
+        self.assertEqual(antiddos_mgr.DEFAULT_BULK_CONCURRENCY,
+                         antiddos.DEFAULT_CONCURRENCY)
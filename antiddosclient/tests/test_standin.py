@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import os
+
+import fixtures
+from keystoneauth1 import exceptions
+from keystoneauth1 import session
+
+from antiddosclient.tests import base
+from antiddosclient.tests import standin
+from antiddosclient.v1 import client
+from antiddosclient.v1 import log_sync
+from antiddosclient.v2 import client as v2_client
+
+
+class TestStandInServer(base.BaseTestCase):
+    """run real clients against the stand-in server"""
+
+    def setUp(self):
+        super(TestStandInServer, self).setUp()
+        self.server = standin.StandInServer(fleet_size=300).start()
+        self.addCleanup(self.server.stop)
+        self.session = session.Session(
+            auth=standin.StandInAuth(self.server.endpoint)
+        )
+        self.client = client.Client(self.session, self.server.endpoint)
+
+    def test_list_and_find(self):
+        manager = self.client.antiddos
+        self.assertEqual(300, len(manager.list()))
+        page = manager.list(limit=10, offset=290)
+        self.assertEqual(standin.floating_ip_id(290), page[0].floating_ip_id)
+        self.assertEqual(300, len(list(manager.iter_list(page_size=70))))
+
+        address = standin.floating_ip_address(7)
+        self.assertEqual(standin.floating_ip_id(7),
+                         manager.find(address).floating_ip_id)
+        self.assertRaises(exceptions.NotFound, manager.find, '10.9.9.9')
+
+    def test_stream(self):
+        manager = self.client.antiddos
+        listing = manager.stream_list()
+        self.assertEqual([standin.floating_ip_id(i) for i in range(300)],
+                         [row.floating_ip_id for row in listing])
+        self.assertEqual({'total': 300}, listing.meta)
+
+        logs = list(manager.stream_antiddos_daily_logs(
+            standin.floating_ip_id(1), sort_dir='desc', limit=20
+        ))
+        self.assertEqual(20, len(logs))
+        self.assertGreater(logs[0].start_time, logs[-1].start_time)
+
+    def test_open_and_wait(self):
+        manager = self.client.antiddos
+        floating_ip_id = standin.floating_ip_id(3)
+        self.assertEqual('notConfig',
+                         manager.get_antiddos(floating_ip_id).status)
+
+        results = manager.bulk_open_antiddos(
+            [floating_ip_id, standin.floating_ip_address(4)], True, 2, 3, 4, 1
+        )
+        task_ids = [result.task_id for result in results.values()]
+        waited = list(manager.wait_for_tasks(task_ids))
+        self.assertTrue(all(result.succeeded for result in waited))
+
+        antiddos = manager.get_antiddos(floating_ip_id)
+        self.assertEqual(2, antiddos.traffic_pos_id)
+        self.assertEqual('normal',
+                         manager.get_antiddos_status(floating_ip_id).status)
+
+    def test_hydrate(self):
+        manager = self.client.antiddos
+        manager.open_antiddos(standin.floating_ip_id(5), False, 2, 1, 1, 0)
+        listing = manager.list(limit=10)
+        self.server.requests = 0
+        # only configured EIP is fetched
+        self.assertEqual(10, manager.hydrate(listing, concurrency=4))
+        self.assertEqual(len([row for row in listing
+                              if row.status != 'notConfig']),
+                         self.server.requests)
+        self.assertEqual(2, listing[5].traffic_pos_id)
+        self.assertFalse(hasattr(listing[0], 'traffic_pos_id'))
+
+    def test_sync_logs(self):
+        manager = self.client.antiddos
+        floating_ip_id = standin.floating_ip_id(2)
+        state = log_sync.LogSyncState(
+            os.path.join(self.useFixture(fixtures.TempDir()).path, 'state')
+        )
+        logs = manager.sync_antiddos_daily_logs(floating_ip_id, state,
+                                                page_size=20)
+        self.assertEqual(standin.DEFAULT_LOGS_PER_IP, len(logs))
+        self.assertLess(logs[0].start_time, logs[-1].start_time)
+
+        self.server.requests = 0
+        self.assertEqual([], manager.sync_antiddos_daily_logs(
+            floating_ip_id, state, page_size=20
+        ))
+        # known logs are reached in the first page
+        self.assertEqual(1, self.server.requests)
+
+    def test_reports(self):
+        manager = self.client.antiddos
+        floating_ip_id = standin.floating_ip_id(1)
+        self.assertEqual(standin.DAILY_REPORT_POINTS,
+                         len(manager.get_antiddos_daily_report(
+                             floating_ip_id)))
+        logs = manager.get_antiddos_daily_logs(floating_ip_id, limit=20)
+        self.assertEqual(20, len(logs))
+        self.assertEqual(7, len(manager.get_antiddos_weekly_report().weekdata))
+        self.assertTrue(manager.query_config_list().traffic_limited_list)
+
+        alerts = v2_client.Client(self.session, self.server.endpoint).alerts
+        self.assertEqual('standin', alerts.get().display_name)
+        self.assertEqual(5, self.server.requests)
+
+    def test_weekly_reports(self):
+        manager = self.client.antiddos
+        reports = manager.get_antiddos_weekly_reports(13, concurrency=4)
+        self.assertEqual(13, len(reports))
+        self.assertEqual(13 * 23, reports.ddos_intercept_times)
+        self.assertEqual(13 * 7, len(reports.days))
+        self.assertEqual(13, self.server.requests)
+        # weeks of the quarter are finished, nothing is fetched again
+        manager.get_antiddos_weekly_reports(13)
+        self.assertEqual(13, self.server.requests)
+
+    def test_not_found(self):
+        self.assertRaises(exceptions.NotFound,
+                          self.client.antiddos.get_antiddos_status,
+                          'not-exists')
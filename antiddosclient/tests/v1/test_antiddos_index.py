@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import mock
+
+from antiddosclient.tests import base
+from antiddosclient.v1 import antiddos_index
+from antiddosclient.v1 import resource
+
+
+class TestAntiDDosIndex(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestAntiDDosIndex, self).setUp()
+        self.snapshot = [
+            resource.AntiDDos(None, dict(floating_ip_id='id-%d' % i,
+                                         floating_ip_address=ip,
+                                         status='normal'), attached=True)
+            for i, ip in enumerate(['10.0.0.1', '10.0.0.12', '10.0.1.1'])
+        ]
+        self.loader = mock.Mock(side_effect=lambda: iter(self.snapshot))
+        self.index = antiddos_index.AntiDDosIndex(self.loader, ttl=60,
+                                                  miss_refresh_interval=0)
+
+    def test_lookup_exact(self):
+        self.assertEqual([self.snapshot[1]], self.index.lookup('id-1'))
+        self.assertEqual([self.snapshot[0]], self.index.lookup('10.0.0.1'))
+        self.assertEqual(3, len(self.index))
+        # snapshot is built only once
+        self.assertEqual(1, self.loader.call_count)
+
+    def test_lookup_prefix(self):
+        self.assertEqual(self.snapshot[:2], self.index.lookup('10.0.0.'))
+        self.assertEqual([self.snapshot[2]], self.index.lookup('10.0.1'))
+
+    @mock.patch('time.time')
+    def test_refresh_when_expired(self, mocked_time):
+        mocked_time.return_value = 1000
+        self.index.lookup('10.0.0.1')
+        mocked_time.return_value = 1061
+        self.index.lookup('10.0.0.1')
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_refresh_on_miss(self):
+        self.index.lookup('10.0.0.1')
+        self.snapshot.append(resource.AntiDDos(
+            None, dict(floating_ip_id='id-new',
+                       floating_ip_address='10.0.2.1'), attached=True))
+        self.assertEqual([self.snapshot[-1]], self.index.lookup('id-new'))
+        self.assertEqual(2, self.loader.call_count)
+
+    def test_miss_refresh_interval(self):
+        self.index.miss_refresh_interval = 60
+        self.index.lookup('10.0.0.1')
+        self.assertEqual([], self.index.lookup('not-exists'))
+        self.assertEqual([], self.index.lookup('not-exists'))
+        self.assertEqual(1, self.loader.call_count)
+
+    def test_discard(self):
+        self.index.miss_refresh_interval = 60
+        self.index.lookup('10.0.0.1')
+        self.index.discard('id-0')
+        # other entries are still served by the snapshot
+        self.assertEqual([self.snapshot[2]], self.index.lookup('id-2'))
+        self.assertEqual(1, self.loader.call_count)
+
+        self.snapshot[0] = resource.AntiDDos(
+            None, dict(floating_ip_id='id-0', floating_ip_address='10.0.0.1',
+                       status='configging'), attached=True)
+        self.assertEqual(self.snapshot[:2], self.index.lookup('10.0.0.'))
+        self.assertEqual(2, self.loader.call_count)
+        self.assertEqual('configging',
+                         self.index.lookup('id-0')[0].status)
+        self.assertEqual(2, self.loader.call_count)
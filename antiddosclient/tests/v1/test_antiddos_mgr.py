@@ -0,0 +1,605 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import datetime
+import threading
+import time
+
+import fixtures
+import mock
+from keystoneauth1 import exceptions
+
+from antiddosclient.common import cache
+from antiddosclient.common import exceptions as execs
+from antiddosclient.common import resource as base_resource
+from antiddosclient.tests import base
+from antiddosclient.tests import fakes
+from antiddosclient.v1 import antiddos_mgr
+from antiddosclient.v1 import resource
+
+
+class TestAntiDDosManager(base.BaseTestCase):
+
+    instances = [
+        {
+            "floating_ip_id": "1867f954-fc11-4202-8247-6af2144867ea",
+            "floating_ip_address": "192.168.42.221",
+            "network_type": "EIP",
+            "status": "notConfig"
+        },
+        {
+            "floating_ip_id": "49c6af49-9ace-42e6-ab89-1eee1f4ac821",
+            "floating_ip_address": "192.168.35.152",
+            "network_type": "EIP",
+            "status": "normal"
+        },
+    ]
+
+    def setUp(self):
+        super(TestAntiDDosManager, self).setUp()
+        self.http_client = mock.Mock()
+        self.manager = antiddos_mgr.AntiDDosManager(self.http_client)
+
+    def get_fake_antiddos(self, instance):
+        return resource.AntiDDos(None, instance, attached=True)
+
+    def get_fake_task(self, task_id):
+        return base_resource.DictWithMeta(dict(task_id=task_id),
+                                          fakes.FAKE_REQUEST_ID)
+
+
+class TestBulkAntiDDos(TestAntiDDosManager):
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "find")
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_create")
+    def test_bulk_open_antiddos(self, mocked_create, mocked_find):
+        uuid = self.instances[0]["floating_ip_id"]
+        mocked_find.return_value = self.get_fake_antiddos(self.instances[1])
+
+        def _create(url, data=None, raw=False):
+            if url.endswith(uuid):
+                return self.get_fake_task('task-1')
+            raise exceptions.BadRequest('already opened')
+
+        mocked_create.side_effect = _create
+        ip = self.instances[1]["floating_ip_address"]
+        results = self.manager.bulk_open_antiddos([uuid, ip, uuid],
+                                                  True, 1, 1, 8, 1,
+                                                  concurrency=4)
+
+        # only find IP keyword and duplicated keywords are removed
+        mocked_find.assert_called_once_with(ip)
+        self.assertEqual([uuid, ip], list(results.keys()))
+        self.assertEqual(resource.BulkTaskResult(uuid, 'task-1', None, False),
+                         results[uuid])
+        self.assertTrue(results[uuid].succeeded)
+        self.assertFalse(results[ip].succeeded)
+        self.assertIsInstance(results[ip].error, exceptions.BadRequest)
+        self.assertEqual(self.instances[1]["floating_ip_id"],
+                         results[ip].floating_ip_id)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_update_all")
+    def test_bulk_update_antiddos_already_configured(self, mocked_update):
+        mocked_update.return_value = base_resource.StrWithMeta(
+            '', fakes.FAKE_REQUEST_ID
+        )
+        uuid = self.instances[0]["floating_ip_id"]
+        results = self.manager.bulk_update_antiddos([uuid], True, 1, 1, 8, 1)
+        self.assertEqual(resource.BulkTaskResult(uuid, None, None, True),
+                         results[uuid])
+        self.assertTrue(results[uuid].succeeded)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "find")
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_delete")
+    def test_bulk_close_antiddos_not_found(self, mocked_delete, mocked_find):
+        mocked_find.side_effect = exceptions.NotFound()
+        results = self.manager.bulk_close_antiddos(["192.168.1.1"])
+        self.assertIsNone(results["192.168.1.1"].floating_ip_id)
+        self.assertIsInstance(results["192.168.1.1"].error,
+                              exceptions.NotFound)
+        self.assertFalse(mocked_delete.called)
+
+    def test_bulk_with_no_floating_ips(self):
+        self.assertEqual({}, self.manager.bulk_close_antiddos([]))
+
+    def test_bulk_apply_with_own_arguments(self):
+        uuids = [instance["floating_ip_id"] for instance in self.instances]
+        action = mock.Mock(side_effect=lambda floating_ip_id, traffic: {
+            'task_id': 'task-%s' % traffic
+        })
+        callback = mock.Mock()
+        results = self.manager.bulk_apply([(uuids[0], (1,)),
+                                           (uuids[1], (2,))],
+                                          action, concurrency=2,
+                                          callback=callback)
+
+        self.assertEqual(uuids[:2], list(results.keys()))
+        self.assertEqual('task-1', results[uuids[0]].task_id)
+        self.assertEqual('task-2', results[uuids[1]].task_id)
+        action.assert_has_calls([mock.call(uuids[0], 1),
+                                 mock.call(uuids[1], 2)], any_order=True)
+        callback.assert_has_calls([mock.call(uuids[0], results[uuids[0]]),
+                                   mock.call(uuids[1], results[uuids[1]])],
+                                  any_order=True)
+
+
+    def test_bulk_apply_already_configured(self):
+        action = mock.Mock(return_value=base_resource.StrWithMeta(
+            '', fakes.FAKE_REQUEST_ID))
+        results = self.manager.bulk_apply([('fake-id', ())], action)
+        self.assertTrue(results['fake-id'].already_configured)
+        self.assertTrue(results['fake-id'].succeeded)
+
+    def test_bulk_apply_without_task_id(self):
+        action = mock.Mock(return_value=base_resource.TupleWithMeta(
+            (), fakes.FAKE_REQUEST_ID))
+        results = self.manager.bulk_apply([('fake-id', ())], action)
+        self.assertFalse(results['fake-id'].already_configured)
+        self.assertFalse(results['fake-id'].succeeded)
+        self.assertIsInstance(results['fake-id'].error,
+                              exceptions.ClientException)
+
+
+class TestIterAntiDDos(TestAntiDDosManager):
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_list")
+    def test_iter_list(self, mocked_list):
+        pages = [self.instances, self.instances[:1]]
+        mocked_list.side_effect = [
+            base_resource.ListWithMeta(
+                [self.get_fake_antiddos(i) for i in page],
+                fakes.FAKE_REQUEST_ID)
+            for page in pages
+        ]
+        results = list(self.manager.iter_list(status='normal', page_size=2,
+                                              window=0))
+        self.assertEqual(3, len(results))
+        mocked_list.assert_has_calls([
+            mock.call("/antiddos", params=dict(status='normal', limit=2,
+                                               offset=0), key='ddosStatus'),
+            mock.call("/antiddos", params=dict(status='normal', limit=2,
+                                               offset=2), key='ddosStatus'),
+        ])
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_list")
+    def test_iter_list_pages(self, mocked_list):
+        mocked_list.side_effect = [
+            base_resource.ListWithMeta(
+                [self.get_fake_antiddos(i) for i in page],
+                fakes.FAKE_REQUEST_ID)
+            for page in [self.instances, []]
+        ]
+        pages = list(self.manager.iter_list_pages(page_size=2, window=0))
+        self.assertEqual([2, 0], [len(page) for page in pages])
+        self.assertEqual(fakes.FAKE_REQUEST_ID, pages[0].request_id)
+        self.assertEqual(2, mocked_list.call_count)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_list")
+    def test_iter_antiddos_daily_logs(self, mocked_list):
+        mocked_list.return_value = base_resource.ListWithMeta(
+            [], fakes.FAKE_REQUEST_ID
+        )
+        results = list(self.manager.iter_antiddos_daily_logs(
+            'fake-id', sort_dir='desc', page_size=50
+        ))
+        self.assertEqual([], results)
+        mocked_list.assert_any_call(
+            "/antiddos/fake-id/logs",
+            key="logs",
+            params=dict(sort_dir='desc', limit=50, offset=0),
+            resource_class=resource.AntiDDosLog
+        )
+
+
+class TestStatusSnapshot(TestAntiDDosManager):
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "iter_list")
+    def test_snapshot_of_listed_floating_ips(self, mocked_iter):
+        mocked_iter.return_value = iter(
+            [self.get_fake_antiddos(i) for i in self.instances])
+        snapshot = self.manager.get_status_snapshot(status='normal',
+                                                    page_size=50)
+        mocked_iter.assert_called_once_with(status='normal', ip=None,
+                                            page_size=50)
+        self.assertEqual([
+            (i["floating_ip_id"], (i["floating_ip_address"], i["status"]))
+            for i in self.instances
+        ], list(snapshot.items()))
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "get_antiddos_status")
+    def test_snapshot_of_given_floating_ips(self, mocked_status):
+        mocked_status.side_effect = lambda floating_ip_id: \
+            resource.AntiDDosStatus(None, dict(status='packetcleaning'))
+        floating_ips = [self.get_fake_antiddos(i) for i in self.instances]
+        snapshot = self.manager.get_status_snapshot(floating_ips,
+                                                    concurrency=2)
+        self.assertEqual([
+            (i["floating_ip_id"], (i["floating_ip_address"],
+                                   'packetcleaning'))
+            for i in self.instances
+        ], list(snapshot.items()))
+        self.assertEqual(2, mocked_status.call_count)
+
+
+class TestExportRows(TestAntiDDosManager):
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "find")
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_iter_daily_report_rows(self, mocked_get, mocked_find):
+        mocked_find.return_value = self.get_fake_antiddos(self.instances[1])
+
+        def _get(url, params, headers):
+            if 'missing' in url:
+                raise exceptions.NotFound()
+            return None, {"data": [{"period_start": 1, "url": url}]}
+
+        mocked_get.side_effect = _get
+        uuid = self.instances[0]["floating_ip_id"]
+        ip = self.instances[1]["floating_ip_address"]
+        results = list(self.manager.iter_daily_report_rows(
+            iter([uuid, 'missing-id', ip]), concurrency=1
+        ))
+
+        self.assertEqual([uuid, 'missing-id',
+                          self.instances[1]["floating_ip_id"]],
+                         [r[0] for r in results])
+        self.assertEqual([{"period_start": 1,
+                           "url": "/antiddos/%s/daily" % uuid}],
+                         results[0][1])
+        self.assertIsNone(results[1][1])
+        self.assertIsInstance(results[1][2], exceptions.NotFound)
+        self.assertIsNone(results[2][2])
+        mocked_find.assert_called_once_with(ip)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_iter_daily_log_rows(self, mocked_get):
+        mocked_get.side_effect = [
+            (None, {"logs": [{"start_time": 1}, {"start_time": 2}]}),
+            (None, {"logs": [{"start_time": 3}]}),
+        ]
+        results = list(self.manager.iter_daily_log_rows(
+            ['fake-id'], sort_dir='asc', page_size=2
+        ))
+
+        self.assertEqual([
+            ('fake-id', [{"start_time": 1}, {"start_time": 2}], None),
+            ('fake-id', [{"start_time": 3}], None),
+        ], results)
+        mocked_get.assert_has_calls([
+            mock.call("/antiddos/fake-id/logs",
+                      dict(sort_dir='asc', limit=2, offset=0), {}),
+            mock.call("/antiddos/fake-id/logs",
+                      dict(sort_dir='asc', limit=2, offset=2), {}),
+        ])
+
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_iter_daily_log_rows_yield_pages(self, mocked_get):
+        released = threading.Event()
+        waited = []
+
+        def _get(url, params, headers):
+            if params["offset"]:
+                # the first page is consumed before the last one arrives
+                waited.append(released.wait(5))
+                return None, {"logs": []}
+            return None, {"logs": [{"start_time": 1}]}
+
+        mocked_get.side_effect = _get
+        results = self.manager.iter_daily_log_rows(['fake-id'], page_size=1)
+        self.assertEqual(('fake-id', [{"start_time": 1}], None),
+                         next(results))
+        released.set()
+        self.assertEqual([('fake-id', [], None)], list(results))
+        self.assertEqual([True], waited)
+
+
+class TestHydrateAntiDDos(TestAntiDDosManager):
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "get_antiddos")
+    def test_hydrate(self, mocked_get):
+        rows = [self.get_fake_antiddos(i) for i in self.instances]
+        mocked_get.return_value = resource.AntiDDos(None, dict(
+            enable_L7=True, traffic_pos_id=1, http_request_pos_id=2,
+            cleaning_access_pos_id=3, app_type_id=0, status='configging'
+        ))
+        self.assertEqual(2, self.manager.hydrate(rows))
+        # not configured antiddos has no settings to fetch
+        mocked_get.assert_called_once_with(
+            "49c6af49-9ace-42e6-ab89-1eee1f4ac821"
+        )
+        self.assertEqual(1, rows[1].traffic_pos_id)
+        # status of the listing is kept
+        self.assertEqual('normal', rows[1].status)
+        self.assertFalse(hasattr(rows[0], 'enable_L7'))
+
+        self.assertEqual(0, self.manager.hydrate(rows))
+        self.assertEqual(1, mocked_get.call_count)
+
+
+class TestFleetDailyReport(TestAntiDDosManager):
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_get_fleet_daily_report(self, mocked_get):
+        def http_get(url, params, headers):
+            if url == "/antiddos":
+                offset = params["offset"]
+                return (fakes.create_response(),
+                        dict(ddosStatus=self.instances[offset:offset + 1]))
+            if url.startswith("/antiddos/1867f954"):
+                raise exceptions.ServiceUnavailable()
+            return None, dict(data=[dict(bps_attack=10, pps_attack=1),
+                                    dict(bps_attack=0, pps_attack=0)])
+        mocked_get.side_effect = http_get
+
+        # one EIP a page, both pages are reported
+        report = self.manager.get_fleet_daily_report(status='normal',
+                                                     concurrency=1,
+                                                     page_size=1)
+        for offset in (0, 1):
+            mocked_get.assert_any_call(
+                "/antiddos", dict(status='normal', limit=1, offset=offset),
+                mock.ANY
+            )
+        self.assertEqual(1, report.eips)
+        self.assertEqual(5, report.attack_minutes)
+        self.assertEqual(["1867f954-fc11-4202-8247-6af2144867ea"],
+                         report.failed)
+        self.assertEqual("192.168.35.152",
+                         report.top_bps[0].floating_ip_address)
+
+
+class TestWeeklyReports(TestAntiDDosManager):
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_get_antiddos_weekly_reports(self, mocked_get):
+        def http_get(url, params, headers):
+            return fakes.create_response(), dict(
+                ddos_intercept_times=params["period_start_date"] % 7,
+                top10=[dict(floating_ip_address="192.168.35.152", times=1)]
+            )
+        mocked_get.side_effect = http_get
+
+        start_date = datetime.datetime(2017, 1, 2)
+        reports = self.manager.get_antiddos_weekly_reports(
+            3, start_date=start_date, concurrency=2
+        )
+        starts = [antiddos_mgr._to_epoch_millis(
+            start_date + datetime.timedelta(weeks=week)) for week in range(3)]
+        self.assertEqual(starts, [r.period_start_date for r in reports])
+        for start in starts:
+            mocked_get.assert_any_call("/antiddos/weekly",
+                                       dict(period_start_date=start), {})
+        self.assertEqual(sum(start % 7 for start in starts),
+                         reports.ddos_intercept_times)
+        self.assertEqual([("192.168.35.152", 3)], reports.top10)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, reports.request_id)
+
+        # finished weeks are only fetched once
+        reports = self.manager.get_antiddos_weekly_reports(
+            4, start_date=start_date
+        )
+        self.assertEqual(4, len(reports))
+        self.assertEqual(4, mocked_get.call_count)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_current_week_is_not_kept(self, mocked_get):
+        mocked_get.return_value = (fakes.create_response(), {})
+        today = datetime.datetime.combine(datetime.date.today(),
+                                          datetime.time())
+        # weeks end today by default
+        reports = self.manager.get_antiddos_weekly_reports(2)
+        self.assertEqual(
+            antiddos_mgr._to_epoch_millis(today - datetime.timedelta(14)),
+            reports[0].period_start_date
+        )
+        self.manager.get_antiddos_weekly_reports(1, start_date=today)
+        self.manager.get_antiddos_weekly_reports(1, start_date=today)
+        self.assertEqual(4, mocked_get.call_count)
+
+
+class TestFindWithIndex(TestAntiDDosManager):
+
+    def setUp(self):
+        super(TestFindWithIndex, self).setUp()
+        self.snapshot = [self.get_fake_antiddos(i) for i in self.instances]
+        self.manager.iter_list = mock.Mock(
+            side_effect=lambda: iter(self.snapshot)
+        )
+        self.manager.enable_index()
+
+    def test_find(self):
+        uuid = self.instances[0]["floating_ip_id"]
+        ip = self.instances[1]["floating_ip_address"]
+        self.assertEqual(self.snapshot[0], self.manager.find(uuid))
+        self.assertEqual(self.snapshot[1], self.manager.find(ip))
+        self.assertEqual(self.snapshot[1], self.manager.find("192.168.35"))
+        self.assertEqual(1, self.manager.iter_list.call_count)
+        self.assertFalse(self.http_client.get.called)
+
+    def test_find_not_unique(self):
+        self.assertRaises(execs.NotUniqueMatch, self.manager.find, "192.168.")
+
+    def test_find_not_found(self):
+        self.assertRaises(exceptions.NotFound, self.manager.find, "10.0.0.1")
+
+    def test_disable_index(self):
+        self.manager.disable_index()
+        self.assertIsNone(self.manager.index)
+
+    def test_write_discards_index_entry(self):
+        uuid = self.instances[0]["floating_ip_id"]
+        self.http_client.delete.return_value = (
+            fakes.create_response(), {"task_id": "task-id"}
+        )
+        self.assertEqual(self.snapshot[0], self.manager.find(uuid))
+        self.manager.close_antiddos(uuid)
+        self.snapshot[0] = self.get_fake_antiddos(
+            dict(self.instances[0], status='configging')
+        )
+        self.assertEqual('configging', self.manager.find(uuid).status)
+        self.assertEqual(2, self.manager.iter_list.call_count)
+
+
+class TestWaitForTasks(TestAntiDDosManager):
+
+    def get_fake_task(self, status):
+        return resource.AntiDDosTask(None, dict(task_status=status,
+                                                task_msg=''), attached=True)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "get_task_status")
+    def test_wait_for_tasks(self, mocked_get_task):
+        statuses = {
+            'task-1': ['running', 'running', 'success'],
+            'task-2': ['failed'],
+        }
+        mocked_get_task.side_effect = lambda task_id: self.get_fake_task(
+            statuses[task_id].pop(0)
+        )
+        results = list(self.manager.wait_for_tasks(
+            ['task-1', 'task-2'], timeout=5, initial_interval=0.01,
+            jitter=0
+        ))
+        # results yielded in finish order
+        self.assertEqual(['task-2', 'task-1'],
+                         [result.task_id for result in results])
+        self.assertFalse(results[0].succeeded)
+        self.assertTrue(results[1].succeeded)
+        self.assertEqual('task-1', results[1].task.task_id)
+        self.assertEqual(4, mocked_get_task.call_count)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "get_task_status")
+    def test_wait_for_tasks_with_errors(self, mocked_get_task):
+        errors = {
+            'task-1': [exceptions.ServiceUnavailable(), None],
+            'task-2': [exceptions.NotFound()],
+        }
+
+        def get_task_status(task_id):
+            error = errors[task_id].pop(0)
+            if error:
+                raise error
+            return self.get_fake_task('success')
+
+        mocked_get_task.side_effect = get_task_status
+        results = dict((result.task_id, result) for result in
+                       self.manager.wait_for_tasks(['task-1', 'task-2'],
+                                                   initial_interval=0.01))
+        self.assertTrue(results['task-1'].succeeded)
+        self.assertIsInstance(results['task-2'].error, exceptions.NotFound)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "get_task_status")
+    def test_wait_for_tasks_timeout(self, mocked_get_task):
+        mocked_get_task.return_value = self.get_fake_task('running')
+        waiter = self.manager.wait_for_tasks(['task-1'], timeout=0.05,
+                                             initial_interval=0.01)
+        e = self.assertRaises(execs.WaitTimeout, list, waiter)
+        self.assertEqual(['task-1'], e.pending)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "get_task_status")
+    def test_wait_for_tasks_polls_at_deadline(self, mocked_get_task):
+        poll_times = []
+
+        def get_task_status(task_id):
+            poll_times.append(time.time())
+            return self.get_fake_task('running')
+
+        mocked_get_task.side_effect = get_task_status
+        started = time.time()
+        waiter = self.manager.wait_for_tasks(['task-1'], timeout=0.3,
+                                             initial_interval=0.2,
+                                             jitter=0)
+        self.assertRaises(execs.WaitTimeout, list, waiter)
+        # polls at 0, 0.2 and the deadline instead of giving up at 0.2
+        self.assertEqual(3, len(poll_times))
+        self.assertGreaterEqual(poll_times[-1], started + 0.3)
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "get_task_status")
+    def test_wait_for_tasks_yield_slow_query_last(self, mocked_get_task):
+        def get_task_status(task_id):
+            if task_id == 'task-1':
+                time.sleep(0.2)
+            return self.get_fake_task('success')
+
+        mocked_get_task.side_effect = get_task_status
+        results = list(self.manager.wait_for_tasks(['task-1', 'task-2'],
+                                                   timeout=5))
+        self.assertEqual(['task-2', 'task-1'],
+                         [result.task_id for result in results])
+
+
+class TestAntiDDosManagerCache(TestAntiDDosManager):
+
+    def setUp(self):
+        super(TestAntiDDosManagerCache, self).setUp()
+        self.directory = self.useFixture(fixtures.TempDir()).path
+        self.manager.cache = cache.ResponseCache(self.directory)
+        self.http_client.get_endpoint.return_value = (
+            'https://antiddos.example.com/v1/project-1'
+        )
+
+    def test_cache_config_list(self):
+        body = {"traffic_limited_list": [], "http_limited_list": []}
+        self.http_client.get.return_value = (fakes.create_response(), body)
+        self.manager.query_config_list()
+        config = self.manager.query_config_list()
+        self.assertIsInstance(config, resource.AntiDDosConfig)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, config.request_id)
+        self.assertEqual(1, self.http_client.get.call_count)
+
+    def test_cache_finished_task_only(self):
+        self.http_client.get.return_value = (
+            fakes.create_response(), {"task_status": "running"}
+        )
+        self.manager.get_task_status("task-id")
+        self.http_client.get.return_value = (
+            fakes.create_response(), {"task_status": "success"}
+        )
+        self.manager.get_task_status("task-id")
+        task = self.manager.get_task_status("task-id")
+        self.assertEqual("success", task.task_status)
+        self.assertEqual(2, self.http_client.get.call_count)
+
+    def test_write_invalidate_cache(self):
+        self.manager.cache_policies = (cache.CachePolicy(r'^/antiddos',
+                                                         ttl=60),)
+        self.http_client.get.return_value = (
+            fakes.create_response(), {"ddosStatus": []}
+        )
+        self.http_client.delete.return_value = (
+            fakes.create_response(), {"task_id": "task-id"}
+        )
+        self.manager.list()
+        self.manager.close_antiddos("fake-id")
+        self.manager.list()
+        self.assertEqual(2, self.http_client.get.call_count)
+
+    def test_cache_dir_shared_by_projects(self):
+        body = {"traffic_limited_list": [], "http_limited_list": []}
+        self.http_client.get.return_value = (fakes.create_response(), body)
+        other_client = mock.Mock()
+        other_client.get_endpoint.return_value = (
+            'https://antiddos.example.com/v1/project-2'
+        )
+        other_client.get.return_value = (fakes.create_response(), body)
+        other = antiddos_mgr.AntiDDosManager(
+            other_client, cache=cache.ResponseCache(self.directory)
+        )
+
+        self.manager.query_config_list()
+        other.query_config_list()
+        self.manager.query_config_list()
+        other.query_config_list()
+        self.assertEqual(1, self.http_client.get.call_count)
+        self.assertEqual(1, other_client.get.call_count)
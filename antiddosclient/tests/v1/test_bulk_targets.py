@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+from antiddosclient.tests import base
+from antiddosclient.v1 import bulk_targets
+
+
+class TestReadTargets(base.BaseTestCase):
+
+    def test_read_targets_with_defaults(self):
+        lines = [
+            '# change window\n',
+            '\n',
+            'fake-id-1\n',
+            '192.168.1.1, 100, 1000\n',
+            'fake-id-2,,,false\n',
+        ]
+        targets = bulk_targets.read_targets(lines, 70, 240, True)
+        self.assertEqual([
+            bulk_targets.BulkTarget(3, 'fake-id-1', 70, 240, True),
+            bulk_targets.BulkTarget(4, '192.168.1.1', 100, 1000, True),
+            bulk_targets.BulkTarget(5, 'fake-id-2', 70, None, False),
+        ], targets)
+
+    def test_read_targets_with_header(self):
+        lines = ['floating_ip,enable_cc,maximum_service_traffic\n',
+                 'fake-id-1,no,10\n']
+        self.assertEqual(
+            [bulk_targets.BulkTarget(2, 'fake-id-1', 10, None, False)],
+            bulk_targets.read_targets(lines)
+        )
+
+    def test_invalid_rows(self):
+        for lines, message in (
+                (['fake-id-1,11\n'], 'invalid maximum_service_traffic'),
+                (['fake-id-1,10,1,yes\n'], 'invalid http_request_rate'),
+                (['fake-id-1,10,,maybe\n'], 'line 1: invalid enable_cc'),
+                (['fake-id-1,10,100,yes,1\n'], 'line 1: expect at most 4'),
+                (['fake-id-1\n', 'fake-id-1\n'], 'line 2: floating ip'),
+                (['floating_ip,bandwidth\n'], 'line 1: unknown columns'),
+                ([',10\n'], 'line 1: floating_ip is required'),
+        ):
+            e = self.assertRaises(ValueError, bulk_targets.read_targets,
+                                  lines)
+            self.assertIn(message, str(e))
+
+    def test_read_targets_with_accepted_columns(self):
+        columns = ('floating_ip',)
+        self.assertEqual(
+            [bulk_targets.BulkTarget(1, 'fake-id-1', None, None, True)],
+            bulk_targets.read_targets(['fake-id-1\n'], columns=columns)
+        )
+        for lines, message in (
+                (['fake-id-1,10\n'], 'line 1: expect at most 1 columns'),
+                (['floating_ip,enable_cc\n'],
+                 'line 1: columns enable_cc are not supported'),
+        ):
+            e = self.assertRaises(ValueError, bulk_targets.read_targets,
+                                  lines, columns=columns)
+            self.assertIn(message, str(e))
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import mock
+
+from antiddosclient.tests import base
+from antiddosclient.tests import fakes
+from antiddosclient.v1 import antiddos_mgr
+from antiddosclient.v1 import daily_frame
+from antiddosclient.v1 import resource
+
+
+class TestDailyReportFrame(base.BaseTestCase):
+
+    rows = [
+        dict(period_start=1472713370609, bps_in=1000, bps_attack=0,
+             total_bps=1000, pps_in=10, pps_attack=0, total_pps=10),
+        dict(period_start=1472713670609, bps_in=1000, bps_attack=3000,
+             total_bps=4000, pps_in=10, pps_attack=0, total_pps=10),
+        dict(period_start=1472713970609, bps_in=2000, bps_attack=0,
+             total_bps=2000, pps_in=20, pps_attack=30, total_pps=50),
+        dict(period_start=1472714270609, bps_in=3000, bps_attack=0,
+             total_bps=3000, pps_in=30, pps_attack=0, total_pps=30),
+    ]
+
+    def setUp(self):
+        super(TestDailyReportFrame, self).setUp()
+        self.frame = daily_frame.DailyReportFrame(self.rows + [None],
+                                                  fakes.FAKE_REQUEST_ID)
+
+    def test_columns(self):
+        self.assertEqual(4, len(self.frame))
+        self.assertEqual([1000, 4000, 2000, 3000],
+                         self.frame.total_bps.tolist())
+        self.assertEqual(fakes.FAKE_REQUEST_ID, self.frame.request_id)
+
+    def test_aggregates(self):
+        frame = self.frame
+        self.assertEqual(4000, frame.peak('total_bps'))
+        self.assertEqual(2500.0, frame.mean('total_bps'))
+        self.assertEqual(2500.0, frame.percentile('total_bps', 50))
+        self.assertEqual([1000.0, 4000.0],
+                         frame.percentile('total_bps', [0, 100]))
+        self.assertEqual(0.3, frame.attack_ratio('bps'))
+        self.assertEqual(0.3, frame.attack_ratio('pps'))
+        self.assertEqual([False, True, True, False],
+                         frame.under_attack().tolist())
+        self.assertEqual(10, frame.attack_minutes())
+        self.assertEqual(10, frame.summary()['attack_minutes'])
+        self.assertRaises(ValueError, frame.peak, 'unknown')
+
+    def test_empty_frame(self):
+        frame = daily_frame.DailyReportFrame([])
+        self.assertEqual(0, len(frame))
+        self.assertIsNone(frame.peak('bps_in'))
+        self.assertIsNone(frame.percentile('bps_in', 99))
+        self.assertEqual(0.0, frame.attack_ratio())
+        self.assertEqual(0, frame.attack_minutes())
+        self.assertEqual([], frame.to_rows())
+
+    def test_to_rows(self):
+        rows = self.frame.to_rows()
+        self.assertEqual(self.rows, [row.original for row in rows])
+        self.assertIsInstance(rows[0].total_bps, int)
+        self.assertEqual(fakes.FAKE_REQUEST_ID, rows.request_id)
+
+        columns = resource.AntiDDosDailyReport.list_column_names
+        expected = [resource.AntiDDosDailyReport(None, row)
+                    for row in self.rows]
+        self.assertEqual([r.get_display_data(columns) for r in expected],
+                         [r.get_display_data(columns) for r in rows])
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_get_antiddos_daily_frame(self, mocked_get):
+        mocked_get.return_value = (fakes.create_response(),
+                                   dict(data=self.rows))
+        manager = antiddos_mgr.AntiDDosManager(mock.Mock())
+        frame = manager.get_antiddos_daily_frame('fake-id')
+        mocked_get.assert_called_once_with("/antiddos/fake-id/daily", {}, {})
+        self.assertEqual(4, len(frame))
+        self.assertEqual(fakes.FAKE_REQUEST_ID, frame.request_id)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import json
+
+import six
+
+from antiddosclient.tests import base
+from antiddosclient.v1 import export
+
+
+class TestExportWriters(base.BaseTestCase):
+
+    rows = [
+        {"start_time": 1473217200000, "end_time": 1473217500000,
+         "status": 1, "trigger_bps": 51106, "trigger_pps": 2600,
+         "trigger_http_pps": 3589},
+        {"start_time": 1473217500000, "status": 2, "new_field": "x"},
+    ]
+
+    def test_ndjson_writer(self):
+        stream = six.StringIO()
+        writer = export.NDJSONWriter(stream)
+        self.assertEqual(2, writer.write_rows('fake-id', self.rows))
+        self.assertEqual(0, writer.write_rows('fake-id-2', []))
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(stream.getvalue().endswith('\n'))
+        self.assertEqual(dict(self.rows[0], floating_ip_id='fake-id'),
+                         json.loads(lines[0]))
+        self.assertEqual(dict(self.rows[1], floating_ip_id='fake-id'),
+                         json.loads(lines[1]))
+
+    def test_csv_writer(self):
+        stream = six.StringIO()
+        writer = export.CSVWriter(stream, export.LOG_FIELDS)
+        self.assertEqual(2, writer.write_rows('fake-id', self.rows))
+        self.assertEqual(
+            'floating_ip_id,start_time,end_time,status,trigger_bps,'
+            'trigger_pps,trigger_http_pps\n'
+            'fake-id,1473217200000,1473217500000,1,51106,2600,3589\n'
+            'fake-id,1473217500000,,2,,,\n',
+            stream.getvalue()
+        )
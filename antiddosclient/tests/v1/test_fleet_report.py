@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+from antiddosclient.tests import base
+from antiddosclient.v1 import fleet_report
+from antiddosclient.v1 import resource
+
+
+def summary(index, status, peak_bps, peak_pps, minutes):
+    return resource.EIPDailySummary('id-%d' % index, '10.0.0.%d' % index,
+                                    status, peak_bps, peak_pps, minutes)
+
+
+class TestFleetDailyReport(base.BaseTestCase):
+
+    def test_summarize(self):
+        antiddos = dict(floating_ip_id='id-1', floating_ip_address='10.0.0.1',
+                        status='normal')
+        rows = [
+            dict(bps_attack=0, pps_attack=0),
+            dict(bps_attack=300, pps_attack=0),
+            None,
+            dict(bps_attack=100, pps_attack=20),
+        ]
+        self.assertEqual(summary(1, 'normal', 300, 20, 10),
+                         fleet_report.summarize(antiddos, rows))
+        self.assertEqual(summary(1, 'normal', 0, 0, 0),
+                         fleet_report.summarize(antiddos, []))
+
+    def test_fold(self):
+        report = fleet_report.FleetDailyReport(top=2)
+        summaries = [
+            summary(1, 'normal', 100, 9, 5),
+            summary(2, 'normal', 0, 0, 0),
+            summary(3, 'packetcleaning', 300, 1, 20),
+            summary(4, 'normal', 200, 5, 10),
+        ]
+        for s in summaries:
+            report.fold(s)
+        report.fold_error('id-5', Exception())
+
+        self.assertEqual(4, report.eips)
+        self.assertEqual(3, report.attacked_eips)
+        self.assertEqual(35, report.attack_minutes)
+        self.assertEqual({'eips': 3, 'attacked_eips': 2,
+                          'attack_minutes': 15},
+                         report.by_status['normal'])
+        self.assertEqual([summaries[2], summaries[3]], report.top_bps)
+        self.assertEqual([summaries[0], summaries[3]], report.top_pps)
+        self.assertEqual(['id-5'], report.failed)
+
+        result = report.to_dict()
+        self.assertEqual(35, result['attack_minutes'])
+        self.assertEqual('id-3', result['top_bps'][0]['floating_ip_id'])
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import json
+import os
+
+import fixtures
+import mock
+
+from antiddosclient.common import resource as base_resource
+from antiddosclient.tests import base
+from antiddosclient.tests import fakes
+from antiddosclient.v1 import antiddos_mgr
+from antiddosclient.v1 import log_sync
+from antiddosclient.v1 import resource
+
+
+def make_logs(*times):
+    return [resource.AntiDDosLog(None, dict(start_time=start,
+                                            end_time=end, status=1))
+            for start, end in times]
+
+
+class TestLogSyncState(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestLogSyncState, self).setUp()
+        directory = self.useFixture(fixtures.TempDir()).path
+        self.path = os.path.join(directory, 'sub', 'state.json')
+
+    def test_save_and_load(self):
+        state = log_sync.LogSyncState(self.path)
+        self.assertIsNone(state.get('fake-id'))
+        state.set('fake-id', [300, 600])
+        state.set('other-id', (1, 2))
+        state.remove('other-id')
+        state.save()
+
+        self.assertEqual((300, 600),
+                         log_sync.LogSyncState(self.path).get('fake-id'))
+        directory = os.path.dirname(self.path)
+        self.assertEqual(['state.json'], os.listdir(directory))
+
+    def test_invalid_state_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        for content in ('not json', json.dumps([1]),
+                        json.dumps({'version': 0, 'marks': {'a': [1, 2]}})):
+            with open(self.path, 'w') as f:
+                f.write(content)
+            self.assertIsNone(log_sync.LogSyncState(self.path).get('a'))
+
+    def test_is_known(self):
+        log, = make_logs((300, 600))
+        self.assertFalse(log_sync.is_known(log, None))
+        self.assertTrue(log_sync.is_known(log, (300, 600)))
+        self.assertTrue(log_sync.is_known(log, (900, 1200)))
+        self.assertFalse(log_sync.is_known(log, (0, 300)))
+        # ongoing event got a later end time
+        self.assertFalse(log_sync.is_known(log, (300, 450)))
+
+
+class TestSyncAntiDDosDailyLogs(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestSyncAntiDDosDailyLogs, self).setUp()
+        self.manager = antiddos_mgr.AntiDDosManager(mock.Mock())
+        self.state = mock.Mock()
+        self.state.get.return_value = None
+
+    def _pages(self, *pages):
+        return [base_resource.ListWithMeta(page, fakes.FAKE_REQUEST_ID)
+                for page in pages]
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager,
+                       "get_antiddos_daily_logs")
+    def test_first_sync(self, mocked_logs):
+        mocked_logs.side_effect = self._pages(
+            make_logs((900, 1200), (600, 900)), make_logs((300, 600))
+        )
+        logs = self.manager.sync_antiddos_daily_logs('fake-id', self.state,
+                                                     page_size=2)
+        self.assertEqual([300, 600, 900], [log.start_time for log in logs])
+        self.assertEqual(fakes.FAKE_REQUEST_ID, logs.request_id)
+        mocked_logs.assert_has_calls([
+            mock.call('fake-id', 'desc', 2, 0),
+            mock.call('fake-id', 'desc', 2, 2),
+        ])
+        self.state.set.assert_called_once_with('fake-id', (900, 1200))
+        self.state.save.assert_called_once_with()
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager,
+                       "get_antiddos_daily_logs")
+    def test_stop_at_known_log(self, mocked_logs):
+        self.state.get.return_value = (600, 900)
+        mocked_logs.side_effect = self._pages(
+            make_logs((1200, 1500), (900, 1200)),
+            make_logs((900, 1200), (600, 900)),
+            make_logs((300, 600)),
+        )
+        logs = self.manager.sync_antiddos_daily_logs('fake-id', self.state,
+                                                     page_size=2)
+        # log shifted to next page is not returned twice
+        self.assertEqual([900, 1200], [log.start_time for log in logs])
+        self.assertEqual(2, mocked_logs.call_count)
+        self.state.set.assert_called_once_with('fake-id', (1200, 1500))
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager,
+                       "get_antiddos_daily_logs")
+    def test_nothing_new(self, mocked_logs):
+        self.state.get.return_value = (600, 900)
+        mocked_logs.side_effect = self._pages(make_logs((600, 900)))
+        logs = self.manager.sync_antiddos_daily_logs('fake-id', self.state)
+        self.assertEqual([], logs)
+        self.state.save.assert_not_called()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import os
+
+import fixtures
+import mock
+
+from antiddosclient.tests import base
+from antiddosclient.tests import fakes
+from antiddosclient.v1 import antiddos_mgr
+from antiddosclient.v1 import report_store
+from antiddosclient.v1 import resource
+
+START = 1472713370609
+INTERVAL = 300000
+
+
+def make_rows(first, count):
+    return [dict(period_start=START + i * INTERVAL, bps_in=i,
+                 bps_attack=i % 2, total_bps=i + i % 2, pps_in=i,
+                 pps_attack=0, total_pps=i)
+            for i in range(first, first + count)]
+
+
+class TestReportStore(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestReportStore, self).setUp()
+        self.path = os.path.join(self.useFixture(fixtures.TempDir()).path,
+                                 'store')
+        self.store = report_store.ReportStore(self.path)
+
+    def test_append_and_query(self):
+        self.assertEqual(10, self.store.append('fake-id', make_rows(0, 10)))
+        result = self.store.query('fake-id')
+        self.assertEqual([START + i * INTERVAL for i in range(10)],
+                         result['period_start'].tolist())
+        self.assertEqual(list(range(10)), result['bps_in'].tolist())
+        self.assertEqual(['fake-id'], self.store.floating_ip_ids())
+
+        # period_start is 4 bytes a row after the first one
+        self.assertEqual(8 + 10 * 4, os.path.getsize(
+            os.path.join(self.path, 'fake-id', 'period_start.delta')
+        ))
+
+    def test_append_deduplicates(self):
+        self.store.append('fake-id', make_rows(0, 10))
+        # overlapping report, duplicated rows in the same batch
+        rows = make_rows(5, 10) + make_rows(14, 1)
+        self.assertEqual(5, self.store.append('fake-id', reversed(rows)))
+        self.assertEqual(0, self.store.append('fake-id', rows))
+        times = self.store.query('fake-id')['period_start']
+        self.assertEqual(15, len(times))
+        self.assertEqual(list(range(15)),
+                         ((times - START) // INTERVAL).tolist())
+
+    def test_append_resources(self):
+        rows = [resource.AntiDDosDailyReport(None, row)
+                for row in make_rows(0, 3)]
+        self.assertEqual(3, self.store.append('fake-id', rows + [None]))
+        self.assertEqual([0, 1, 0],
+                         self.store.query('fake-id')['bps_attack'].tolist())
+
+    def test_query_range(self):
+        self.store.append('fake-id', make_rows(0, 100))
+        result = self.store.query('fake-id', START + 10 * INTERVAL,
+                                  START + 20 * INTERVAL,
+                                  columns=['total_bps'])
+        self.assertEqual(['period_start', 'total_bps'], sorted(result))
+        self.assertEqual(START + 10 * INTERVAL, result['period_start'][0])
+        self.assertEqual([i + i % 2 for i in range(10, 20)],
+                         result['total_bps'].tolist())
+        self.assertEqual(0, len(self.store.query(
+            'fake-id', START + 100 * INTERVAL)['bps_in']))
+        self.assertRaises(ValueError, self.store.query, 'fake-id',
+                          columns=['unknown'])
+
+    def test_query_unknown_eip(self):
+        result = self.store.query('unknown-id')
+        self.assertEqual(0, len(result['period_start']))
+        self.assertEqual(0, len(result['bps_in']))
+        self.assertEqual([], self.store.floating_ip_ids())
+        self.assertRaises(ValueError, self.store.query, '../fake-id')
+
+    def test_reopen_and_query_many(self):
+        self.store.append('fake-id-1', make_rows(0, 10))
+        self.store.append('fake-id-2', make_rows(0, 20))
+        # rows appended by another store are seen
+        self.store.query('fake-id-1')
+        report_store.ReportStore(self.path).append('fake-id-1',
+                                                   make_rows(10, 5))
+        results = self.store.query_many(end=START + 12 * INTERVAL)
+        self.assertEqual(['fake-id-1', 'fake-id-2'], sorted(results))
+        self.assertEqual(12, len(results['fake-id-1']['bps_in']))
+        self.assertEqual(15, len(self.store.query('fake-id-1')['bps_in']))
+
+    def test_interrupted_append(self):
+        self.store.append('fake-id', make_rows(0, 10))
+        # metrics of a row are written but its time is not
+        with open(os.path.join(self.path, 'fake-id', 'bps_in.i8'),
+                  'ab') as f:
+            f.write(b'\x01' * 8)
+        self.assertEqual(10, len(self.store.query('fake-id')['bps_in']))
+        self.store.append('fake-id', make_rows(10, 1))
+        self.assertEqual(list(range(11)),
+                         self.store.query('fake-id')['bps_in'].tolist())
+
+    def test_gap_too_long(self):
+        self.store.append('fake-id', make_rows(0, 1))
+        rows = [dict(period_start=START + 2 ** 32)]
+        self.assertRaises(ValueError, self.store.append, 'fake-id', rows)
+        self.store.remove('fake-id')
+        self.assertEqual(1, self.store.append('fake-id', rows))
+
+    def test_frame(self):
+        self.store.append('fake-id', make_rows(0, 10))
+        frame = self.store.frame('fake-id', end=START + 4 * INTERVAL)
+        self.assertEqual(4, len(frame))
+        self.assertEqual(10, frame.attack_minutes())
+        self.assertEqual(4, frame.peak('total_bps'))
+
+    @mock.patch.object(antiddos_mgr.AntiDDosManager, "_http_get")
+    def test_archive_antiddos_daily_report(self, mocked_get):
+        mocked_get.return_value = (fakes.create_response(),
+                                   dict(data=make_rows(0, 5)))
+        manager = antiddos_mgr.AntiDDosManager(mock.Mock())
+        self.assertEqual(5, manager.archive_antiddos_daily_report(
+            'fake-id', self.store
+        ))
+        mocked_get.assert_called_once_with("/antiddos/fake-id/daily", {}, {})
+        self.assertEqual(0, manager.archive_antiddos_daily_report(
+            'fake-id', self.store
+        ))
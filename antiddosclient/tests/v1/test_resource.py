@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+from antiddosclient.tests import base
+from antiddosclient.v1 import resource
+
+
+class TestCompactRows(base.BaseTestCase):
+
+    def test_antiddos_display_data(self):
+        antiddos = resource.AntiDDos(None, {
+            "floating_ip_id": "fake-id",
+            "floating_ip_address": "192.168.42.221",
+            "network_type": "EIP",
+            "status": "normal",
+        }, attached=True)
+        self.assertEqual(
+            ("fake-id", "192.168.42.221", "EIP", "normal"),
+            antiddos.get_display_data(resource.AntiDDos.list_column_names)
+        )
+
+    def test_configured_antiddos(self):
+        antiddos = resource.AntiDDos(None, {
+            "enable_L7": True,
+            "traffic_pos_id": 1,
+            "http_request_pos_id": 1,
+            "cleaning_access_pos_id": 1,
+            "app_type_id": 1,
+        }, attached=True)
+        antiddos.floating_ip_id = "fake-id"
+        self.assertEqual(
+            ("Enabled", "10Mbit/s", "100/s"),
+            antiddos.get_display_data(resource.AntiDDos.show_column_names)
+        )
+        self.assertEqual("fake-id", antiddos.original["floating_ip_id"])
+
+    def test_log_and_daily_report(self):
+        log = resource.AntiDDosLog(None, {
+            "start_time": 1473217200000,
+            "end_time": 1473242400000,
+            "status": 1,
+            "trigger_bps": 51106,
+            "trigger_pps": 2600,
+            "trigger_http_pps": 3589,
+        }, attached=True)
+        self.assertEqual('Packet Cleaning', log.antiddos_status)
+        self.assertEqual(51106, log.trigger_bps)
+
+        report = resource.AntiDDosDailyReport(None, {
+            "period_start": 1472713370609,
+            "bps_in": 1,
+            "bps_attack": 2,
+            "total_bps": 3,
+            "pps_in": 4,
+            "pps_attack": 5,
+            "total_pps": 6,
+        }, attached=True)
+        self.assertEqual((1, 2, 3, 4, 5, 6), report.get_display_data(
+            resource.AntiDDosDailyReport.list_column_names[1:]
+        ))
+
+
+class TestWeeklyReports(base.BaseTestCase):
+
+    body = {
+        "ddos_intercept_times": 3,
+        "weekdata": [
+            {"ddos_intercept_times": 1, "ddos_blackhole_times": 1,
+             "max_attack_bps": 100, "max_attack_conns": 2,
+             "period_start_date": 1474214461651},
+            {"ddos_intercept_times": 2, "ddos_blackhole_times": 0,
+             "max_attack_bps": 300, "max_attack_conns": 1,
+             "period_start_date": 1474300861651},
+        ],
+        "top10": [
+            {"floating_ip_address": "192.168.44.69", "times": 2},
+            {"floating_ip_address": "192.168.44.70", "times": 1},
+        ],
+    }
+
+    def test_weekly_data_is_idempotent(self):
+        report = resource.AntiDDosWeeklyReport(None, self.body,
+                                               attached=True)
+        weekly_data = report.weekly_data
+        self.assertEqual(weekly_data, report.weekly_data)
+        self.assertIn("period_start_date='", weekly_data)
+        self.assertEqual(1474214461651,
+                         report.weekdata[0]["period_start_date"])
+
+    def test_week_from_body(self):
+        week = resource.WeeklyReportWeek.from_body(1474214400000, self.body)
+        self.assertEqual(3, week.ddos_intercept_times)
+        self.assertEqual(1474300861651, week.days[1].period_start_date)
+        self.assertEqual(1, week.ddos_blackhole_times)
+        self.assertEqual(300, week.max_attack_bps)
+        self.assertEqual(2, week.max_attack_conns)
+        self.assertEqual("192.168.44.69", week.top_ip)
+        self.assertEqual((3, 1, 300, 2, "192.168.44.69"),
+                         week.get_display_data(
+                             resource.WeeklyReportWeek.list_column_names[1:]
+                         ))
+
+        empty = resource.WeeklyReportWeek.from_body(1474214400000, {})
+        self.assertEqual((0, 0, 0, 0, ''), empty.get_display_data(
+            resource.WeeklyReportWeek.list_column_names[1:]
+        ))
+
+    def test_range(self):
+        other = dict(self.body, top10=[
+            {"floating_ip_address": "192.168.44.70", "times": 5},
+        ])
+        weeks = resource.WeeklyReportRange([
+            resource.WeeklyReportWeek.from_body(1474214400000, self.body),
+            resource.WeeklyReportWeek.from_body(1474819200000, other),
+        ], None)
+        self.assertEqual(6, weeks.ddos_intercept_times)
+        self.assertEqual(4, len(weeks.days))
+        self.assertEqual([("192.168.44.70", 6), ("192.168.44.69", 2)],
+                         weeks.top10)
+
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import collections
+
+import mock
+from keystoneauth1 import exceptions
+
+from antiddosclient.tests import base
+from antiddosclient.v1 import status_watch
+
+
+def make_snapshot(*rows):
+    return collections.OrderedDict(
+        (floating_ip_id, (address, status))
+        for floating_ip_id, address, status in rows
+    )
+
+
+class TestDiffSnapshots(base.BaseTestCase):
+
+    def test_diff_snapshots(self):
+        previous = make_snapshot(('id-1', '1.1.1.1', 'normal'),
+                                 ('id-2', '1.1.1.2', 'normal'),
+                                 ('id-3', '1.1.1.3', 'normal'))
+        current = make_snapshot(('id-4', '1.1.1.4', 'notConfig'),
+                                ('id-2', '1.1.1.2', 'packetcleaning'),
+                                ('id-1', '1.1.1.1', 'normal'))
+        self.assertEqual([
+            status_watch.StatusTransition('id-4', '1.1.1.4', None,
+                                          'notConfig'),
+            status_watch.StatusTransition('id-2', '1.1.1.2', 'normal',
+                                          'packetcleaning'),
+            status_watch.StatusTransition('id-3', '1.1.1.3', 'normal', None),
+        ], status_watch.diff_snapshots(previous, current))
+        self.assertEqual([], status_watch.diff_snapshots(current, current))
+
+
+class TestStatusWatcher(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestStatusWatcher, self).setUp()
+        self.now = [100.0]
+        self.sleep = mock.Mock(side_effect=self._sleep)
+
+    def _sleep(self, seconds):
+        self.now[0] += seconds
+
+    def clock(self):
+        return self.now[0]
+
+    def test_watch(self):
+        snapshots = [
+            make_snapshot(('id-1', '1.1.1.1', 'normal')),
+            make_snapshot(('id-1', '1.1.1.1', 'normal')),
+            make_snapshot(('id-1', '1.1.1.1', 'packetdropping')),
+        ]
+        watcher = status_watch.StatusWatcher(
+            mock.Mock(side_effect=snapshots))
+        polls = list(watcher.watch(5, polls=3, sleep=self.sleep,
+                                   clock=self.clock))
+
+        self.assertEqual([100.0, 105.0, 110.0], [p[0] for p in polls])
+        self.assertEqual([[], []], [p[1] for p in polls[:2]])
+        self.assertEqual([status_watch.StatusTransition(
+            'id-1', '1.1.1.1', 'normal', 'packetdropping')], polls[2][1])
+        self.assertEqual(snapshots[2], watcher.snapshot)
+
+    def test_failed_poll_keeps_snapshot(self):
+        on_error = mock.Mock()
+        watcher = status_watch.StatusWatcher(mock.Mock(side_effect=[
+            make_snapshot(('id-1', '1.1.1.1', 'normal')),
+            exceptions.ServiceUnavailable(),
+            make_snapshot(('id-1', '1.1.1.1', 'packetcleaning')),
+        ]))
+        polls = list(watcher.watch(5, polls=3, on_error=on_error,
+                                   sleep=self.sleep, clock=self.clock))
+
+        self.assertEqual(2, len(polls))
+        self.assertEqual(1, on_error.call_count)
+        self.assertEqual('packetcleaning', polls[1][1][0].new_status)
+
+    def test_failed_poll_raised_without_on_error(self):
+        watcher = status_watch.StatusWatcher(
+            mock.Mock(side_effect=exceptions.ServiceUnavailable()))
+        self.assertRaises(exceptions.ServiceUnavailable, list,
+                          watcher.watch(5, sleep=self.sleep,
+                                        clock=self.clock))
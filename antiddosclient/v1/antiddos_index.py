@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import bisect
+import threading
+import time
+
+# default seconds an index snapshot lives
+DEFAULT_INDEX_TTL = 300
+# min seconds between two refreshes caused by lookup miss
+DEFAULT_MISS_REFRESH_INTERVAL = 10
+
+
+class AntiDDosIndex(object):
+    """In-memory lookup index of an antiddos status snapshot
+
+    The snapshot is built from full listing of all EIP, exact IP and
+    floating ip id lookups are hash map lookups, prefix lookups are binary
+    searches on sorted IP list. Snapshot is rebuilt when it is older than
+    ``ttl`` seconds, or when a lookup missed and the snapshot is older than
+    ``miss_refresh_interval`` seconds. Entries changed by writes are
+    dropped with discard, a lookup matching one of them rebuilds the
+    snapshot at once.
+    """
+
+    def __init__(self, loader, ttl=DEFAULT_INDEX_TTL,
+                 miss_refresh_interval=DEFAULT_MISS_REFRESH_INTERVAL):
+        """initial index
+
+        :param loader: function returns iterable of all AntiDDos
+        :param ttl: seconds a snapshot lives
+        :param miss_refresh_interval: min seconds between refresh on miss
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.miss_refresh_interval = miss_refresh_interval
+
+        self._by_id = {}
+        self._by_ip = {}
+        self._sorted_ips = []
+        # ids and IPs of entries dropped by discard since last rebuild
+        self._stale_ids = set()
+        self._stale_ips = set()
+        self._built_at = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def age(self):
+        """seconds since snapshot built, None if never built"""
+        if self._built_at is None:
+            return None
+        return time.time() - self._built_at
+
+    def is_expired(self):
+        age = self.age()
+        return age is None or age > self.ttl
+
+    def invalidate(self):
+        """drop snapshot, next lookup will rebuild it"""
+        self._built_at = None
+
+    def discard(self, floating_ip_id):
+        """drop the entry of a floating ip changed by a write
+
+        lookups matching the floating ip id or its IP rebuild the snapshot,
+        other lookups keep using it.
+        """
+        with self._lock:
+            self._stale_ids.add(floating_ip_id)
+            antiddos = self._by_id.pop(floating_ip_id, None)
+            if antiddos is None:
+                return
+            ip = antiddos.floating_ip_address
+            self._stale_ips.add(ip)
+            self._by_ip.pop(ip, None)
+            ips = self._sorted_ips
+            position = bisect.bisect_left(ips, ip)
+            if position < len(ips) and ips[position] == ip:
+                self._sorted_ips = ips[:position] + ips[position + 1:]
+
+    def _is_stale(self, keyword):
+        return (keyword in self._stale_ids or
+                any(ip.startswith(keyword) for ip in self._stale_ips))
+
+    def refresh(self, max_age=None, stale=None):
+        """rebuild snapshot
+
+        :param max_age: only rebuild when snapshot is older than max_age,
+            concurrent callers wait for the running rebuild and reuse it
+        :param stale: only rebuild when the keyword still matches an entry
+            dropped by discard
+        """
+        with self._lock:
+            age = self.age()
+            if max_age is not None and age is not None and age <= max_age:
+                return
+            if stale is not None and not self._is_stale(stale):
+                return
+            by_id = {}
+            by_ip = {}
+            for antiddos in self.loader():
+                by_id[antiddos.floating_ip_id] = antiddos
+                by_ip[antiddos.floating_ip_address] = antiddos
+            self._by_id = by_id
+            self._by_ip = by_ip
+            self._sorted_ips = sorted(by_ip)
+            self._stale_ids = set()
+            self._stale_ips = set()
+            self._built_at = time.time()
+
+    def _lookup(self, keyword):
+        matched = self._by_id.get(keyword) or self._by_ip.get(keyword)
+        if matched:
+            return [matched]
+
+        ips = self._sorted_ips
+        start = bisect.bisect_left(ips, keyword)
+        end = start
+        while end < len(ips) and ips[end].startswith(keyword):
+            end += 1
+        return [self._by_ip[ip] for ip in ips[start:end]]
+
+    def lookup(self, keyword):
+        """lookup antiddos by floating ip id, exact IP or IP prefix
+
+        :return: list of matched AntiDDos, exactly matched one only if
+            keyword is an id or an exact IP
+        """
+        if self.is_expired():
+            self.refresh(max_age=self.ttl)
+        elif self._is_stale(keyword):
+            self.refresh(stale=keyword)
+
+        matched = self._lookup(keyword)
+        if not matched:
+            self.refresh(max_age=self.miss_refresh_interval)
+            matched = self._lookup(keyword)
+        return matched
@@ -12,45 +12,84 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
+import collections
+from concurrent import futures
+import datetime
+import random
 import re
+import threading
 import time
 
+from antiddosclient.common import cache
 from antiddosclient.common import exceptions as execs
 from antiddosclient.common import manager
+from antiddosclient.common import resource as base_resource
 from antiddosclient.common import utils
 from antiddosclient.common.i18n import _
+from antiddosclient.v1 import antiddos_index
+from antiddosclient.v1 import fleet_report
+from antiddosclient.v1 import log_sync
 from antiddosclient.v1 import resource
 from keystoneauth1 import exceptions
+from six.moves import queue
 
 IP_PATTERN = re.compile(r'(\d{0,3}\.){1,3}(\d{0,3})$')
 
+# default worker number of bulk operations
+DEFAULT_BULK_CONCURRENCY = 10
+# row chunks (e.g. log pages) a worker of export fetches ahead of the
+# consumer
+ROW_CHUNKS_AHEAD = 2
+
+# seconds antiddos config list is cached
+CONFIG_CACHE_TTL = 24 * 3600
+
+
+def _to_epoch_millis(date):
+    """local datetime to milliseconds since epoch"""
+    return int(time.mktime(date.timetuple()) * 1000)
+
+
+def _is_past_week(params, body):
+    """weekly report of a finished week never changes"""
+    period_start_date = params.get('period_start_date')
+    if not period_start_date:
+        return False
+    return period_start_date / 1000 + 7 * 24 * 3600 < time.time()
+
+
+def _is_task_finished(params, body):
+    """finished task status never changes"""
+    finished_status_list = resource.AntiDDosTask.finished_status_list
+    return body.get('task_status') in finished_status_list
+
+
+class BaseAntiDDosManager(manager.BaseManager):
+    """AntiDDos functions shared by the sync and the async manager
+
+    every function sends one request with a request helper and returns
+    its result, so it is a coroutine function of the async manager too.
+    """
 
-class AntiDDosManager(manager.Manager):
     resource_class = resource.AntiDDos
 
-    def find(self, keyword):
-        """find antiddos by keyword (UUID or IP)"""
-        if not IP_PATTERN.match(keyword):
-            try:
-                # try keyword as UUID
-                return self.get_antiddos(keyword)
-            except exceptions.ClientException as e:
-                pass
-        else:
-            # try keyword as IP
-            results = self.list(ip=keyword)
-            matched_number = len(results)
-            if matched_number > 1:
-                exactly_matched = [obj for obj in results
-                                   if obj.floating_ip_address == keyword]
-                if len(exactly_matched) == 1:
-                    return exactly_matched[0]
-                raise execs.NotUniqueMatch
-            elif matched_number == 1:
-                return results[0]
+    @staticmethod
+    def _match_ip(keyword, results):
+        """pick the antiddos matches IP keyword from ip query results
 
-        message = _("AntiDDos with ID or IP '%s' not exists.") % keyword
-        raise exceptions.NotFound(message)
+        :return: matched antiddos, None if nothing matched
+        :raise NotUniqueMatch: if keyword matches more than one antiddos
+        """
+        matched_number = len(results)
+        if matched_number > 1:
+            exactly_matched = [obj for obj in results
+                               if obj.floating_ip_address == keyword]
+            if len(exactly_matched) == 1:
+                return exactly_matched[0]
+            raise execs.NotUniqueMatch
+        elif matched_number == 1:
+            return results[0]
+        return None
 
     def query_config_list(self):
         """query antiddos config list"""
@@ -82,13 +121,9 @@ class AntiDDosManager(manager.Manager):
         """close AntiDDos"""
         return self._delete("/antiddos/%s" % floating_ip_id)
 
-    def get_antiddos(self, floating_ip_id):
-        """get AntiDDos
-
-        if antiddos is notConfig
-
-        """
-        _antiddos = self._get("/antiddos/%s" % floating_ip_id)
+    @staticmethod
+    def _as_antiddos(floating_ip_id, _antiddos):
+        """convert get antiddos response to AntiDDos resource"""
         if isinstance(_antiddos, resource.AntiDDos):
             # server does not return floating ip id in response..
             _antiddos.floating_ip_id = floating_ip_id
@@ -99,8 +134,10 @@ class AntiDDosManager(manager.Manager):
                 'floating_ip_id': floating_ip_id,
                 'status': 'notConfig'
             }
-            return resource.AntiDDos(None, _instance, attached=True,
-                                     resp=_antiddos.request_id)
+            _antiddos = resource.AntiDDos(None, _instance, attached=True,
+                                          resp=_antiddos.request_id)
+            # antiddos is not configured, there are no settings to load
+            return _antiddos.merge(None)
 
     def update_antiddos(
             self,
@@ -183,9 +220,8 @@ class AntiDDosManager(manager.Manager):
         :return:
         """
         if period_start_date:
-            epoch = time.mktime(period_start_date.timetuple())
             params = utils.remove_empty_from_dict({
-                "period_start_date": int(epoch * 1000)
+                "period_start_date": _to_epoch_millis(period_start_date)
             })
         else:
             params = {}
@@ -193,3 +229,761 @@ class AntiDDosManager(manager.Manager):
         return self._get(url,
                          params=params,
                          resource_class=resource.AntiDDosWeeklyReport)
+
+
+class AntiDDosManager(BaseAntiDDosManager, manager.Manager):
+    cache_policies = (
+        cache.CachePolicy(r'^/antiddos/query_config_list$',
+                          ttl=CONFIG_CACHE_TTL),
+        cache.CachePolicy(r'^/antiddos/weekly$', immutable=_is_past_week),
+        cache.CachePolicy(r'^/query_task_status$',
+                          immutable=_is_task_finished),
+    )
+
+    # local lookup index used by find, disabled by default
+    index = None
+
+    def __init__(self, http_client, cache=None):
+        super(AntiDDosManager, self).__init__(http_client, cache=cache)
+        # WeeklyReportWeek of finished weeks by period start date
+        self._weekly_reports = {}
+
+    def enable_index(
+            self,
+            ttl=antiddos_index.DEFAULT_INDEX_TTL,
+            miss_refresh_interval=antiddos_index.DEFAULT_MISS_REFRESH_INTERVAL
+    ):
+        """enable local lookup index for find
+
+        once enabled, find resolves keyword from an in-memory snapshot of
+        all EIP instead of sending requests. Matched results are status
+        listing records, status of them may be stale as long as ``ttl``,
+        except for floating IPs opened, closed or updated by this manager,
+        which are looked up again.
+
+        :param ttl: seconds a snapshot lives
+        :param miss_refresh_interval: min seconds between two refreshes
+            caused by keyword not found
+        :rtype: AntiDDosIndex
+        """
+        self.index = antiddos_index.AntiDDosIndex(self.iter_list,
+                                                  ttl,
+                                                  miss_refresh_interval)
+        return self.index
+
+    def disable_index(self):
+        """disable local lookup index for find"""
+        self.index = None
+
+    def _discard_from_index(self, floating_ip_id):
+        if self.index is not None:
+            self.index.discard(floating_ip_id)
+
+    def open_antiddos(self, floating_ip_id, *args):
+        """Open AntiDDos, see BaseAntiDDosManager.open_antiddos"""
+        task = super(AntiDDosManager, self).open_antiddos(floating_ip_id,
+                                                          *args)
+        self._discard_from_index(floating_ip_id)
+        return task
+
+    def close_antiddos(self, floating_ip_id):
+        """close AntiDDos"""
+        task = super(AntiDDosManager, self).close_antiddos(floating_ip_id)
+        self._discard_from_index(floating_ip_id)
+        return task
+
+    def update_antiddos(self, floating_ip_id, *args):
+        """update anti DDos, see BaseAntiDDosManager.update_antiddos"""
+        task = super(AntiDDosManager, self).update_antiddos(floating_ip_id,
+                                                            *args)
+        self._discard_from_index(floating_ip_id)
+        return task
+
+    def find(self, keyword):
+        """find antiddos by keyword (UUID or IP)"""
+        if self.index is not None:
+            return self._find_in_index(keyword)
+
+        if not IP_PATTERN.match(keyword):
+            try:
+                # try keyword as UUID
+                return self.get_antiddos(keyword)
+            except exceptions.ClientException as e:
+                pass
+        else:
+            # try keyword as IP
+            results = self.list(ip=keyword)
+            matched = self._match_ip(keyword, results)
+            if matched:
+                return matched
+
+        message = _("AntiDDos with ID or IP '%s' not exists.") % keyword
+        raise exceptions.NotFound(message)
+
+    def _find_in_index(self, keyword):
+        """find antiddos by UUID, exact IP or IP prefix with local index"""
+        results = self.index.lookup(keyword)
+        if len(results) > 1:
+            raise execs.NotUniqueMatch
+        elif results:
+            return results[0]
+        message = _("AntiDDos with ID or IP '%s' not exists.") % keyword
+        raise exceptions.NotFound(message)
+
+    def bulk_open_antiddos(
+            self,
+            floating_ips,
+            enable_l7,
+            traffic_pos_id,
+            http_request_pos_id,
+            cleaning_access_pos_id,
+            app_type_id,
+            concurrency=DEFAULT_BULK_CONCURRENCY
+    ):
+        """Open AntiDDos for floating IPs concurrently
+
+        :param floating_ips: floating IP list (UUID or IP)
+        :param concurrency: max requests run at the same time
+        :return: OrderedDict maps floating IP to BulkTaskResult
+        """
+        def _open(floating_ip_id):
+            return self.open_antiddos(floating_ip_id,
+                                      enable_l7,
+                                      traffic_pos_id,
+                                      http_request_pos_id,
+                                      cleaning_access_pos_id,
+                                      app_type_id)
+        return self._bulk(floating_ips, _open, concurrency)
+
+    def bulk_close_antiddos(self, floating_ips,
+                            concurrency=DEFAULT_BULK_CONCURRENCY):
+        """close AntiDDos of floating IPs concurrently
+
+        :param floating_ips: floating IP list (UUID or IP)
+        :param concurrency: max requests run at the same time
+        :return: OrderedDict maps floating IP to BulkTaskResult
+        """
+        return self._bulk(floating_ips, self.close_antiddos, concurrency)
+
+    def bulk_update_antiddos(
+            self,
+            floating_ips,
+            enable_l7,
+            traffic_pos_id,
+            http_request_pos_id,
+            cleaning_access_pos_id,
+            app_type_id,
+            concurrency=DEFAULT_BULK_CONCURRENCY
+    ):
+        """update AntiDDos of floating IPs concurrently
+
+        :param floating_ips: floating IP list (UUID or IP)
+        :param concurrency: max requests run at the same time
+        :return: OrderedDict maps floating IP to BulkTaskResult
+        """
+        def _update(floating_ip_id):
+            return self.update_antiddos(floating_ip_id,
+                                        enable_l7,
+                                        traffic_pos_id,
+                                        http_request_pos_id,
+                                        cleaning_access_pos_id,
+                                        app_type_id)
+        return self._bulk(floating_ips, _update, concurrency)
+
+    def _resolve_floating_ip_id(self, keyword):
+        """resolve keyword to floating ip id
+
+        UUID keyword is used directly, which saves a round trip, server
+        reports not exists floating ip id when it is used.
+        """
+        if IP_PATTERN.match(keyword):
+            return self.find(keyword).floating_ip_id
+        return keyword
+
+    def _bulk(self, floating_ips, action, concurrency):
+        """run action for floating IPs with a bounded thread pool
+
+        :param action: function accepts floating ip id and returns task
+        :return: OrderedDict maps floating IP to BulkTaskResult
+        """
+        return self.bulk_apply([(keyword, ()) for keyword in floating_ips],
+                               action, concurrency)
+
+    def bulk_apply(self, targets, action,
+                   concurrency=DEFAULT_BULK_CONCURRENCY, callback=None):
+        """run action for floating IPs with their own arguments concurrently
+
+        action is called as ``action(floating_ip_id, *arguments)``, e.g.
+        open_antiddos with the settings of every floating IP.
+
+        :param targets: (floating IP, arguments) pairs, floating IP is UUID
+            or IP, the last arguments win if a floating IP is repeated
+        :param action: function returns the task, e.g. update_antiddos
+        :param concurrency: max requests run at the same time
+        :param callback: called as ``callback(floating_ip, result)`` in the
+            calling thread as soon as a floating IP is done
+        :return: OrderedDict maps floating IP to BulkTaskResult, in the
+            order of targets
+        """
+        def _run(keyword, arguments):
+            floating_ip_id = None
+            try:
+                floating_ip_id = self._resolve_floating_ip_id(keyword)
+                task = action(floating_ip_id, *arguments)
+            except exceptions.ClientException as e:
+                return resource.BulkTaskResult(floating_ip_id, None, e, False)
+
+            if isinstance(task, dict) and task.get('task_id'):
+                return resource.BulkTaskResult(floating_ip_id,
+                                               task['task_id'],
+                                               None,
+                                               False)
+            # update returns no body when configuration is not changed
+            if isinstance(task, base_resource.StrWithMeta):
+                return resource.BulkTaskResult(floating_ip_id, None, None,
+                                               True)
+            error = exceptions.ClientException(
+                'unexpected response without task id: %r' % (task,)
+            )
+            return resource.BulkTaskResult(floating_ip_id, None, error, False)
+
+        targets = collections.OrderedDict(targets)
+        results = collections.OrderedDict.fromkeys(targets)
+        workers = max(1, min(concurrency, len(targets)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = dict((executor.submit(_run, keyword, arguments), keyword)
+                           for keyword, arguments in targets.items())
+            for future in futures.as_completed(pending):
+                keyword = pending[future]
+                results[keyword] = future.result()
+                if callback:
+                    callback(keyword, results[keyword])
+        return results
+
+    def get_antiddos(self, floating_ip_id):
+        """get AntiDDos
+
+        if antiddos is notConfig
+
+        """
+        _antiddos = self._get("/antiddos/%s" % floating_ip_id)
+        return self._as_antiddos(floating_ip_id, _antiddos)
+
+    def _get_detail(self, antiddos):
+        """fetch antiddos settings of a status listing record for hydrate"""
+        if antiddos.status == 'notConfig':
+            # status listing already tells there are no settings
+            return None
+        detail = self.get_antiddos(antiddos.floating_ip_id)
+        return dict((field, value)
+                    for field, value in detail.original.items()
+                    if field in resource.AntiDDos.detail_fields)
+
+    def stream_list(self, status=None, ip=None, limit=None, offset=None):
+        """stream antiddos status of all EIP
+
+        rows are decoded one by one from the response while iterating,
+        memory does not grow with the fleet size, ``total`` of the response
+        is available from ``meta`` of the result once it is read.
+
+        :param status:
+            normal|configging|notConfig|packetcleaning|packetdropping
+        :param ip: query for ip matches ".*ip.*"
+        :param limit: max returned length
+        :param offset: query offset
+        :return: StreamWithMeta of AntiDDos
+        """
+        params = utils.remove_empty_from_dict({
+            "status": status,
+            "ip": ip,
+            "limit": limit,
+            "offset": offset,
+        })
+        return self._stream("/antiddos", params=params, key='ddosStatus')
+
+    def iter_list(self, status=None, ip=None,
+                  page_size=manager.DEFAULT_PAGE_SIZE,
+                  window=manager.DEFAULT_PAGE_WINDOW, offset=None):
+        """iterate antiddos status of all EIP page by page
+
+        next pages are fetched in background while current page is consumed
+
+        :param status:
+            normal|configging|notConfig|packetcleaning|packetdropping
+        :param ip: query for ip matches ".*ip.*"
+        :param page_size: max returned length of every page request
+        :param window: max pages fetched ahead
+        :param offset: start offset
+        :return: generator of AntiDDos
+        """
+        def fetch_page(limit, _offset):
+            return self.list(status=status, ip=ip, limit=limit,
+                             offset=_offset)
+        return self._iter_pages(fetch_page, page_size, window, offset)
+
+    def iter_list_pages(self, status=None, ip=None,
+                        page_size=manager.DEFAULT_PAGE_SIZE,
+                        window=manager.DEFAULT_PAGE_WINDOW, offset=None):
+        """iterate antiddos status of all EIP, a page at a time
+
+        same as iter_list, but every page (ListWithMeta of AntiDDos) is
+        yielded as soon as it arrives, callers know where a page ends
+
+        :return: generator of ListWithMeta
+        """
+        def fetch_page(limit, _offset):
+            return self.list(status=status, ip=ip, limit=limit,
+                             offset=_offset)
+        return self._iter_page_lists(fetch_page, page_size, window, offset)
+
+    def wait_for_tasks(self, task_ids, timeout=None, initial_interval=1,
+                       max_interval=30, backoff=2, jitter=0.2,
+                       concurrency=DEFAULT_BULK_CONCURRENCY):
+        """wait for anti-ddos tasks, yield results as soon as they finish
+
+        Every task is polled on its own schedule, which starts from
+        ``initial_interval`` and grows by ``backoff`` times after every poll
+        until ``max_interval``, each interval is randomized by ``jitter`` to
+        spread requests. Due tasks are polled concurrently, a task leaves
+        the poll set once it finished or its status could not be queried.
+        Connection, throttle and server errors are retried with backoff.
+
+        :param task_ids: ids of the tasks to wait for
+        :param timeout: max seconds to wait, None to wait forever
+        :param concurrency: max status queries run at the same time
+        :return: generator of TaskWaitResult in finish order
+        :raise WaitTimeout: if tasks are still pending at their last poll at
+            the timeout, after all the finished task results are yielded
+        """
+        now = time.time()
+        deadline = now + timeout if timeout is not None else None
+        # task id -> (next poll time, interval after next poll), next poll
+        # time is None while polling, the entry is None once the last poll
+        # at the deadline found the task pending
+        schedule = collections.OrderedDict(
+            (task_id, (now, initial_interval)) for task_id in task_ids
+        )
+
+        def _poll(task_id):
+            started = time.time()
+            try:
+                task = self.get_task_status(task_id)
+                task.task_id = task_id
+                return started, task, None
+            except exceptions.ClientException as e:
+                return started, None, e
+
+        # future of a status query -> task id
+        polling = {}
+        workers = max(1, min(concurrency, len(schedule)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            while schedule:
+                now = time.time()
+                for task_id, entry in schedule.items():
+                    if entry and entry[0] is not None and entry[0] <= now:
+                        polling[executor.submit(_poll, task_id)] = task_id
+                        schedule[task_id] = (None, entry[1])
+
+                poll_times = [entry[0] for entry in schedule.values()
+                              if entry and entry[0] is not None]
+                if not polling:
+                    if not poll_times:
+                        raise execs.WaitTimeout(pending=list(schedule))
+                    time.sleep(max(0, min(poll_times) - time.time()))
+                    continue
+
+                wait = (max(0, min(poll_times) - time.time())
+                        if poll_times else None)
+                try:
+                    for future in futures.as_completed(polling, wait):
+                        task_id = polling.pop(future)
+                        started, task, error = future.result()
+                        if ((error is not None
+                             and not self._is_retryable(error))
+                                or (task is not None and task.finished)):
+                            del schedule[task_id]
+                            yield resource.TaskWaitResult(task_id, task,
+                                                          error)
+                            continue
+
+                        interval = schedule[task_id][1]
+                        if deadline is not None and started >= deadline:
+                            schedule[task_id] = None
+                            continue
+                        delay = interval * random.uniform(1 - jitter,
+                                                          1 + jitter)
+                        poll_at = time.time() + delay
+                        if deadline is not None:
+                            # poll one last time at the deadline
+                            poll_at = min(poll_at, deadline)
+                        schedule[task_id] = (poll_at,
+                                             min(interval * backoff,
+                                                 max_interval))
+                        # the new poll may be due before others finish
+                        break
+                except futures.TimeoutError:
+                    pass
+
+    @staticmethod
+    def _is_retryable(error):
+        """whether a task status query error is worth retrying"""
+        if isinstance(error, exceptions.HttpError):
+            return error.http_status >= 500 or error.http_status == 429
+        return True
+
+    def get_status_snapshot(self, floating_ips=None, status=None, ip=None,
+                            page_size=manager.DEFAULT_PAGE_SIZE,
+                            concurrency=DEFAULT_BULK_CONCURRENCY):
+        """status of floating IPs keyed by floating ip id
+
+        :param floating_ips: AntiDDos of the floating IPs whose status is
+            queried one by one concurrently, all floating IPs matches status
+            and ip are listed page by page if None
+        :param concurrency: max status queries run at the same time
+        :return: OrderedDict maps floating ip id to (address, status)
+        """
+        snapshot = collections.OrderedDict()
+        if floating_ips is None:
+            for antiddos in self.iter_list(status=status, ip=ip,
+                                           page_size=page_size):
+                snapshot[antiddos.floating_ip_id] = (
+                    antiddos.floating_ip_address, antiddos.status)
+            return snapshot
+
+        def _get_status(antiddos):
+            return self.get_antiddos_status(antiddos.floating_ip_id).status
+
+        workers = max(1, min(concurrency, len(floating_ips)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for antiddos, _status in zip(floating_ips,
+                                         executor.map(_get_status,
+                                                      floating_ips)):
+                snapshot[antiddos.floating_ip_id] = (
+                    antiddos.floating_ip_address, _status)
+        return snapshot
+
+    def get_fleet_daily_report(self, status=None,
+                               top=fleet_report.DEFAULT_TOP,
+                               concurrency=DEFAULT_BULK_CONCURRENCY,
+                               page_size=manager.DEFAULT_PAGE_SIZE):
+        """fetch daily report of every EIP and fold them into fleet
+        aggregates
+
+        Reports are fetched concurrently, every report is summarized as
+        soon as it arrives and then dropped, at most ``concurrency``
+        reports are held in memory at the same time. EIP whose report
+        could not be fetched are recorded in ``failed`` of the result.
+
+        :param status: only EIP of the status
+        :param top: number of the most attacked EIP kept
+        :param concurrency: max requests run at the same time
+        :param page_size: item number of a status listing page
+        :rtype: FleetDailyReport
+        """
+        report = fleet_report.FleetDailyReport(top)
+
+        def _summarize(antiddos):
+            url = "/antiddos/%s/daily" % antiddos['floating_ip_id']
+            resp, body = self._http_get(url, {}, {})
+            return fleet_report.summarize(antiddos,
+                                          self.get_data(body, "data") or [])
+
+        def _fold(done):
+            for future in done:
+                antiddos = pending.pop(future)
+                try:
+                    report.fold(future.result())
+                except exceptions.ClientException as e:
+                    report.fold_error(antiddos['floating_ip_id'], e)
+
+        # EIP of every listing page, summarized from the raw rows
+        rows = (antiddos.original for antiddos in
+                self.iter_list(status=status, page_size=page_size))
+
+        pending = {}
+        workers = max(1, concurrency)
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            for antiddos in rows:
+                if len(pending) >= workers:
+                    done, _ = futures.wait(
+                        pending, return_when=futures.FIRST_COMPLETED
+                    )
+                    _fold(done)
+                pending[executor.submit(_summarize, antiddos)] = antiddos
+            _fold(futures.wait(pending)[0])
+        return report
+
+    def get_antiddos_daily_frame(self, floating_ip_id):
+        """get past 24 hours antiddos protection report of the EIP as
+        NumPy columns, NumPy is required
+
+        :rtype: DailyReportFrame
+        """
+        # NumPy is imported with the frame, only when it is used
+        from antiddosclient.v1 import daily_frame
+
+        url = "/antiddos/%s/daily" % floating_ip_id
+        resp, body = self._http_get(url, {}, {})
+        return daily_frame.DailyReportFrame(
+            self.get_data(body, "data") or [], resp
+        )
+
+    def archive_antiddos_daily_report(self, floating_ip_id, store):
+        """append past 24 hours antiddos protection report of the EIP to
+        a local report store, rows already in the store are skipped
+
+        :param store: ReportStore keeps the report history
+        :return: number of rows appended
+        """
+        url = "/antiddos/%s/daily" % floating_ip_id
+        resp, body = self._http_get(url, {}, {})
+        return store.append(floating_ip_id,
+                            self.get_data(body, "data") or [])
+
+    def stream_antiddos_daily_logs(self, floating_ip_id, sort_dir=None,
+                                   limit=None, offset=None):
+        """stream past 24 hours anti-ddos logs
+
+        logs are decoded one by one from the response while iterating
+
+        :return: StreamWithMeta of AntiDDosLog
+        """
+        params = utils.remove_empty_from_dict({
+            "sort_dir": sort_dir,
+            "limit": limit,
+            "offset": offset,
+        })
+        url = "/antiddos/%s/logs" % floating_ip_id
+        return self._stream(url,
+                            key="logs",
+                            params=params,
+                            resource_class=resource.AntiDDosLog)
+
+    def sync_antiddos_daily_logs(self, floating_ip_id, state,
+                                 page_size=manager.DEFAULT_PAGE_SIZE):
+        """get logs of the EIP which are new since last sync
+
+        Logs are read newest first page by page, reading stops at the first
+        log not newer than the high-water mark of the EIP in ``state``, so
+        known logs are downloaded at most once more. The mark is updated
+        and state is saved after logs are read.
+
+        :param state: LogSyncState keeps the high-water marks
+        :param page_size: max returned length of every page request
+        :return: ListWithMeta of new AntiDDosLog, oldest first
+        """
+        mark = state.get(floating_ip_id)
+        new_logs = []
+        seen = set()
+        offset = 0
+        request_id = None
+        while True:
+            page = self.get_antiddos_daily_logs(floating_ip_id, 'desc',
+                                                page_size, offset)
+            request_id = request_id or page.request_id
+            reached = False
+            for log in page:
+                if log_sync.is_known(log, mark):
+                    reached = True
+                    break
+                key = (log.start_time, log.end_time)
+                # logs shift to next page when new logs arrive meanwhile
+                if key not in seen:
+                    seen.add(key)
+                    new_logs.append(log)
+            if reached or len(page) < page_size:
+                break
+            offset += page_size
+
+        if new_logs:
+            newest = max(new_logs, key=lambda log: (log.start_time,
+                                                    log.end_time or 0))
+            state.set(floating_ip_id, (newest.start_time, newest.end_time))
+            state.save()
+        new_logs.reverse()
+        return base_resource.ListWithMeta(new_logs, request_id)
+
+    def iter_antiddos_daily_logs(self, floating_ip_id, sort_dir=None,
+                                 page_size=manager.DEFAULT_PAGE_SIZE,
+                                 window=manager.DEFAULT_PAGE_WINDOW,
+                                 offset=None):
+        """iterate past 24 hours anti-ddos logs page by page
+
+        next pages are fetched in background while current page is consumed
+
+        :param page_size: max returned length of every page request
+        :param window: max pages fetched ahead
+        :param offset: start offset
+        :return: generator of AntiDDosLog
+        """
+        def fetch_page(limit, _offset):
+            return self.get_antiddos_daily_logs(floating_ip_id, sort_dir,
+                                                limit, _offset)
+        return self._iter_pages(fetch_page, page_size, window, offset)
+
+    def iter_daily_report_rows(self, floating_ips,
+                               concurrency=DEFAULT_BULK_CONCURRENCY):
+        """past 24 hours daily report rows of floating IPs, for export
+
+        rows are the decoded dicts of the response, no resource is built,
+        see _iter_rows for how reports of floating IPs are fetched
+
+        :param floating_ips: iterable of floating IP (UUID or IP)
+        :param concurrency: max requests run at the same time
+        :return: generator of (floating ip id, rows, error)
+        """
+        def _fetch(floating_ip_id):
+            url = "/antiddos/%s/daily" % floating_ip_id
+            _, body = self._http_get(url, {}, {})
+            yield self.get_data(body, 'data') or []
+        return self._iter_rows(floating_ips, _fetch, concurrency)
+
+    def iter_daily_log_rows(self, floating_ips, sort_dir=None,
+                            page_size=manager.DEFAULT_PAGE_SIZE,
+                            concurrency=DEFAULT_BULK_CONCURRENCY):
+        """past 24 hours anti-ddos log rows of floating IPs, for export
+
+        all log pages of a floating IP are read by the same worker and
+        yielded page by page, rows are the decoded dicts of the response,
+        no resource is built
+
+        :param floating_ips: iterable of floating IP (UUID or IP)
+        :param page_size: max returned length of every page request
+        :param concurrency: max floating IPs fetched at the same time
+        :return: generator of (floating ip id, rows, error), rows of a
+            floating IP are a page
+        """
+        def _fetch(floating_ip_id):
+            url = "/antiddos/%s/logs" % floating_ip_id
+            offset = 0
+            while True:
+                params = utils.remove_empty_from_dict({
+                    "sort_dir": sort_dir,
+                    "limit": page_size,
+                    "offset": offset,
+                })
+                _, body = self._http_get(url, params, {})
+                page = self.get_data(body, 'logs') or []
+                yield page
+                if len(page) < page_size:
+                    return
+                offset += page_size
+        return self._iter_rows(floating_ips, _fetch, concurrency)
+
+    def _iter_rows(self, floating_ips, fetch, concurrency):
+        """fetch rows of floating IPs concurrently, yield them in order
+
+        IP keywords are resolved by the workers too. At most
+        ``concurrency`` floating IPs are fetched ahead of the one being
+        consumed, and every worker holds at most ``ROW_CHUNKS_AHEAD`` row
+        chunks not consumed yet, so memory grows neither with the floating
+        IP number nor with the pages of a floating IP, and floating_ips
+        could be a generator, e.g. of iter_list.
+
+        :param fetch: function accepts floating ip id and returns an
+            iterable of row chunks, e.g. a generator of pages
+        :return: generator of (floating ip id, rows, error) in the order of
+            floating_ips, every chunk of a floating IP is yielded as it
+            arrives. rows is None and error is the ClientException if
+            rows of the floating IP could not be fetched (chunks before
+            the error are yielded already), floating ip id is the keyword
+            if it could not be resolved
+        """
+        closed = threading.Event()
+
+        def _put(chunks, item):
+            # give up once the consumer is gone, never block forever
+            while not closed.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def _fetch(keyword, chunks):
+            floating_ip_id = keyword
+            try:
+                floating_ip_id = self._resolve_floating_ip_id(keyword)
+                for rows in fetch(floating_ip_id):
+                    if not _put(chunks, (floating_ip_id, rows, None)):
+                        return
+            except exceptions.ClientException as e:
+                _put(chunks, (floating_ip_id, None, e))
+            except Exception as e:
+                # re-raised by the consumer
+                _put(chunks, e)
+            _put(chunks, None)
+
+        def _drain(chunks):
+            while True:
+                item = chunks.get()
+                if item is None:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+
+        workers = max(1, concurrency)
+        executor = futures.ThreadPoolExecutor(max_workers=workers)
+        pending = collections.deque()
+        try:
+            for keyword in floating_ips:
+                chunks = queue.Queue(maxsize=ROW_CHUNKS_AHEAD)
+                future = executor.submit(_fetch, keyword, chunks)
+                pending.append((chunks, future))
+                if len(pending) > workers:
+                    for item in _drain(pending.popleft()[0]):
+                        yield item
+            while pending:
+                for item in _drain(pending.popleft()[0]):
+                    yield item
+        finally:
+            closed.set()
+            for _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def get_antiddos_weekly_reports(self, weeks, start_date=None,
+                                    concurrency=DEFAULT_BULK_CONCURRENCY):
+        """get weekly anti-ddos reports of consecutive weeks
+
+        Weeks are fetched concurrently, every week with its own period
+        start date. Reports of finished weeks never change, they are kept
+        by the manager and only fetched once.
+
+        :param weeks: number of weeks
+        :param start_date: start date of the first week (datetime), the
+            weeks end today if not specified
+        :param concurrency: max requests run at the same time
+        :rtype: WeeklyReportRange
+        """
+        if start_date is None:
+            today = datetime.datetime.combine(datetime.date.today(),
+                                              datetime.time())
+            start_date = today - datetime.timedelta(weeks=weeks)
+        start_dates = [
+            _to_epoch_millis(start_date + datetime.timedelta(weeks=week))
+            for week in range(weeks)
+        ]
+
+        def _fetch(period_start_date):
+            report = self._weekly_reports.get(period_start_date)
+            if report is not None:
+                return None, report
+            params = {"period_start_date": period_start_date}
+            resp, body = self._http_get("/antiddos/weekly", params, {})
+            report = resource.WeeklyReportWeek.from_body(period_start_date,
+                                                         body)
+            if _is_past_week(params, body):
+                self._weekly_reports[period_start_date] = report
+            return resp, report
+
+        workers = max(1, min(concurrency, len(start_dates)))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_fetch, start_dates))
+        resp = next((resp for resp, _report in results if resp is not None),
+                    None)
+        return resource.WeeklyReportRange(
+            [report for _resp, report in results], resp
+        )
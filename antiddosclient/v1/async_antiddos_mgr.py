@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+from keystoneauth1 import exceptions
+
+from antiddosclient.common import async_manager
+from antiddosclient.common.i18n import _
+from antiddosclient.v1 import antiddos_mgr
+
+
+class AsyncAntiDDosManager(async_manager.AsyncManager,
+                           antiddos_mgr.BaseAntiDDosManager):
+    """AntiDDos manager with asyncio coroutine API.
+
+    Functions which only build request parameters are inherited from
+    BaseAntiDDosManager and return coroutines, functions post-process results
+    are overridden here. Bulk, paginated and polling functions of
+    AntiDDosManager run blocking requests and are not available.
+    """
+
+    async def find(self, keyword):
+        """find antiddos by keyword (UUID or IP)"""
+        if not antiddos_mgr.IP_PATTERN.match(keyword):
+            try:
+                # try keyword as UUID
+                return await self.get_antiddos(keyword)
+            except exceptions.ClientException:
+                pass
+        else:
+            # try keyword as IP
+            results = await self.list(ip=keyword)
+            matched = self._match_ip(keyword, results)
+            if matched:
+                return matched
+
+        message = _("AntiDDos with ID or IP '%s' not exists.") % keyword
+        raise exceptions.NotFound(message)
+
+    async def get_antiddos(self, floating_ip_id):
+        """get AntiDDos"""
+        _antiddos = await self._get("/antiddos/%s" % floating_ip_id)
+        return self._as_antiddos(floating_ip_id, _antiddos)
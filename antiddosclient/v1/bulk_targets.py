@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import collections
+import csv
+
+from antiddosclient.v1.resource import http_request_rate
+from antiddosclient.v1.resource import maximum_service_traffic
+
+# columns of a targets file, only floating_ip is required
+COLUMNS = (
+    'floating_ip',
+    'maximum_service_traffic',
+    'http_request_rate',
+    'enable_cc',
+)
+
+_BOOLEANS = {
+    'true': True, 'yes': True, 'on': True, '1': True, 'enabled': True,
+    'false': False, 'no': False, 'off': False, '0': False, 'disabled': False,
+}
+
+
+class BulkTarget(collections.namedtuple(
+        'BulkTarget',
+        ['line', 'floating_ip', 'maximum_service_traffic',
+         'http_request_rate', 'enable_l7'])):
+    """One floating IP and its settings read from a targets file
+
+    settings not given in the file are the defaults of read_targets, line
+    is the line number in the file, used in error messages.
+    """
+
+    __slots__ = ()
+
+
+def _to_choice(value, choices, column):
+    try:
+        value = int(value)
+    except ValueError:
+        value = None
+    if value not in choices:
+        raise ValueError('invalid %s, choose from %s'
+                         % (column, ', '.join(str(c) for c in choices)))
+    return value
+
+
+def _to_bool(value):
+    try:
+        return _BOOLEANS[value.lower()]
+    except KeyError:
+        raise ValueError('invalid enable_cc %s, use true or false' % value)
+
+
+def read_targets(lines, maximum_service_traffic_default=None,
+                 http_request_rate_default=None, enable_l7_default=True,
+                 columns=COLUMNS):
+    """read floating IPs and their settings of a targets file
+
+    Every row is ``floating_ip[,maximum_service_traffic[,http_request_rate
+    [,enable_cc]]]``, floating ip is UUID or IP. A header row naming the
+    columns may be used to reorder them. Blank lines and lines starting
+    with '#' are skipped, empty cells are the defaults, the default http
+    request rate is not used by rows disabling CC defence.
+
+    :param lines: iterable of text lines, e.g. an open file
+    :param columns: columns accepted by the caller in the order of rows
+        without a header, floating_ip must be the first one
+    :return: list of BulkTarget in the order of the file
+    :raise ValueError: message with the line number of an invalid row, a
+        repeated floating ip or a column not accepted
+    """
+    accepted = columns
+    targets = []
+    seen = {}
+    reader = csv.reader(lines, skipinitialspace=True)
+    for row in reader:
+        line = reader.line_num
+        row = [cell.strip() for cell in row]
+        if not any(row) or row[0].startswith('#'):
+            continue
+        if not targets and row[0].lower() == 'floating_ip':
+            unknown = set(cell.lower() for cell in row) - set(COLUMNS)
+            if unknown:
+                raise ValueError('line %d: unknown columns %s'
+                                 % (line, ', '.join(sorted(unknown))))
+            unsupported = set(cell.lower() for cell in row) - set(accepted)
+            if unsupported:
+                raise ValueError('line %d: columns %s are not supported, '
+                                 'use %s'
+                                 % (line, ', '.join(sorted(unsupported)),
+                                    ', '.join(accepted)))
+            columns = tuple(cell.lower() for cell in row)
+            continue
+        if len(row) > len(columns):
+            raise ValueError('line %d: expect at most %d columns: %s'
+                             % (line, len(columns), ', '.join(columns)))
+
+        cells = dict((column, cell) for column, cell in zip(columns, row)
+                     if cell)
+        floating_ip = cells.get('floating_ip')
+        if not floating_ip:
+            raise ValueError('line %d: floating_ip is required' % line)
+        if floating_ip in seen:
+            raise ValueError('line %d: floating ip %s is repeated, first '
+                             'seen at line %d'
+                             % (line, floating_ip, seen[floating_ip]))
+        seen[floating_ip] = line
+
+        try:
+            traffic = maximum_service_traffic_default
+            if 'maximum_service_traffic' in cells:
+                traffic = _to_choice(cells['maximum_service_traffic'],
+                                     maximum_service_traffic,
+                                     'maximum_service_traffic')
+            rate = http_request_rate_default
+            if 'http_request_rate' in cells:
+                rate = _to_choice(cells['http_request_rate'],
+                                  http_request_rate, 'http_request_rate')
+            enable_l7 = enable_l7_default
+            if 'enable_cc' in cells:
+                enable_l7 = _to_bool(cells['enable_cc'])
+                # default rate is for CC enabled rows only
+                if not enable_l7 and 'http_request_rate' not in cells:
+                    rate = None
+        except ValueError as e:
+            raise ValueError('line %d: %s' % (line, e))
+        targets.append(BulkTarget(line, floating_ip, traffic, rate,
+                                  enable_l7))
+    return targets
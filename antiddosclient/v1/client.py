@@ -26,7 +26,7 @@ class Client(object):
     # service name registered in open-stack
     service_name = 'antiddos'
 
-    def __init__(self, session=None, endpoint=None, **kwargs):
+    def __init__(self, session=None, endpoint=None, cache=None, **kwargs):
         """Initialize a new client for the VBS v2 API.
 
         :param keystoneauth1.session.Session session:
@@ -34,8 +34,13 @@ class Client(object):
             a default keystoneauth1.session.Session will be created.
         :param string endpoint:
             An optional URL to be used as the base for API requests on this API
+        :param antiddosclient.common.cache.ResponseCache cache:
+            An optional cache of responses which rarely change
         :param kwargs:
             Keyword arguments passed to keystoneauth1.session.Session().
+            Connection pool options (pool_size, pool_size_per_host,
+            pool_block and keep_alive), retry_policy and rate_limiter are
+            accepted, see OpenStackHttpClient
         """
 
         # http_log_debug = utils.get_effective_log_level() <= logging.DEBUG
@@ -54,4 +59,16 @@ class Client(object):
         )
 
         # initial anti-ddos modules
-        self.antiddos = antiddos_mgr.AntiDDosManager(self.client)
+        self.antiddos = antiddos_mgr.AntiDDosManager(self.client, cache=cache)
+
+    def stats(self):
+        """snapshot of per route HTTP request metrics of the client
+
+        :return: dict of "METHOD /route/{id}" to latency histogram, status
+            code counters, bytes in/out and retry count
+        """
+        return self.client.stats()
+
+    def pool_stats(self):
+        """report HTTP connection pool utilization of the client"""
+        return self.client.pool_stats()
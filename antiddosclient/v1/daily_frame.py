@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+from antiddosclient.common import resource as base_resource
+from antiddosclient.v1 import resource
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+# minutes every daily report row covers
+REPORT_INTERVAL_MINUTES = 5
+
+# attack column and total column of every traffic kind
+_ATTACK_COLUMNS = {
+    'bps': ('bps_attack', 'total_bps'),
+    'pps': ('pps_attack', 'total_pps'),
+}
+
+
+class DailyReportFrame(base_resource.RequestIdMixin):
+    """Columnar daily report of an EIP backed by NumPy arrays
+
+    Every field of AntiDDosDailyReport is a column (``frame.bps_attack``)
+    with one value per five minutes, aggregates are computed on the whole
+    column at once instead of walking report objects. Fields not returned
+    by server are 0.
+
+    NumPy is required.
+
+    :param rows: daily report row dicts
+    :param resp: Response or request id
+    """
+
+    columns = resource.AntiDDosDailyReport.fields
+
+    def __init__(self, rows, resp=None):
+        if numpy is None:
+            raise ImportError('numpy is required by daily report frame, '
+                              'install it with "pip install numpy"')
+        rows = [row for row in rows if row]
+        for column in self.columns:
+            # ints stay int64, values with float become float64
+            values = numpy.array([row.get(column) or 0 for row in rows])
+            if not len(values):
+                values = values.astype(numpy.int64)
+            setattr(self, column, values)
+        self.mixin_request_id(resp)
+
+    @classmethod
+    def from_columns(cls, columns, resp=None):
+        """build frame from dict of column name to values, missing columns
+        are 0
+        """
+        if numpy is None:
+            raise ImportError('numpy is required by daily report frame, '
+                              'install it with "pip install numpy"')
+        frame = cls.__new__(cls)
+        length = max([len(values) for values in columns.values()] or [0])
+        for column in cls.columns:
+            values = columns.get(column)
+            setattr(frame, column,
+                    numpy.zeros(length, numpy.int64) if values is None
+                    else numpy.asarray(values))
+        frame.mixin_request_id(resp)
+        return frame
+
+    def __len__(self):
+        return len(self.period_start)
+
+    def _column(self, column):
+        if column not in self.columns:
+            raise ValueError('Unknown daily report column: %s' % column)
+        return getattr(self, column)
+
+    def peak(self, column):
+        """max value of the column, None if frame is empty"""
+        values = self._column(column)
+        return values.max().item() if len(values) else None
+
+    def mean(self, column):
+        """mean value of the column, None if frame is empty"""
+        values = self._column(column)
+        return values.mean().item() if len(values) else None
+
+    def percentile(self, column, percents):
+        """percentiles of the column
+
+        :param percents: a percent (0 - 100) or a list of them
+        :return: a float or a list of floats, None if frame is empty
+        """
+        values = self._column(column)
+        if not len(values):
+            return None
+        result = numpy.percentile(values, percents)
+        return result.tolist() if numpy.ndim(result) else result.item()
+
+    def attack_ratio(self, kind='bps'):
+        """share of attack traffic in total traffic
+
+        :param kind: bps or pps
+        :return: ratio between 0 and 1, 0 if there is no traffic
+        """
+        attack, total = (self._column(column)
+                         for column in _ATTACK_COLUMNS[kind])
+        total_sum = total.sum()
+        return (attack.sum() / float(total_sum)).item() if total_sum else 0.0
+
+    def under_attack(self):
+        """boolean array marks the rows which have attack traffic"""
+        return (self.bps_attack > 0) | (self.pps_attack > 0)
+
+    def attack_minutes(self):
+        """minutes during which the EIP was under attack"""
+        return int(self.under_attack().sum()) * REPORT_INTERVAL_MINUTES
+
+    def summary(self):
+        """dict of the commonly used aggregates"""
+        return {
+            'points': len(self),
+            'peak_bps_attack': self.peak('bps_attack'),
+            'peak_pps_attack': self.peak('pps_attack'),
+            'mean_total_bps': self.mean('total_bps'),
+            'p95_total_bps': self.percentile('total_bps', 95),
+            'attack_ratio_bps': self.attack_ratio('bps'),
+            'attack_ratio_pps': self.attack_ratio('pps'),
+            'attack_minutes': self.attack_minutes(),
+        }
+
+    def iter_rows(self):
+        """iterate row dicts, values are Python numbers"""
+        columns = self.columns
+        for values in zip(*[getattr(self, column).tolist()
+                            for column in columns]):
+            yield dict(zip(columns, values))
+
+    def to_rows(self, manager=None):
+        """convert back to AntiDDosDailyReport rows, e.g. for display
+
+        :rtype: ListWithMeta
+        """
+        return base_resource.ListWithMeta(
+            [resource.AntiDDosDailyReport(manager, row, attached=True,
+                                          resp=self.request_id)
+             for row in self.iter_rows()],
+            self.request_id
+        )
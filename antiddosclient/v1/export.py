@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import csv
+import json
+
+from antiddosclient.v1 import resource
+
+# fields exported after floating_ip_id, times are epoch milliseconds as
+# returned by the API
+LOG_FIELDS = resource.AntiDDosLog.fields
+DAILY_REPORT_FIELDS = resource.AntiDDosDailyReport.fields
+
+
+class NDJSONWriter(object):
+    """Write rows as JSON objects, one object per line
+
+    rows are written as returned by the API with floating_ip_id added, so
+    fields added to the API are exported too.
+
+    :param stream: text stream to write to
+    :param fields: unused, NDJSON rows keep all their fields
+    """
+
+    def __init__(self, stream, fields=None):
+        self.stream = stream
+        self._encode = json.JSONEncoder(separators=(',', ':')).encode
+
+    def write_rows(self, floating_ip_id, rows):
+        """write rows of the floating IP, return number of rows written"""
+        encode = self._encode
+        lines = []
+        for row in rows:
+            row = dict(row)
+            row['floating_ip_id'] = floating_ip_id
+            lines.append(encode(row))
+        if lines:
+            lines.append('')
+            self.stream.write('\n'.join(lines))
+        return len(rows)
+
+
+class CSVWriter(object):
+    """Write rows as CSV, header row is written at once
+
+    floating_ip_id is the first column, followed by fields, missing fields
+    are empty cells and unknown fields are dropped.
+
+    :param stream: text stream to write to
+    :param fields: exported field names, e.g. LOG_FIELDS
+    """
+
+    def __init__(self, stream, fields):
+        self.stream = stream
+        self.fields = tuple(fields)
+        self._writer = csv.writer(stream, lineterminator='\n')
+        self._writer.writerow(('floating_ip_id',) + self.fields)
+
+    def write_rows(self, floating_ip_id, rows):
+        """write rows of the floating IP, return number of rows written"""
+        fields = self.fields
+        self._writer.writerows([floating_ip_id] + [row.get(f) for f in fields]
+                               for row in rows)
+        return len(rows)
+
+
+WRITERS = {
+    'ndjson': NDJSONWriter,
+    'csv': CSVWriter,
+}
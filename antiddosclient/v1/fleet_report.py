@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import heapq
+import itertools
+
+from antiddosclient.v1 import resource
+
+# minutes every daily report row covers
+REPORT_INTERVAL_MINUTES = 5
+# default number of the most attacked EIP kept
+DEFAULT_TOP = 10
+
+
+def summarize(antiddos, rows):
+    """summarize daily report rows of an EIP
+
+    :param antiddos: status listing row dict of the EIP
+    :param rows: daily report row dicts
+    :rtype: EIPDailySummary
+    """
+    peak_bps = peak_pps = points = 0
+    for row in rows:
+        if not row:
+            continue
+        bps = row.get('bps_attack') or 0
+        pps = row.get('pps_attack') or 0
+        if bps or pps:
+            points += 1
+            if bps > peak_bps:
+                peak_bps = bps
+            if pps > peak_pps:
+                peak_pps = pps
+    return resource.EIPDailySummary(antiddos.get('floating_ip_id'),
+                                    antiddos.get('floating_ip_address'),
+                                    antiddos.get('status'),
+                                    peak_bps, peak_pps,
+                                    points * REPORT_INTERVAL_MINUTES)
+
+
+class FleetDailyReport(object):
+    """Fleet aggregates folded from daily report of every EIP
+
+    Only the aggregates and the ``top`` most attacked EIP summaries are
+    kept, daily report of an EIP could be dropped once it is folded.
+
+    :param top: number of the most attacked EIP kept for bps and pps
+    """
+
+    def __init__(self, top=DEFAULT_TOP):
+        self.top = top
+        self.eips = 0
+        self.attacked_eips = 0
+        self.attack_minutes = 0
+        # status -> dict of eips, attacked_eips and attack_minutes
+        self.by_status = {}
+        # floating ip ids whose report could not be fetched
+        self.failed = []
+        self._top_bps = []
+        self._top_pps = []
+        # tie breaker, summaries are never compared
+        self._counter = itertools.count()
+
+    def _push(self, heap, peak, summary):
+        if not peak:
+            return
+        item = (peak, next(self._counter), summary)
+        if len(heap) < self.top:
+            heapq.heappush(heap, item)
+        elif peak > heap[0][0]:
+            heapq.heapreplace(heap, item)
+
+    def fold(self, summary):
+        """fold daily summary of an EIP into the aggregates"""
+        self.eips += 1
+        stats = self.by_status.get(summary.status)
+        if stats is None:
+            stats = self.by_status[summary.status] = {
+                'eips': 0, 'attacked_eips': 0, 'attack_minutes': 0,
+            }
+        stats['eips'] += 1
+        if summary.attack_minutes:
+            self.attacked_eips += 1
+            self.attack_minutes += summary.attack_minutes
+            stats['attacked_eips'] += 1
+            stats['attack_minutes'] += summary.attack_minutes
+        self._push(self._top_bps, summary.peak_bps_attack, summary)
+        self._push(self._top_pps, summary.peak_pps_attack, summary)
+
+    def fold_error(self, floating_ip_id, error):
+        """record an EIP whose daily report could not be fetched"""
+        self.failed.append(floating_ip_id)
+
+    @property
+    def top_bps(self):
+        """most attacked EIP summaries by peak attack bps, descending"""
+        return [item[2] for item in sorted(self._top_bps, reverse=True)]
+
+    @property
+    def top_pps(self):
+        """most attacked EIP summaries by peak attack pps, descending"""
+        return [item[2] for item in sorted(self._top_pps, reverse=True)]
+
+    def to_dict(self):
+        return {
+            'eips': self.eips,
+            'attacked_eips': self.attacked_eips,
+            'attack_minutes': self.attack_minutes,
+            'by_status': dict((k, dict(v))
+                              for k, v in self.by_status.items()),
+            'failed': list(self.failed),
+            'top_bps': [s._asdict() for s in self.top_bps],
+            'top_pps': [s._asdict() for s in self.top_pps],
+        }
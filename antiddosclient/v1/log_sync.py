@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import errno
+import json
+import logging
+import os
+import tempfile
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+# version of the state file layout
+STATE_VERSION = 1
+
+
+class LogSyncState(object):
+    """High-water marks of synced anti-ddos logs persisted in a JSON file
+
+    Mark of an EIP is the (start_time, end_time) of the newest log seen,
+    logs not newer than it are known. An unreadable state file is treated
+    as empty, which only costs a full sync.
+
+    :param path: path of the state file, created on first save
+    """
+
+    def __init__(self, path):
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._marks = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except (IOError, OSError) as e:
+            if e.errno != errno.ENOENT:
+                LOGGER.debug('Failed to read log sync state %s: %s',
+                             self.path, e)
+            return {}
+        except ValueError as e:
+            LOGGER.debug('Invalid log sync state %s: %s', self.path, e)
+            return {}
+        if (not isinstance(state, dict) or
+                state.get('version') != STATE_VERSION):
+            return {}
+        marks = state.get('marks') or {}
+        return dict((k, tuple(mark)) for k, mark in marks.items())
+
+    def get(self, floating_ip_id):
+        """get (start_time, end_time) mark of the EIP, None if not synced"""
+        with self._lock:
+            return self._marks.get(floating_ip_id)
+
+    def set(self, floating_ip_id, mark):
+        with self._lock:
+            self._marks[floating_ip_id] = tuple(mark)
+
+    def remove(self, floating_ip_id):
+        with self._lock:
+            self._marks.pop(floating_ip_id, None)
+
+    def save(self):
+        """write marks to the state file atomically"""
+        with self._lock:
+            content = json.dumps({
+                'version': STATE_VERSION,
+                'marks': dict((k, list(v)) for k, v in self._marks.items()),
+            }, sort_keys=True)
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+        # write to temp file first, state file is never partially written
+        fd, temp = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                f.write(content)
+            if os.name == 'nt' and os.path.exists(self.path):
+                os.remove(self.path)
+            os.rename(temp, self.path)
+        except (IOError, OSError):
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+
+
+def is_known(log, mark):
+    """whether the log is not newer than the high-water mark
+
+    an ongoing event keeps its start time while end time grows, it is new
+    again once its end time passed the mark.
+    """
+    if mark is None:
+        return False
+    start_time, end_time = mark
+    if log.start_time != start_time:
+        return log.start_time < start_time
+    return (log.end_time or 0) <= (end_time or 0)
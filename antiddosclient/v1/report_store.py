@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import errno
+import os
+import shutil
+import struct
+import threading
+
+from antiddosclient.v1 import daily_frame
+from antiddosclient.v1 import resource
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None
+
+TIME_COLUMN = 'period_start'
+METRIC_COLUMNS = tuple(column
+                       for column in resource.AntiDDosDailyReport.fields
+                       if column != TIME_COLUMN)
+
+# period_start file starts with the int64 period_start of the first row,
+# followed by uint32 milliseconds since previous row of every row
+_TIME_FILE = TIME_COLUMN + '.delta'
+_TIME_HEADER = struct.Struct('<q')
+_DELTA_DTYPE = '<u4'
+_MAX_DELTA = 2 ** 32 - 1
+# metrics are fixed width int64 columns
+_METRIC_DTYPE = '<i8'
+_METRIC_SUFFIX = '.i8'
+
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError as e:
+        if e.errno != errno.ENOENT:
+            raise
+        return 0
+
+
+def _append(path, size, data):
+    """append data to file after dropping bytes beyond size
+
+    bytes beyond size are left by an interrupted append.
+    """
+    with open(path, 'ab') as f:
+        if f.tell() != size:
+            f.truncate(size)
+        f.write(data)
+
+
+class _Series(object):
+    """column files of an EIP in a directory"""
+
+    def __init__(self, path):
+        self.path = path
+        self._time_file = os.path.join(path, _TIME_FILE)
+        self._size = 0
+        self._times = None
+        self._columns = {}
+
+    def _refresh(self):
+        """drop the mapped columns if rows were appended meanwhile"""
+        size = _file_size(self._time_file)
+        if size != self._size:
+            self._size = size
+            self._columns = {}
+            if size < _TIME_HEADER.size:
+                self._times = None
+
+    def __len__(self):
+        return max(0, self._size - _TIME_HEADER.size) // 4
+
+    def times(self):
+        """absolute period_start of every row, decoded from the deltas
+
+        decoded times are cached, only deltas of new rows are decoded.
+        """
+        self._refresh()
+        count = len(self)
+        times = self._times
+        if times is not None and len(times) == count:
+            return times
+        if not count:
+            self._times = numpy.empty(0, numpy.int64)
+            return self._times
+        if times is None or len(times) > count:
+            times = numpy.empty(0, numpy.int64)
+        with open(self._time_file, 'rb') as f:
+            base = _TIME_HEADER.unpack(f.read(_TIME_HEADER.size))[0]
+            start = len(times)
+            f.seek(start * 4, os.SEEK_CUR)
+            deltas = numpy.frombuffer(f.read((count - start) * 4),
+                                      _DELTA_DTYPE).astype(numpy.int64)
+        last = times[-1] if start else base
+        self._times = numpy.concatenate(
+            (times, last + numpy.cumsum(deltas))
+        )
+        return self._times
+
+    def column(self, column):
+        """read-only memory-mapped metric column"""
+        values = self._columns.get(column)
+        if values is None:
+            count = len(self)
+            if count:
+                # plain ndarray view of the map slices faster than memmap
+                values = numpy.memmap(
+                    os.path.join(self.path, column + _METRIC_SUFFIX),
+                    dtype=_METRIC_DTYPE, mode='r', shape=(count,)
+                ).view(numpy.ndarray)
+            else:
+                values = numpy.empty(0, numpy.int64)
+            self._columns[column] = values
+        return values
+
+    def append(self, times, metrics):
+        """append rows newer than the last row
+
+        :param times: sorted unique period_start of rows
+        :param metrics: dict of metric column values of rows
+        :return: number of rows appended
+        """
+        existing = self.times()
+        if len(existing):
+            keep = times > existing[-1]
+            times = times[keep]
+            metrics = dict((column, values[keep])
+                           for column, values in metrics.items())
+            previous = existing[-1]
+        elif len(times):
+            previous = times[0]
+        if not len(times):
+            return 0
+        deltas = numpy.diff(numpy.concatenate(([previous], times)))
+        if deltas.max() > _MAX_DELTA:
+            raise ValueError('Gap between daily reports is longer than '
+                             '%d ms, remove the series of the EIP first' %
+                             _MAX_DELTA)
+
+        count = len(self)
+        if not os.path.isdir(self.path):
+            os.makedirs(self.path)
+        # metrics are written before times, rows are only visible once
+        # their times are written
+        for column in METRIC_COLUMNS:
+            _append(os.path.join(self.path, column + _METRIC_SUFFIX),
+                    count * 8,
+                    metrics[column].astype(_METRIC_DTYPE).tobytes())
+        time_data = deltas.astype(_DELTA_DTYPE).tobytes()
+        if not count:
+            time_data = _TIME_HEADER.pack(int(previous)) + time_data
+        _append(self._time_file,
+                _TIME_HEADER.size + count * 4 if count else 0, time_data)
+        return len(times)
+
+
+class ReportStore(object):
+    """Local append-only store of EIP daily report history
+
+    Daily report API only returns the past 24 hours, rows appended here are
+    kept as long as the files. Every EIP has a directory of column files:
+    period_start is delta encoded (uint32 milliseconds since previous row)
+    and every metric is a fixed width int64 column, metric columns are
+    memory-mapped when queried so only the sliced pages are read.
+
+    Rows are deduplicated by period_start, rows not newer than the last row
+    of the EIP are dropped, so the same report could be appended again and
+    again. One process should append to a store at a time.
+
+    NumPy is required.
+
+    :param path: directory of the store, created on first append
+    """
+
+    def __init__(self, path):
+        if numpy is None:
+            raise ImportError('numpy is required by daily report store, '
+                              'install it with "pip install numpy"')
+        self.path = os.path.expanduser(path)
+        self._lock = threading.Lock()
+        self._series = {}
+
+    def _get_series(self, floating_ip_id):
+        series = self._series.get(floating_ip_id)
+        if series is None:
+            if (not floating_ip_id or os.sep in floating_ip_id or
+                    floating_ip_id in (os.curdir, os.pardir)):
+                raise ValueError('Invalid floating ip id: %r' %
+                                 floating_ip_id)
+            series = _Series(os.path.join(self.path, floating_ip_id))
+            self._series[floating_ip_id] = series
+        return series
+
+    def floating_ip_ids(self):
+        """ids of the EIP which have rows in the store"""
+        try:
+            names = os.listdir(self.path)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return []
+        return sorted(name for name in names if os.path.exists(
+            os.path.join(self.path, name, _TIME_FILE)
+        ))
+
+    def append(self, floating_ip_id, rows):
+        """append daily report rows of the EIP
+
+        :param rows: daily report row dicts or AntiDDosDailyReport
+        :return: number of rows appended
+        """
+        rows = [row if isinstance(row, dict) else row.original
+                for row in rows if row]
+        rows = [row for row in rows if row.get(TIME_COLUMN) is not None]
+        columns = dict(
+            (column, numpy.array([row.get(column) or 0 for row in rows],
+                                 numpy.int64))
+            for column in resource.AntiDDosDailyReport.fields
+        )
+        return self.append_columns(floating_ip_id, columns)
+
+    def append_columns(self, floating_ip_id, columns):
+        """append daily report columns of the EIP
+
+        :param columns: dict of column name to values, period_start is
+            required, missing metric columns are 0
+        :return: number of rows appended
+        """
+        times, index = numpy.unique(
+            numpy.asarray(columns[TIME_COLUMN], numpy.int64),
+            return_index=True
+        )
+        metrics = {}
+        for column in METRIC_COLUMNS:
+            values = columns.get(column)
+            if values is None:
+                metrics[column] = numpy.zeros(len(times), numpy.int64)
+            else:
+                metrics[column] = numpy.asarray(values, numpy.int64)[index]
+        with self._lock:
+            return self._get_series(floating_ip_id).append(times, metrics)
+
+    def query(self, floating_ip_id, start=None, end=None, columns=None):
+        """rows of the EIP in the time range as NumPy columns
+
+        Metric columns are read-only slices of the memory-mapped files,
+        copy them to keep them after the store is removed.
+
+        :param start: min period_start in milliseconds, included
+        :param end: max period_start in milliseconds, excluded
+        :param columns: names of the metric columns, all if None
+        :return: dict of column name to values, period_start is always
+            included, columns are empty if the EIP has no rows
+        """
+        columns = METRIC_COLUMNS if columns is None else columns
+        for column in columns:
+            if column not in METRIC_COLUMNS:
+                raise ValueError('Unknown daily report column: %s' % column)
+        with self._lock:
+            series = self._get_series(floating_ip_id)
+            times = series.times()
+            begin = 0 if start is None else int(times.searchsorted(start))
+            stop = len(times) if end is None else int(times.searchsorted(end))
+            result = {TIME_COLUMN: times[begin:stop]}
+            for column in columns:
+                result[column] = series.column(column)[begin:stop]
+        return result
+
+    def query_many(self, floating_ip_ids=None, start=None, end=None,
+                   columns=None):
+        """query rows of many EIP in the time range
+
+        :param floating_ip_ids: ids of EIP, all EIP in the store if None
+        :return: dict of floating ip id to query result
+        """
+        if floating_ip_ids is None:
+            floating_ip_ids = self.floating_ip_ids()
+        return dict((floating_ip_id,
+                     self.query(floating_ip_id, start, end, columns))
+                    for floating_ip_id in floating_ip_ids)
+
+    def frame(self, floating_ip_id, start=None, end=None):
+        """rows of the EIP in the time range as DailyReportFrame"""
+        return daily_frame.DailyReportFrame.from_columns(
+            self.query(floating_ip_id, start, end)
+        )
+
+    def remove(self, floating_ip_id):
+        """remove all rows of the EIP"""
+        with self._lock:
+            series = self._get_series(floating_ip_id)
+            del self._series[floating_ip_id]
+            shutil.rmtree(series.path, ignore_errors=True)
@@ -12,18 +12,43 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
-from osc_lib import utils as formatter
+import collections
 
 from antiddosclient.common import display
 from antiddosclient.common import resource
 from antiddosclient.common import utils
-from antiddosclient.osc.v1.parser_builder import maximum_service_traffic
-from antiddosclient.osc.v1.parser_builder import http_request_rate
 
+# traffic maximum
+maximum_service_traffic = [10, 30, 50, 70, 100, 150, 200, 250, 300]
 
-class AntiDDos(resource.Resource, display.Display):
+# http request rate
+http_request_rate = [100, 150, 240, 350, 480, 550, 700, 850, 1000, 1500, 2000,
+                     3000, 5000, 10000, 20000]
+
+
+class AntiDDos(resource.CompactResource, display.Display):
     """AntiDDos resource _antiddos."""
 
+    __slots__ = ()
+
+    fields = (
+        'floating_ip_id',
+        'floating_ip_address',
+        'network_type',
+        'status',
+    )
+
+    interned_fields = ('network_type', 'status')
+
+    # antiddos settings, only returned by get antiddos API
+    detail_fields = (
+        'enable_L7',
+        'traffic_pos_id',
+        'http_request_pos_id',
+        'cleaning_access_pos_id',
+        'app_type_id',
+    )
+
     status_list = [
         "normal",
         "configging",
@@ -61,6 +86,12 @@ class AntiDDos(resource.Resource, display.Display):
 class AntiDDosTask(resource.Resource, display.Display):
     """AntiDDos task resource _antiddos."""
 
+    # task will not change any more once it reaches these status
+    finished_status_list = [
+        "success",
+        "failed",
+    ]
+
     show_column_names = (
         'Task Status',
         'Task Message',
@@ -75,6 +106,10 @@ class AntiDDosTask(resource.Resource, display.Display):
     def task_message(self):
         return self.task_msg
 
+    @property
+    def finished(self):
+        return self.task_status in self.finished_status_list
+
 
 class AntiDDosStatus(resource.Resource, display.Display):
     """AntiDDos task resource _antiddos."""
@@ -94,15 +129,27 @@ class AntiDDosConfig(resource.Resource, display.Display):
     ]
 
     formatter = {
-        "Traffic limited list": formatter.format_list_of_dicts,
-        "HTTP limited list": formatter.format_list_of_dicts,
-        "Connection limited list": formatter.format_list_of_dicts,
+        "Traffic limited list": utils.format_list_of_dicts,
+        "HTTP limited list": utils.format_list_of_dicts,
+        "Connection limited list": utils.format_list_of_dicts,
     }
 
 
-class AntiDDosDailyReport(resource.Resource, display.Display):
+class AntiDDosDailyReport(resource.CompactResource, display.Display):
     """AntiDDos report(every 5min) of past 24h"""
 
+    __slots__ = ()
+
+    fields = (
+        'period_start',
+        'bps_in',
+        'bps_attack',
+        'total_bps',
+        'pps_in',
+        'pps_attack',
+        'total_pps',
+    )
+
     list_column_names = (
         'Start Time',
         'BPS In',
@@ -126,9 +173,20 @@ class AntiDDosDailyReport(resource.Resource, display.Display):
         return self.total_pps
 
 
-class AntiDDosLog(resource.Resource, display.Display):
+class AntiDDosLog(resource.CompactResource, display.Display):
     """AntiDDos log for every five minutes."""
 
+    __slots__ = ()
+
+    fields = (
+        'start_time',
+        'end_time',
+        'status',
+        'trigger_bps',
+        'trigger_pps',
+        'trigger_http_pps',
+    )
+
     list_column_names = (
         "Start Time",
         "End Time",
@@ -162,14 +220,159 @@ class AntiDDosWeeklyReport(resource.Resource, display.Display):
     ]
 
     formatter = {
-        # "weekdata": formatter.format_list_of_dicts,
-        "top10": formatter.format_list_of_dicts,
+        # "weekdata": utils.format_list_of_dicts,
+        "top10": utils.format_list_of_dicts,
     }
 
     @property
     def weekly_data(self):
-        if self.weekdata:
-            for data in self.weekdata:
-                time_long = data["period_start_date"]
-                data["period_start_date"] = utils.format_time(time_long)
-        return formatter.format_list_of_dicts(self.weekdata)
+        # format copies, weekdata is formatted again on every access
+        weekdata = [dict(data, period_start_date=utils.format_time(
+            data.get("period_start_date"))) for data in self.weekdata or []]
+        return utils.format_list_of_dicts(weekdata)
+
+
+class WeeklyReportDay(collections.namedtuple(
+        'WeeklyReportDay',
+        ['period_start_date', 'ddos_intercept_times', 'ddos_blackhole_times',
+         'max_attack_bps', 'max_attack_conns'])):
+    """DDoS statistics of one day in a weekly report"""
+
+    __slots__ = ()
+
+
+class WeeklyReportTop(collections.namedtuple(
+        'WeeklyReportTop', ['floating_ip_address', 'times'])):
+    """EIP and its attacked times in top10 of a weekly report"""
+
+    __slots__ = ()
+
+
+class WeeklyReportWeek(collections.namedtuple(
+        'WeeklyReportWeek',
+        ['period_start_date', 'ddos_intercept_times', 'days', 'top10']),
+        display.Display):
+    """Typed weekly report of one week
+
+    period_start_date is the requested start of the week in milliseconds,
+    days and top10 are tuples of WeeklyReportDay and WeeklyReportTop.
+    """
+
+    __slots__ = ()
+
+    list_column_names = (
+        'Week Start',
+        'DDOS Intercept Times',
+        'DDOS Blackhole Times',
+        'Max Attack BPS',
+        'Max Attack Conns',
+        'Top IP',
+    )
+
+    @classmethod
+    def from_body(cls, period_start_date, body):
+        days = tuple(WeeklyReportDay(
+            day.get('period_start_date'),
+            day.get('ddos_intercept_times') or 0,
+            day.get('ddos_blackhole_times') or 0,
+            day.get('max_attack_bps') or 0,
+            day.get('max_attack_conns') or 0,
+        ) for day in body.get('weekdata') or [])
+        top10 = tuple(WeeklyReportTop(top.get('floating_ip_address'),
+                                      top.get('times') or 0)
+                      for top in body.get('top10') or [])
+        return cls(period_start_date, body.get('ddos_intercept_times') or 0,
+                   days, top10)
+
+    @property
+    def week_start(self):
+        return utils.format_time(self.period_start_date, '%Y-%m-%d')
+
+    @property
+    def ddos_blackhole_times(self):
+        return sum(day.ddos_blackhole_times for day in self.days)
+
+    @property
+    def max_attack_bps(self):
+        return max([day.max_attack_bps for day in self.days] or [0])
+
+    @property
+    def max_attack_conns(self):
+        return max([day.max_attack_conns for day in self.days] or [0])
+
+    @property
+    def top_ip(self):
+        return self.top10[0].floating_ip_address if self.top10 else ''
+
+
+class WeeklyReportRange(resource.ListWithMeta):
+    """WeeklyReportWeek of consecutive weeks, oldest first, with the
+    statistics of all weeks merged
+    """
+
+    @property
+    def ddos_intercept_times(self):
+        return sum(week.ddos_intercept_times for week in self)
+
+    @property
+    def days(self):
+        """WeeklyReportDay of all weeks, oldest first"""
+        return [day for week in self for day in week.days]
+
+    @property
+    def top10(self):
+        """most attacked EIP of all weeks, times are summed up"""
+        times = collections.Counter()
+        for week in self:
+            for top in week.top10:
+                times[top.floating_ip_address] += top.times
+        return [WeeklyReportTop(address, count)
+                for address, count in times.most_common(10)]
+
+
+class EIPDailySummary(collections.namedtuple(
+        'EIPDailySummary',
+        ['floating_ip_id', 'floating_ip_address', 'status',
+         'peak_bps_attack', 'peak_pps_attack', 'attack_minutes']),
+        display.Display):
+    """Attack summary of the past 24 hours daily report of one EIP"""
+
+    __slots__ = ()
+
+    list_column_names = (
+        'Floating IP id',
+        'Floating IP address',
+        'Status',
+        'Peak BPS Attack',
+        'Peak PPS Attack',
+        'Attack Minutes',
+    )
+
+
+class BulkTaskResult(collections.namedtuple(
+        'BulkTaskResult',
+        ['floating_ip_id', 'task_id', 'error', 'already_configured'])):
+    """Result of one floating IP in a bulk open/close/update operation
+
+    exactly one of task_id, error and already_configured is set:
+        - task_id: request accepted, id of the created task
+        - error: the exception raised when resolve or request
+        - already_configured: floating ip already has the configuration
+    """
+
+    @property
+    def succeeded(self):
+        return self.error is None
+
+
+class TaskWaitResult(collections.namedtuple(
+        'TaskWaitResult', ['task_id', 'task', 'error'])):
+    """Result of one task waited by AntiDDosManager.wait_for_tasks
+
+        - task: the finished AntiDDosTask, None if error is set
+        - error: the exception raised when query the task status
+    """
+
+    @property
+    def succeeded(self):
+        return self.error is None and self.task.task_status == 'success'
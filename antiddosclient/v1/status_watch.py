@@ -0,0 +1,111 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import collections
+import time
+
+from keystoneauth1 import exceptions
+
+
+class StatusTransition(collections.namedtuple(
+        'StatusTransition',
+        ['floating_ip_id', 'floating_ip_address', 'old_status',
+         'new_status'])):
+    """Status change of one floating IP between two snapshots
+
+    old_status is None if the floating IP appears in the new snapshot,
+    new_status is None if it is gone, e.g. released or filtered out.
+    """
+
+    __slots__ = ()
+
+
+def diff_snapshots(previous, current):
+    """transitions from the previous status snapshot to the current one
+
+    :param previous: mapping of floating ip id to (address, status)
+    :param current: mapping of floating ip id to (address, status)
+    :return: list of StatusTransition, changed and new floating IPs in the
+        order of current, then gone floating IPs in the order of previous
+    """
+    transitions = []
+    for floating_ip_id, (address, status) in current.items():
+        old = previous.get(floating_ip_id)
+        if old is None:
+            transitions.append(StatusTransition(floating_ip_id, address,
+                                                None, status))
+        elif old[1] != status:
+            transitions.append(StatusTransition(floating_ip_id, address,
+                                                old[1], status))
+    for floating_ip_id, (address, status) in previous.items():
+        if floating_ip_id not in current:
+            transitions.append(StatusTransition(floating_ip_id, address,
+                                                status, None))
+    return transitions
+
+
+class StatusWatcher(object):
+    """Poll status snapshots and report transitions against the last one
+
+    :param poll: function returns a status snapshot, mapping of floating ip
+        id to (address, status), e.g. AntiDDosManager.get_status_snapshot
+    """
+
+    def __init__(self, poll):
+        self._poll = poll
+        self.snapshot = None
+
+    def poll(self):
+        """poll once, the first poll only keeps the snapshot
+
+        :return: list of StatusTransition since the last poll
+        """
+        current = self._poll()
+        previous, self.snapshot = self.snapshot, current
+        if previous is None:
+            return []
+        return diff_snapshots(previous, current)
+
+    def watch(self, interval, polls=None, on_error=None,
+              sleep=time.sleep, clock=time.time):
+        """poll every interval seconds, polls are started on a fixed rate
+
+        A failed poll keeps the last snapshot, changes are reported by the
+        next successful poll.
+
+        :param polls: number of polls, None to poll forever
+        :param on_error: called with the ClientException of a failed poll,
+            the exception is raised if None
+        :return: generator of (poll time, transitions), the first poll is
+            yielded too so callers know the baseline is ready
+        """
+        count = 0
+        next_poll = clock()
+        while polls is None or count < polls:
+            if count:
+                delay = next_poll - clock()
+                if delay > 0:
+                    sleep(delay)
+            started = clock()
+            count += 1
+            # a slow poll delays the next one instead of queueing up polls
+            next_poll = max(next_poll, started) + interval
+            try:
+                transitions = self.poll()
+            except exceptions.ClientException as e:
+                if on_error is None:
+                    raise
+                on_error(e)
+                continue
+            yield started, transitions
@@ -16,8 +16,14 @@ from antiddosclient.common import manager
 from antiddosclient.v2 import resource
 
 
-class AlertManager(manager.Manager):
+class BaseAlertManager(manager.BaseManager):
+    """alert functions shared by the sync and the async manager"""
+
     resource_class = resource.AlertConfig
 
     def get(self):
         return self._get("/warnalert/alertconfig/query")
+
+
+class AlertManager(BaseAlertManager, manager.Manager):
+    pass
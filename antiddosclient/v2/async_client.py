@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+import logging
+
+from antiddosclient.common import async_httpclient
+from antiddosclient.v2 import async_alert_mgr
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncClient(object):
+    """asyncio Client for the HuaWei Anti-DDos v2 API.
+
+    Example::
+
+        async with AsyncClient(session) as client:
+            alert_config = await client.alerts.get()
+    """
+
+    # service name registered in open-stack
+    service_name = 'antiddos'
+
+    def __init__(self, session=None, endpoint=None, **kwargs):
+        """Initialize a new async client for the Anti-DDos v2 API.
+
+        :param keystoneauth1.session.Session session:
+            The session to be used for authentication and endpoint discovery
+        :param string endpoint:
+            An optional URL to be used as the base for API requests on this API
+        :param kwargs:
+            Keyword arguments passed to AsyncOpenStackHttpClient, such as
+            connector, pool_size, pool_size_per_host and timeout
+        """
+        default_options = {
+            'service_name': self.service_name,
+            'logger': LOGGER,
+        }
+        kwargs.update(default_options)
+
+        if endpoint:
+            endpoint += '/v2/%(project_id)s'
+        self.client = async_httpclient.AsyncOpenStackHttpClient(
+            session, endpoint, **kwargs
+        )
+
+        # initial alert modules
+        self.alerts = async_alert_mgr.AsyncAlertManager(self.client)
+
+    def stats(self):
+        """snapshot of per route HTTP request metrics of the client"""
+        return self.client.stats()
+
+    async def close(self):
+        await self.client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
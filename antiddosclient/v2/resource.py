@@ -12,10 +12,9 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 #
-from osc_lib import utils as formatter
-
 from antiddosclient.common import display
 from antiddosclient.common import resource
+from antiddosclient.common import utils
 
 
 class AlertConfig(resource.Resource, display.Display):
@@ -28,5 +27,5 @@ class AlertConfig(resource.Resource, display.Display):
     )
 
     formatter = {
-        'Warn Config': formatter.format_dict,
+        'Warn Config': utils.format_dict,
     }
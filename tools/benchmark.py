@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+"""Benchmark antiddosclient against a local stand-in Anti-DDos API server
+
+Every fleet size starts a stand-in server (antiddosclient.tests.standin) in
+a child process, so the server does not compete with the client for CPU or
+pollute its memory numbers, then measures calls/sec, p50/p99 latency and
+peak Python memory of every scenario:
+
+    python tools/benchmark.py --fleet-size 1000 10000 100000 --latency 0.005
+
+Compare the JSON output (--json) of two releases to catch regressions.
+"""
+import argparse
+import io
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from keystoneauth1 import session
+
+from antiddosclient.tests import standin
+from antiddosclient.v1 import client as v1_client
+from antiddosclient.v1 import export
+from antiddosclient.v1 import report_store
+from antiddosclient.v2 import client as v2_client
+
+try:
+    import tracemalloc
+except ImportError:  # pragma: no cover
+    tracemalloc = None
+
+DEFAULT_FLEET_SIZES = (1000, 10000, 100000)
+# one row every 5 minutes
+ROWS_PER_DAY = 24 * 12
+
+
+def percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = int(round((len(sorted_values) - 1) * percent / 100.0))
+    return sorted_values[index]
+
+
+def measure(name, func, iterations):
+    """call func iterations times
+
+    func could return number of API calls it made, one call is counted if
+    it returns anything else. Retained memory is the memory still held by
+    the result of the last call.
+    """
+    latencies = []
+    calls = 0
+    if tracemalloc is not None:
+        tracemalloc.start()
+    started_at = time.time()
+    for _ in range(iterations):
+        result = None
+        baseline = (tracemalloc.get_traced_memory()[0]
+                    if tracemalloc is not None else 0)
+        call_started_at = time.time()
+        result = func()
+        calls += result if isinstance(result, int) else 1
+        latencies.append(time.time() - call_started_at)
+    elapsed = time.time() - started_at
+    peak = retained = None
+    if tracemalloc is not None:
+        current, peak = tracemalloc.get_traced_memory()
+        retained = current - baseline
+        tracemalloc.stop()
+    del result
+
+    latencies.sort()
+    return {
+        'scenario': name,
+        'iterations': iterations,
+        'calls': calls,
+        'calls_per_sec': calls / elapsed if elapsed else None,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'peak_memory_kb': peak / 1024.0 if peak is not None else None,
+        'retained_memory_kb': (retained / 1024.0 if retained is not None
+                               else None),
+    }
+
+
+def start_server(fleet_size, latency):
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'antiddosclient.tests.standin',
+         '--fleet-size', str(fleet_size), '--latency', str(latency)],
+        stdout=subprocess.PIPE, universal_newlines=True
+    )
+    endpoint = process.stdout.readline().strip()
+    if not endpoint:
+        process.kill()
+        raise RuntimeError('stand-in server failed to start')
+    return process, endpoint
+
+
+def scenarios(client, alert_client, fleet_size, args):
+    """yield (name, func, iterations) of every benchmark scenario"""
+    manager = client.antiddos
+    rand = random.Random(fleet_size)
+
+    def random_index():
+        return rand.randrange(fleet_size)
+
+    # full listing decodes the whole fleet, keep it short on big fleets
+    list_iterations = max(1, min(args.iterations, 1000000 // fleet_size))
+    yield 'list', manager.list, list_iterations
+
+    def list_filter():
+        return manager.list().filter_by(status='packetcleaning')
+    yield 'list-filter', list_filter, list_iterations
+
+    def stream_list():
+        # rows are dropped as soon as they are decoded
+        for _ in manager.stream_list():
+            pass
+    yield 'stream-list', stream_list, list_iterations
+
+    def list_page():
+        return manager.list(limit=args.page_size, offset=random_index())
+    yield 'list-page', list_page, args.iterations
+
+    def iter_list():
+        # the last short page ends the iteration
+        items = sum(1 for _ in manager.iter_list(page_size=args.page_size,
+                                                 window=2))
+        return items // args.page_size + 1
+    yield 'iter-list', iter_list, list_iterations
+
+    def find_ip():
+        return manager.find(standin.floating_ip_address(random_index()))
+    yield 'find-ip', find_ip, args.iterations
+
+    def find_id():
+        return manager.find(standin.floating_ip_id(random_index()))
+    yield 'find-id', find_id, args.iterations
+
+    def bulk_open():
+        ids = [standin.floating_ip_id(random_index())
+               for _ in range(args.bulk_size)]
+        manager.bulk_open_antiddos(ids, True, 1, 1, 1, 1,
+                                   concurrency=args.concurrency)
+        return len(ids)
+    yield 'bulk-open', bulk_open, max(1, args.iterations // 10)
+
+    def status():
+        return manager.get_antiddos_status(
+            standin.floating_ip_id(random_index())
+        )
+    yield 'status', status, args.iterations
+
+    def daily():
+        return manager.get_antiddos_daily_report(
+            standin.floating_ip_id(random_index())
+        )
+    yield 'daily', daily, args.iterations
+
+    def daily_frame():
+        frame = manager.get_antiddos_daily_frame(
+            standin.floating_ip_id(random_index())
+        )
+        frame.summary()
+    yield 'daily-frame', daily_frame, args.iterations
+
+    def fleet_daily():
+        report = manager.get_fleet_daily_report(
+            concurrency=args.concurrency
+        )
+        return report.eips + 1
+    yield 'fleet-daily', fleet_daily, 1
+
+    def export_daily():
+        # bulk-size EIPs written as NDJSON, the way SIEM exports run
+        ids = [standin.floating_ip_id(random_index())
+               for _ in range(args.bulk_size)]
+        writer = export.NDJSONWriter(io.StringIO())
+        for floating_ip_id, rows, _ in manager.iter_daily_report_rows(
+                ids, concurrency=args.concurrency):
+            writer.write_rows(floating_ip_id, rows or [])
+        return len(ids)
+    yield 'export-daily', export_daily, max(1, args.iterations // 10)
+
+    if not args.scenario or 'store-query' in args.scenario:
+        for scenario in store_scenarios(fleet_size, args):
+            yield scenario
+
+    def logs():
+        return manager.get_antiddos_daily_logs(
+            standin.floating_ip_id(random_index())
+        )
+    yield 'logs', logs, args.iterations
+
+    yield 'weekly', manager.get_antiddos_weekly_report, args.iterations
+    yield 'config', manager.query_config_list, args.iterations
+    yield 'alert-config', alert_client.alerts.get, args.iterations
+
+
+def store_scenarios(fleet_size, args):
+    """query history of every EIP from a local report store
+
+    Store is filled with --store-days of rows of at most --store-eips EIP,
+    the query reads the bps_attack column of every EIP in the whole range.
+    """
+    eips = min(fleet_size, args.store_eips)
+    rows = args.store_days * ROWS_PER_DAY
+    path = tempfile.mkdtemp(prefix='antiddos-store-')
+    try:
+        store = report_store.ReportStore(os.path.join(path, 'store'))
+        start = int(time.time() * 1000) - rows * 300000
+        columns = dict((column, range(rows))
+                       for column in report_store.METRIC_COLUMNS)
+        columns[report_store.TIME_COLUMN] = [start + i * 300000
+                                             for i in range(rows)]
+        for index in range(eips):
+            store.append_columns(standin.floating_ip_id(index), columns)
+
+        floating_ip_ids = store.floating_ip_ids()
+
+        def store_query():
+            store.query_many(floating_ip_ids, start, columns=['bps_attack'])
+        yield 'store-query', store_query, args.iterations
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def run(args):
+    results = []
+    for fleet_size in args.fleet_size:
+        process, endpoint = start_server(fleet_size, args.latency)
+        try:
+            auth_session = session.Session(auth=standin.StandInAuth(endpoint))
+            client = v1_client.Client(auth_session, endpoint,
+                                      pool_size=args.concurrency)
+            alert_client = v2_client.Client(auth_session, endpoint)
+            for name, func, iterations in scenarios(client, alert_client,
+                                                    fleet_size, args):
+                if args.scenario and name not in args.scenario:
+                    continue
+                result = measure(name, func, iterations)
+                result['fleet_size'] = fleet_size
+                results.append(result)
+                if not args.json:
+                    print_result(result)
+        finally:
+            process.terminate()
+            process.wait()
+    return results
+
+
+def print_result(result):
+    memory = ''
+    if result['peak_memory_kb'] is not None:
+        memory = '  peak %(peak_memory_kb)10.1f KiB  retained ' \
+                 '%(retained_memory_kb)10.1f KiB' % result
+    sys.stdout.write(
+        '%(fleet_size)8d %(scenario)-14s %(calls_per_sec)10.1f calls/s '
+        'p50 %(p50_ms)9.2f ms  p99 %(p99_ms)9.2f ms' % result +
+        memory + '\n'
+    )
+    sys.stdout.flush()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fleet-size', type=int, nargs='+',
+                        default=list(DEFAULT_FLEET_SIZES),
+                        help='EIP number of the stand-in fleet')
+    parser.add_argument('--latency', type=float, default=0,
+                        help='seconds the server delays every request')
+    parser.add_argument('--iterations', type=int, default=50,
+                        help='calls of every scenario')
+    parser.add_argument('--page-size', type=int, default=100)
+    parser.add_argument('--bulk-size', type=int, default=50,
+                        help='EIP number of every bulk open')
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--store-eips', type=int, default=2000,
+                        help='max EIP number of the report store')
+    parser.add_argument('--store-days', type=int, default=30,
+                        help='days of report history of every EIP')
+    parser.add_argument('--scenario', action='append',
+                        help='only run the scenario, could be repeated')
+    parser.add_argument('--json', action='store_true',
+                        help='print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+
+
+if __name__ == '__main__':
+    main()
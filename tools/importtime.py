@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+"""Check import time of antiddosclient modules against budgets
+
+Every module is imported in a fresh interpreter with ``python -X importtime``
+(Python 3.7+), the fastest of --repeat runs is compared with its budget and
+the command exits with 1 if any module is over budget:
+
+    python tools/importtime.py
+    python tools/importtime.py --preload osc_lib.shell --repeat 10
+
+--preload imports modules first, e.g. osc_lib.shell which is loaded by the
+openstack CLI anyway, so only the cost added by antiddosclient is measured.
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+# module: budget in milliseconds, without preload
+#   plugin is imported on every openstack CLI start up, even for --help
+#   command modules are imported to list and run commands, cliff is most
+#   of their cost
+#   clients pull in keystoneauth1 and requests
+DEFAULT_BUDGETS = (
+    ('antiddosclient.osc.plugin', 50),
+    ('antiddosclient.osc.v1.antiddos', 200),
+    ('antiddosclient.osc.v2.alert', 200),
+    ('antiddosclient.v1.client', 250),
+    ('antiddosclient.v2.client', 250),
+)
+
+
+def import_time(module, preload=()):
+    """cumulative microseconds of importing module"""
+    statements = ['import %s' % name for name in preload]
+    statements.append('import %s' % module)
+    process = subprocess.Popen(
+        [sys.executable, '-X', 'importtime', '-c', '; '.join(statements)],
+        stderr=subprocess.PIPE, universal_newlines=True
+    )
+    _, stderr = process.communicate()
+    if process.returncode:
+        raise RuntimeError('Failed to import %s:\n%s' % (module, stderr))
+    for line in stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) == 3 and parts[2].strip() == module and \
+                not parts[2][1:].startswith(' '):
+            return int(parts[1])
+    # already imported by preload
+    return 0
+
+
+def run(args):
+    results = []
+    for module, budget in DEFAULT_BUDGETS:
+        if args.module and module not in args.module:
+            continue
+        budget = args.budget if args.budget is not None else budget
+        milliseconds = min(import_time(module, args.preload)
+                           for _ in range(args.repeat)) / 1000.0
+        results.append({
+            'module': module,
+            'import_ms': milliseconds,
+            'budget_ms': budget,
+            'over_budget': milliseconds > budget,
+        })
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--preload', action='append', default=[],
+                        help='module imported before the measured one, '
+                             'could be repeated')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='imports of every module, the fastest counts')
+    parser.add_argument('--budget', type=float,
+                        help='budget in milliseconds of every module')
+    parser.add_argument('--module', action='append',
+                        help='only check the module, could be repeated')
+    parser.add_argument('--json', action='store_true',
+                        help='print results as JSON')
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.json:
+        json.dump(results, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        for result in results:
+            sys.stdout.write(
+                '%(module)-34s %(import_ms)8.1f ms  budget '
+                '%(budget_ms)6.1f ms' % result +
+                ('  OVER BUDGET' if result['over_budget'] else '') + '\n'
+            )
+    return 1 if any(r['over_budget'] for r in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())